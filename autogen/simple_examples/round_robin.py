@@ -1,5 +1,7 @@
 import asyncio
 import os
+import sys
+from pathlib import Path
 
 from dotenv import find_dotenv, load_dotenv
 
@@ -7,29 +9,52 @@ from dotenv import find_dotenv, load_dotenv
 load_dotenv(find_dotenv())
 
 from autogen_agentchat.agents import AssistantAgent
-from autogen_agentchat.conditions import TextMentionTermination
 from autogen_agentchat.teams import RoundRobinGroupChat
 from autogen_agentchat.ui import Console
 from autogen_ext.models.anthropic import AnthropicChatCompletionClient
 
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from team_utils import (
+    ClientPool,
+    FullContext,
+    LastMessagesContext,
+    context_report,
+    cost_aware_termination,
+)
+
 
 # Define the async main function
 async def main():
-    # Initialize model client
-    model_client = AnthropicChatCompletionClient(
-        model="claude-3-7-sonnet-20250219", api_key=os.getenv("ANTHROPIC_API_KEY")
+    # Initialize model client, shared through a pool that limits and retries
+    # requests and keeps per-agent metrics
+    model_client = ClientPool(
+        AnthropicChatCompletionClient(
+            model="claude-3-7-sonnet-20250219",
+            api_key=os.getenv("ANTHROPIC_API_KEY"),
+            max_retries=0,
+        ),
+        max_concurrency=4,
+        requests_per_minute=50,
+        tokens_per_minute=40000,
     )
 
+    # The critic judges the latest draft against its last feedback, so it
+    # needs only the task and the last few messages
+    contexts = {"primary": FullContext(), "critic": LastMessagesContext(keep_last=3)}
+
     # Define agents
     primary_agent = AssistantAgent(
         "primary",
-        model_client=model_client,
+        model_client=model_client.for_agent("primary"),
+        model_context=contexts["primary"],
         system_message="You are a helpful AI assistant.",
     )
 
     critic_agent = AssistantAgent(
         "critic",
-        model_client=model_client,
+        model_client=model_client.for_agent("critic"),
+        model_context=contexts["critic"],
         system_message=(
             "You are a critic AI. When evaluating a response, you must either:\n"
             "- Provide constructive feedback clearly and briefly, OR\n"
@@ -38,8 +63,16 @@ async def main():
         ),
     )
 
-    # Define termination condition
-    termination_condition = TextMentionTermination("APPROVE")
+    # Define termination condition: approval, or the first limit reached when
+    # the critic never approves or the drafts stop improving.
+    termination_condition = cost_aware_termination(
+        "APPROVE",
+        max_tokens=20000,
+        timeout_seconds=120,
+        max_messages=12,
+        converge_source="primary",
+        critic="critic",
+    )
 
     # Create team
     team = RoundRobinGroupChat(
@@ -50,6 +83,10 @@ async def main():
     # Run the task
     await team.reset()
     await Console(team.run_stream(task="Write a short poem about the fall season."))
+    print(termination_condition.report())
+    print(context_report(contexts))
+    print(model_client.report())
+    await model_client.close()
 
 
 # Entry point for the script
@@ -0,0 +1,24 @@
+from .checkpoint import (
+    Checkpoint,
+    CheckpointStore,
+    checkpointed_stream,
+    pack,
+    unpack,
+)
+from .client_pool import ClientPool, PooledClient, TokenBucket, agent_client
+from .model_context import (
+    FullContext,
+    LastMessagesContext,
+    SourceFilteredContext,
+    SummarizingContext,
+    TokenBudgetContext,
+    WindowedContext,
+    context_report,
+)
+from .record_replay import MissingRecordingError, RecordReplayClient, request_key
+from .termination import (
+    ConvergenceTermination,
+    ReportingTermination,
+    TerminationReport,
+    cost_aware_termination,
+)
@@ -0,0 +1,234 @@
+"""Checkpoint and resume autogen team runs.
+
+`checkpointed_stream()` runs a team like `team.run_stream()`, but saves the
+team's state (every agent's model context and the group chat manager's
+thread) to a `CheckpointStore` after each message, keyed by a run ID. Given
+the ID of a run that was interrupted, it loads the last checkpoint and
+continues the run with `team.run_stream(task=None)`, so the turns already
+taken are not repeated; only a turn in flight at the crash is taken again.
+A finished run is not run again at all.
+
+Checkpoints are compact: long strings that occur more than once (each agent
+keeps its own copy of the transcript) are stored once, and the JSON is
+compressed with zlib. Only the latest checkpoint of a run is kept.
+
+Termination conditions are not part of the team's state, so their limits
+count from the resume.
+"""
+
+import asyncio
+import json
+import sqlite3
+import threading
+import time
+import zlib
+from dataclasses import dataclass
+from typing import Any, AsyncGenerator, Optional, Union
+
+from autogen_agentchat.base import TaskResult, Team
+from autogen_agentchat.messages import (
+    BaseAgentEvent,
+    BaseChatMessage,
+    MessageFactory,
+)
+
+# Strings at least this long are stored once and referred to by index.
+MIN_SHARED_LENGTH = 64
+
+
+def pack(state: Any) -> bytes:
+    """Serializes a team state: shared long strings, JSON, zlib."""
+    strings: list[str] = []
+    index: dict[str, int] = {}
+
+    def share(value: Any) -> Any:
+        if isinstance(value, str) and len(value) >= MIN_SHARED_LENGTH:
+            if value not in index:
+                index[value] = len(strings)
+                strings.append(value)
+            return {"$s": index[value]}
+        if isinstance(value, dict):
+            return {key: share(item) for key, item in value.items()}
+        if isinstance(value, (list, tuple)):
+            return [share(item) for item in value]
+        return value
+
+    shared = share(state)
+    data = json.dumps({"strings": strings, "state": shared}, default=str)
+    return zlib.compress(data.encode(), 6)
+
+
+def unpack(data: bytes) -> Any:
+    """The inverse of `pack`."""
+    packed = json.loads(zlib.decompress(data))
+    strings = packed["strings"]
+
+    def restore(value: Any) -> Any:
+        if isinstance(value, dict):
+            if len(value) == 1 and "$s" in value:
+                return strings[value["$s"]]
+            return {key: restore(item) for key, item in value.items()}
+        if isinstance(value, list):
+            return [restore(item) for item in value]
+        return value
+
+    return restore(packed["state"])
+
+
+@dataclass
+class Checkpoint:
+    """The latest saved state of a run."""
+
+    run_id: str
+    task: str
+    turns: int
+    state: dict
+    finished: bool = False
+    stop_reason: Optional[str] = None
+    updated: float = 0.0
+
+    def messages(self) -> list[Union[BaseAgentEvent, BaseChatMessage]]:
+        """The messages of the run so far, from the group chat manager's
+        thread."""
+        factory = MessageFactory()
+        for state in self.state.get("agent_states", {}).values():
+            if "message_thread" in state:
+                return [factory.create(message) for message in state["message_thread"]]
+        return []
+
+
+class CheckpointStore:
+    """Keeps the latest checkpoint of each run in SQLite, off the event loop.
+
+    Args:
+        path (str): Database file; ":memory:" keeps it in this process.
+
+    Attributes:
+        stats (dict): Checkpoints saved, their stored size in bytes, and the
+            seconds spent packing and writing them.
+    """
+
+    def __init__(self, path: str = "checkpoints.db"):
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._db:
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS checkpoints (run_id TEXT PRIMARY KEY,"
+                " task TEXT, turns INTEGER, finished INTEGER, stop_reason TEXT,"
+                " updated REAL, state BLOB)"
+            )
+        self.stats = {"saves": 0, "stored_bytes": 0, "seconds": 0.0}
+
+    def _execute(self, sql: str, params: tuple = ()) -> list:
+        with self._lock, self._db:
+            return self._db.execute(sql, params).fetchall()
+
+    def _save(self, checkpoint: Checkpoint) -> None:
+        started = time.perf_counter()
+        data = pack(checkpoint.state)
+        self._execute(
+            "INSERT OR REPLACE INTO checkpoints VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (
+                checkpoint.run_id,
+                checkpoint.task,
+                checkpoint.turns,
+                checkpoint.finished,
+                checkpoint.stop_reason,
+                checkpoint.updated,
+                data,
+            ),
+        )
+        self.stats["saves"] += 1
+        self.stats["stored_bytes"] += len(data)
+        self.stats["seconds"] += time.perf_counter() - started
+
+    async def save(self, checkpoint: Checkpoint) -> None:
+        checkpoint.updated = time.time()
+        await asyncio.to_thread(self._save, checkpoint)
+
+    async def load(self, run_id: str) -> Optional[Checkpoint]:
+        rows = await asyncio.to_thread(
+            self._execute,
+            "SELECT task, turns, finished, stop_reason, updated, state"
+            " FROM checkpoints WHERE run_id = ?",
+            (run_id,),
+        )
+        if not rows:
+            return None
+        task, turns, finished, stop_reason, updated, data = rows[0]
+        return Checkpoint(
+            run_id=run_id,
+            task=task,
+            turns=turns,
+            state=await asyncio.to_thread(unpack, data),
+            finished=bool(finished),
+            stop_reason=stop_reason,
+            updated=updated,
+        )
+
+    async def runs(self) -> list[tuple[str, int, bool, float]]:
+        """Run ID, turns, whether finished, and last update of every run."""
+        rows = await asyncio.to_thread(
+            self._execute,
+            "SELECT run_id, turns, finished, updated FROM checkpoints"
+            " ORDER BY updated DESC",
+        )
+        return [
+            (run_id, turns, bool(done), updated)
+            for run_id, turns, done, updated in rows
+        ]
+
+    async def delete(self, run_id: str) -> None:
+        await asyncio.to_thread(
+            self._execute, "DELETE FROM checkpoints WHERE run_id = ?", (run_id,)
+        )
+
+    def close(self) -> None:
+        self._db.close()
+
+
+async def checkpointed_stream(
+    team: Team, task: str, store: CheckpointStore, run_id: str
+) -> AsyncGenerator[Union[BaseAgentEvent, BaseChatMessage, TaskResult], None]:
+    """`team.run_stream(task)` with a checkpoint after every message, or the
+    rest of the run `run_id` if it has one.
+
+    The team must be built the same way as the one that was checkpointed. The
+    final `TaskResult` includes the messages from before a resume.
+
+    Args:
+        team (Team): A freshly built team.
+        task (str): The task of a new run; a resumed run keeps its own.
+        store (CheckpointStore): Where checkpoints are kept.
+        run_id (str): Identifies the run in the store.
+    """
+    checkpoint = await store.load(run_id)
+    if checkpoint is None:
+        checkpoint = Checkpoint(run_id=run_id, task=task, turns=0, state={})
+        earlier, stream = [], team.run_stream(task=task)
+    elif checkpoint.finished:
+        yield TaskResult(
+            messages=checkpoint.messages(), stop_reason=checkpoint.stop_reason
+        )
+        return
+    else:
+        await team.load_state(checkpoint.state)
+        earlier, stream = checkpoint.messages(), team.run_stream()
+    async for item in stream:
+        if isinstance(item, TaskResult):
+            checkpoint.finished = True
+            checkpoint.stop_reason = item.stop_reason
+            checkpoint.state = dict(await team.save_state())
+            await store.save(checkpoint)
+            yield TaskResult(
+                messages=[*earlier, *item.messages], stop_reason=item.stop_reason
+            )
+            return
+        yield item
+        if isinstance(item, BaseChatMessage):
+            # The message has been handled by the manager; the next speaker
+            # may already be at work, and is asked again after a resume.
+            if item.source != "user":
+                checkpoint.turns += 1
+            checkpoint.state = dict(await team.save_state())
+            await store.save(checkpoint)
@@ -0,0 +1,464 @@
+"""A shared, rate-limited and retrying model client for autogen teams.
+
+`ClientPool` wraps one `ChatCompletionClient` (for example the
+`AnthropicChatCompletionClient` every agent of a team shares) and gives each
+agent its own view with `for_agent(name)`. All views go through the pool,
+which:
+
+- caps the number of requests in flight overall and per agent,
+- spaces requests out with token buckets for requests and tokens per minute,
+  charging the estimated prompt tokens up front and settling the difference
+  once the response reports its usage,
+- retries 429 (rate limited), 529 (overloaded), 5xx, timeout and connection
+  errors with jittered exponential backoff, honoring `retry-after`, and
+- records per-agent latency, token and retry metrics.
+
+Give the wrapped client `max_retries=0`, so that retries happen here, where
+they are counted and paced, instead of inside the provider SDK.
+"""
+
+import asyncio
+import random
+import statistics
+import time
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from typing import Any, AsyncGenerator, Literal, Mapping, Optional, Sequence, Union
+
+from autogen_core import CancellationToken
+from autogen_core.models import (
+    ChatCompletionClient,
+    CreateResult,
+    LLMMessage,
+    ModelCapabilities,
+    ModelInfo,
+    RequestUsage,
+)
+from autogen_core.tools import Tool, ToolSchema
+from pydantic import BaseModel
+
+RETRYABLE_STATUS = {408, 409, 429, 500, 502, 503, 504, 529}
+RETRYABLE_ERRORS = {"APIConnectionError", "APITimeoutError"}
+
+
+def is_retryable(error: BaseException) -> bool:
+    """Whether a failed request is worth repeating."""
+    status = getattr(error, "status_code", None)
+    if status is None:
+        status = getattr(getattr(error, "response", None), "status_code", None)
+    if status is not None:
+        return status in RETRYABLE_STATUS
+    return isinstance(error, (asyncio.TimeoutError, ConnectionError)) or (
+        type(error).__name__ in RETRYABLE_ERRORS
+    )
+
+
+def _retry_after(error: BaseException) -> Optional[float]:
+    headers = getattr(getattr(error, "response", None), "headers", None) or {}
+    try:
+        return float(headers.get("retry-after"))
+    except (TypeError, ValueError):
+        return None
+
+
+class TokenBucket:
+    """Token bucket that refills continuously.
+
+    Args:
+        rate (float): Tokens added per second.
+        capacity (float): Most tokens the bucket holds, i.e. the burst size.
+    """
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self._level = capacity
+        self._updated = time.monotonic()
+        # Held while waiting, so callers are served in order.
+        self._lock = asyncio.Lock()
+
+    @classmethod
+    def per_minute(cls, limit: float, burst_seconds: float = 60) -> "TokenBucket":
+        """A bucket for `limit` tokens per minute that holds `burst_seconds`
+        worth of them."""
+        return cls(rate=limit / 60, capacity=max(1, limit / 60 * burst_seconds))
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._level = min(
+            self.capacity, self._level + (now - self._updated) * self.rate
+        )
+        self._updated = now
+
+    async def acquire(self, amount: float = 1.0) -> None:
+        """Waits until `amount` tokens are available and takes them."""
+        amount = min(amount, self.capacity)
+        async with self._lock:
+            self._refill()
+            if self._level < amount:
+                await asyncio.sleep((amount - self._level) / self.rate)
+                self._refill()
+            self._level -= amount
+
+    def debit(self, amount: float) -> None:
+        """Takes (or returns, if negative) tokens without waiting. The level
+        may go below zero, which delays later callers."""
+        self._refill()
+        self._level = min(self.capacity, self._level - amount)
+
+
+@dataclass
+class AgentMetrics:
+    requests: int = 0
+    # Failed attempts, and the failed attempts that were retried.
+    errors: int = 0
+    retries: int = 0
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    # Time spent waiting for a concurrency slot or a rate limit.
+    wait_seconds: float = 0.0
+    latencies: list[float] = field(default_factory=list)
+
+    def summary(self) -> dict:
+        latencies = sorted(self.latencies)
+        return {
+            "requests": self.requests,
+            "errors": self.errors,
+            "retries": self.retries,
+            "prompt_tokens": self.prompt_tokens,
+            "completion_tokens": self.completion_tokens,
+            "wait_seconds": round(self.wait_seconds, 3),
+            "latency_p50": round(statistics.median(latencies), 3) if latencies else 0,
+            "latency_p95": (
+                round(latencies[int(0.95 * (len(latencies) - 1))], 3)
+                if latencies
+                else 0
+            ),
+        }
+
+
+class ClientPool(ChatCompletionClient):
+    """Shares one model client among agents with limits and retries.
+
+    The pool is itself a client, for callers that are not an agent; agents
+    should use `for_agent(name)` so that their metrics are kept apart.
+
+    Args:
+        client (ChatCompletionClient): The client to wrap.
+        max_concurrency (int): Requests in flight across all agents.
+        per_agent_concurrency (int): Requests in flight per agent.
+        requests_per_minute (float, optional): Request rate limit.
+        tokens_per_minute (float, optional): Token rate limit, prompt and
+            completion tokens together.
+        max_retries (int): Retries of a retryable error before giving up.
+        base_delay (float): Backoff ceiling of the first retry, in seconds;
+            it doubles with every retry.
+        max_delay (float): Largest backoff ceiling, in seconds.
+        burst_seconds (float): How many seconds' worth of the rate limits
+            may be sent at once. Lower it for providers that also enforce
+            the limits over short windows.
+    """
+
+    def __init__(
+        self,
+        client: ChatCompletionClient,
+        max_concurrency: int = 8,
+        per_agent_concurrency: int = 2,
+        requests_per_minute: Optional[float] = None,
+        tokens_per_minute: Optional[float] = None,
+        max_retries: int = 5,
+        base_delay: float = 1.0,
+        max_delay: float = 30.0,
+        burst_seconds: float = 60,
+    ):
+        self._client = client
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._per_agent_concurrency = per_agent_concurrency
+        self._agent_semaphores: dict[str, asyncio.Semaphore] = {}
+        self._requests = (
+            TokenBucket.per_minute(requests_per_minute, burst_seconds)
+            if requests_per_minute
+            else None
+        )
+        self._tokens = (
+            TokenBucket.per_minute(tokens_per_minute, burst_seconds)
+            if tokens_per_minute
+            else None
+        )
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.metrics: dict[str, AgentMetrics] = {}
+        self._views: dict[str, "PooledClient"] = {}
+
+    def for_agent(self, agent_name: str) -> "PooledClient":
+        """The client an agent should use."""
+        if agent_name not in self._views:
+            self._views[agent_name] = PooledClient(self, agent_name)
+        return self._views[agent_name]
+
+    def _metrics(self, agent: str) -> AgentMetrics:
+        return self.metrics.setdefault(agent, AgentMetrics())
+
+    def _estimate(self, messages: Sequence[LLMMessage], tools: Sequence) -> int:
+        # A rough count is enough, since the charge is settled once the usage
+        # is known; exact counting would tokenize the whole history each call.
+        text = sum(len(str(message.content)) for message in messages)
+        return (text + sum(len(str(tool)) for tool in tools)) // 4
+
+    def _backoff(self, attempt: int, error: BaseException) -> float:
+        ceiling = min(self.max_delay, self.base_delay * 2**attempt)
+        return max(random.uniform(0, ceiling), _retry_after(error) or 0)
+
+    @asynccontextmanager
+    async def _slot(self, agent: str, estimate: int):
+        started = time.perf_counter()
+        agent_semaphore = self._agent_semaphores.setdefault(
+            agent, asyncio.Semaphore(self._per_agent_concurrency)
+        )
+        async with agent_semaphore, self._semaphore:
+            if self._requests:
+                await self._requests.acquire()
+            if self._tokens:
+                await self._tokens.acquire(estimate)
+            self._metrics(agent).wait_seconds += time.perf_counter() - started
+            yield
+
+    def _record(
+        self, agent: str, usage: RequestUsage, seconds: float, estimate: int
+    ) -> None:
+        metrics = self._metrics(agent)
+        metrics.requests += 1
+        metrics.latencies.append(seconds)
+        metrics.prompt_tokens += usage.prompt_tokens
+        metrics.completion_tokens += usage.completion_tokens
+        if self._tokens:
+            self._tokens.debit(usage.prompt_tokens + usage.completion_tokens - estimate)
+
+    def _failed(self, agent: str, attempt: int, error: BaseException) -> float:
+        """Counts a failed attempt; returns the backoff, or re-raises."""
+        metrics = self._metrics(agent)
+        metrics.errors += 1
+        if attempt >= self.max_retries or not is_retryable(error):
+            raise error
+        metrics.retries += 1
+        return self._backoff(attempt, error)
+
+    async def _create(
+        self, agent: str, messages: Sequence[LLMMessage], **kwargs: Any
+    ) -> CreateResult:
+        estimate = self._estimate(messages, kwargs.get("tools", []))
+        attempt = 0
+        while True:
+            try:
+                async with self._slot(agent, estimate):
+                    started = time.perf_counter()
+                    result = await self._client.create(messages, **kwargs)
+            except Exception as error:
+                await asyncio.sleep(self._failed(agent, attempt, error))
+                attempt += 1
+                continue
+            self._record(agent, result.usage, time.perf_counter() - started, estimate)
+            return result
+
+    async def _create_stream(
+        self, agent: str, messages: Sequence[LLMMessage], **kwargs: Any
+    ) -> AsyncGenerator[Union[str, CreateResult], None]:
+        estimate = self._estimate(messages, kwargs.get("tools", []))
+        attempt = 0
+        while True:
+            streamed = False
+            try:
+                async with self._slot(agent, estimate):
+                    started = time.perf_counter()
+                    async for chunk in self._client.create_stream(messages, **kwargs):
+                        streamed = True
+                        if isinstance(chunk, CreateResult):
+                            self._record(
+                                agent,
+                                chunk.usage,
+                                time.perf_counter() - started,
+                                estimate,
+                            )
+                        yield chunk
+                return
+            except Exception as error:
+                # Output already handed to the caller cannot be taken back.
+                if streamed:
+                    self._metrics(agent).errors += 1
+                    raise
+                await asyncio.sleep(self._failed(agent, attempt, error))
+                attempt += 1
+
+    def report(self) -> str:
+        """Per-agent metrics as a table."""
+        lines = [
+            f"{'agent':22} {'reqs':>5} {'errors':>6} {'retries':>7} {'prompt':>8}"
+            f" {'compl.':>7} {'waited':>7} {'p50':>7} {'p95':>7}"
+        ]
+        for agent, metrics in self.metrics.items():
+            s = metrics.summary()
+            lines.append(
+                f"{agent:22} {s['requests']:>5} {s['errors']:>6} {s['retries']:>7}"
+                f" {s['prompt_tokens']:>8} {s['completion_tokens']:>7}"
+                f" {s['wait_seconds']:>6.2f}s {s['latency_p50']:>6.2f}s"
+                f" {s['latency_p95']:>6.2f}s"
+            )
+        return "\n".join(lines)
+
+    # ChatCompletionClient interface, as the "default" agent.
+
+    async def create(
+        self,
+        messages: Sequence[LLMMessage],
+        *,
+        tools: Sequence[Tool | ToolSchema] = [],
+        tool_choice: Tool | Literal["auto", "required", "none"] = "auto",
+        json_output: Optional[bool | type[BaseModel]] = None,
+        extra_create_args: Mapping[str, Any] = {},
+        cancellation_token: Optional[CancellationToken] = None,
+    ) -> CreateResult:
+        return await self.for_agent("default").create(
+            messages,
+            tools=tools,
+            tool_choice=tool_choice,
+            json_output=json_output,
+            extra_create_args=extra_create_args,
+            cancellation_token=cancellation_token,
+        )
+
+    def create_stream(
+        self,
+        messages: Sequence[LLMMessage],
+        *,
+        tools: Sequence[Tool | ToolSchema] = [],
+        tool_choice: Tool | Literal["auto", "required", "none"] = "auto",
+        json_output: Optional[bool | type[BaseModel]] = None,
+        extra_create_args: Mapping[str, Any] = {},
+        cancellation_token: Optional[CancellationToken] = None,
+    ) -> AsyncGenerator[Union[str, CreateResult], None]:
+        return self.for_agent("default").create_stream(
+            messages,
+            tools=tools,
+            tool_choice=tool_choice,
+            json_output=json_output,
+            extra_create_args=extra_create_args,
+            cancellation_token=cancellation_token,
+        )
+
+    async def close(self) -> None:
+        await self._client.close()
+
+    def actual_usage(self) -> RequestUsage:
+        return self.total_usage()
+
+    def total_usage(self) -> RequestUsage:
+        return RequestUsage(
+            prompt_tokens=sum(m.prompt_tokens for m in self.metrics.values()),
+            completion_tokens=sum(m.completion_tokens for m in self.metrics.values()),
+        )
+
+    def count_tokens(
+        self, messages: Sequence[LLMMessage], *, tools: Sequence[Tool | ToolSchema] = []
+    ) -> int:
+        return self._client.count_tokens(messages, tools=tools)
+
+    def remaining_tokens(
+        self, messages: Sequence[LLMMessage], *, tools: Sequence[Tool | ToolSchema] = []
+    ) -> int:
+        return self._client.remaining_tokens(messages, tools=tools)
+
+    @property
+    def capabilities(self) -> ModelCapabilities:  # type: ignore
+        return self._client.capabilities
+
+    @property
+    def model_info(self) -> ModelInfo:
+        return self._client.model_info
+
+
+class PooledClient(ChatCompletionClient):
+    """One agent's view of a `ClientPool`."""
+
+    def __init__(self, pool: ClientPool, agent_name: str):
+        self._pool = pool
+        self.agent_name = agent_name
+
+    async def create(
+        self,
+        messages: Sequence[LLMMessage],
+        *,
+        tools: Sequence[Tool | ToolSchema] = [],
+        tool_choice: Tool | Literal["auto", "required", "none"] = "auto",
+        json_output: Optional[bool | type[BaseModel]] = None,
+        extra_create_args: Mapping[str, Any] = {},
+        cancellation_token: Optional[CancellationToken] = None,
+    ) -> CreateResult:
+        return await self._pool._create(
+            self.agent_name,
+            messages,
+            tools=tools,
+            tool_choice=tool_choice,
+            json_output=json_output,
+            extra_create_args=extra_create_args,
+            cancellation_token=cancellation_token,
+        )
+
+    def create_stream(
+        self,
+        messages: Sequence[LLMMessage],
+        *,
+        tools: Sequence[Tool | ToolSchema] = [],
+        tool_choice: Tool | Literal["auto", "required", "none"] = "auto",
+        json_output: Optional[bool | type[BaseModel]] = None,
+        extra_create_args: Mapping[str, Any] = {},
+        cancellation_token: Optional[CancellationToken] = None,
+    ) -> AsyncGenerator[Union[str, CreateResult], None]:
+        return self._pool._create_stream(
+            self.agent_name,
+            messages,
+            tools=tools,
+            tool_choice=tool_choice,
+            json_output=json_output,
+            extra_create_args=extra_create_args,
+            cancellation_token=cancellation_token,
+        )
+
+    async def close(self) -> None:
+        # The pool owns the wrapped client and closes it.
+        pass
+
+    def actual_usage(self) -> RequestUsage:
+        return self.total_usage()
+
+    def total_usage(self) -> RequestUsage:
+        metrics = self._pool._metrics(self.agent_name)
+        return RequestUsage(
+            prompt_tokens=metrics.prompt_tokens,
+            completion_tokens=metrics.completion_tokens,
+        )
+
+    def count_tokens(
+        self, messages: Sequence[LLMMessage], *, tools: Sequence[Tool | ToolSchema] = []
+    ) -> int:
+        return self._pool.count_tokens(messages, tools=tools)
+
+    def remaining_tokens(
+        self, messages: Sequence[LLMMessage], *, tools: Sequence[Tool | ToolSchema] = []
+    ) -> int:
+        return self._pool.remaining_tokens(messages, tools=tools)
+
+    @property
+    def capabilities(self) -> ModelCapabilities:  # type: ignore
+        return self._pool.capabilities
+
+    @property
+    def model_info(self) -> ModelInfo:
+        return self._pool.model_info
+
+
+def agent_client(client: ChatCompletionClient, agent_name: str) -> ChatCompletionClient:
+    """The pool's view for an agent, or `client` itself if it is not a pool."""
+    if isinstance(client, ClientPool):
+        return client.for_agent(agent_name)
+    return client
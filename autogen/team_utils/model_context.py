@@ -0,0 +1,371 @@
+"""Per-agent model contexts for autogen group chats.
+
+In a group chat every `AssistantAgent` keeps the whole transcript in its
+model context and sends all of it on every turn, so prompt tokens grow about
+quadratically with the length of the run. Giving each agent one of these
+contexts (`AssistantAgent(..., model_context=...)`) limits what it sends:
+
+- `LastMessagesContext`: the task and the last N messages.
+- `TokenBudgetContext`: the task and as many recent messages as fit a budget.
+- `SourceFilteredContext`: the task, the agent's own messages, and messages
+  from the given sources only.
+- `SummarizingContext`: the task, a model-written summary of older messages,
+  and the recent ones.
+- `FullContext`: everything, as autogen's default, for comparison.
+
+Each context records, for every model call, the tokens of the whole history
+and of the part it sent; `context_report()` tabulates them per agent and
+turn. Tokens are estimated as characters / 4, like `ClientPool` does, since
+the Anthropic client's `count_tokens` needs to download a tokenizer.
+"""
+
+from typing import Any, List, Mapping, Optional, Sequence
+
+from autogen_core import Component, ComponentModel
+from autogen_core.model_context import ChatCompletionContext
+from autogen_core.models import (
+    ChatCompletionClient,
+    FunctionExecutionResultMessage,
+    LLMMessage,
+    SystemMessage,
+    UserMessage,
+)
+from pydantic import BaseModel
+from typing_extensions import Self
+
+SUMMARY_PROMPT = (
+    "Summarize the conversation below for a participant who will continue it."
+    " Keep decisions, open questions, facts and requests; drop pleasantries."
+    " Answer with the summary only, in at most {words} words."
+)
+
+
+def estimate_tokens(messages: Sequence[LLMMessage]) -> int:
+    """Rough token count of `messages`: characters / 4."""
+    return sum(len(str(message.content)) for message in messages) // 4
+
+
+def _drop_orphans(messages: List[LLMMessage]) -> List[LLMMessage]:
+    # Tool results whose call was cut off would be rejected by the model.
+    while messages and isinstance(messages[0], FunctionExecutionResultMessage):
+        messages = messages[1:]
+    return messages
+
+
+class WindowedContext(ChatCompletionContext):
+    """Base of the contexts here: keeps the first `keep_first` messages (the
+    task) and lets `_select` choose from the rest.
+
+    Attributes:
+        history (list[tuple[int, int]]): Estimated tokens of the whole history
+            and of the messages sent, per model call.
+    """
+
+    def __init__(self, keep_first: int = 1) -> None:
+        super().__init__()
+        self._keep_first = keep_first
+        self.history: list[tuple[int, int]] = []
+
+    async def _select(self, messages: List[LLMMessage]) -> List[LLMMessage]:
+        return messages
+
+    async def get_messages(self) -> List[LLMMessage]:
+        head = self._messages[: self._keep_first]
+        rest = self._messages[self._keep_first :]
+        messages = head + _drop_orphans(await self._select(list(rest)))
+        self.history.append(
+            (estimate_tokens(self._messages), estimate_tokens(messages))
+        )
+        return messages
+
+
+class FullContextConfig(BaseModel):
+    pass
+
+
+class FullContext(WindowedContext, Component[FullContextConfig]):
+    """Sends the whole history, as autogen's default context does, but
+    records its size."""
+
+    component_config_schema = FullContextConfig
+    component_provider_override = "team_utils.model_context.FullContext"
+
+    def __init__(self) -> None:
+        super().__init__(keep_first=0)
+
+    def _to_config(self) -> FullContextConfig:
+        return FullContextConfig()
+
+    @classmethod
+    def _from_config(cls, config: FullContextConfig) -> Self:
+        return cls()
+
+
+class LastMessagesContextConfig(BaseModel):
+    keep_last: int
+    keep_first: int = 1
+
+
+class LastMessagesContext(WindowedContext, Component[LastMessagesContextConfig]):
+    """Sends the task and the last `keep_last` messages.
+
+    Args:
+        keep_last (int): Recent messages to send.
+        keep_first (int): Leading messages always sent; the task.
+    """
+
+    component_config_schema = LastMessagesContextConfig
+    component_provider_override = "team_utils.model_context.LastMessagesContext"
+
+    def __init__(self, keep_last: int, keep_first: int = 1) -> None:
+        if keep_last <= 0:
+            raise ValueError("keep_last must be greater than 0.")
+        super().__init__(keep_first)
+        self._keep_last = keep_last
+
+    async def _select(self, messages: List[LLMMessage]) -> List[LLMMessage]:
+        return messages[-self._keep_last :]
+
+    def _to_config(self) -> LastMessagesContextConfig:
+        return LastMessagesContextConfig(
+            keep_last=self._keep_last, keep_first=self._keep_first
+        )
+
+    @classmethod
+    def _from_config(cls, config: LastMessagesContextConfig) -> Self:
+        return cls(**config.model_dump())
+
+
+class TokenBudgetContextConfig(BaseModel):
+    max_tokens: int
+    keep_first: int = 1
+
+
+class TokenBudgetContext(WindowedContext, Component[TokenBudgetContextConfig]):
+    """Sends the task and the most recent messages that fit in `max_tokens`.
+    The newest message is always sent.
+
+    Unlike autogen's `TokenLimitedChatCompletionContext`, which drops
+    messages from the middle of the history, this keeps a contiguous tail.
+
+    Args:
+        max_tokens (int): Budget of the messages after the task.
+        keep_first (int): Leading messages always sent; the task.
+    """
+
+    component_config_schema = TokenBudgetContextConfig
+    component_provider_override = "team_utils.model_context.TokenBudgetContext"
+
+    def __init__(self, max_tokens: int, keep_first: int = 1) -> None:
+        if max_tokens <= 0:
+            raise ValueError("max_tokens must be greater than 0.")
+        super().__init__(keep_first)
+        self._max_tokens = max_tokens
+
+    async def _select(self, messages: List[LLMMessage]) -> List[LLMMessage]:
+        total = 0
+        start = len(messages)
+        while start > 0:
+            total += estimate_tokens(messages[start - 1 : start])
+            if total > self._max_tokens and start < len(messages):
+                break
+            start -= 1
+        return messages[start:]
+
+    def _to_config(self) -> TokenBudgetContextConfig:
+        return TokenBudgetContextConfig(
+            max_tokens=self._max_tokens, keep_first=self._keep_first
+        )
+
+    @classmethod
+    def _from_config(cls, config: TokenBudgetContextConfig) -> Self:
+        return cls(**config.model_dump())
+
+
+class SourceFilteredContextConfig(BaseModel):
+    sources: List[str]
+    keep_last: Optional[int] = None
+    keep_first: int = 1
+
+
+class SourceFilteredContext(WindowedContext, Component[SourceFilteredContextConfig]):
+    """Sends the task, the agent's own messages and tool results, and the
+    messages of `sources`; the rest of the team's chatter is left out.
+
+    Args:
+        sources (list[str]): Names of the agents (or "user") to listen to.
+        keep_last (int, optional): Of the messages kept, send only the last
+            `keep_last`.
+        keep_first (int): Leading messages always sent; the task.
+    """
+
+    component_config_schema = SourceFilteredContextConfig
+    component_provider_override = "team_utils.model_context.SourceFilteredContext"
+
+    def __init__(
+        self,
+        sources: Sequence[str],
+        keep_last: Optional[int] = None,
+        keep_first: int = 1,
+    ) -> None:
+        super().__init__(keep_first)
+        self._sources = list(sources)
+        self._keep_last = keep_last
+
+    async def _select(self, messages: List[LLMMessage]) -> List[LLMMessage]:
+        kept = [
+            message
+            for message in messages
+            if not isinstance(message, UserMessage) or message.source in self._sources
+        ]
+        return kept[-self._keep_last :] if self._keep_last else kept
+
+    def _to_config(self) -> SourceFilteredContextConfig:
+        return SourceFilteredContextConfig(
+            sources=self._sources,
+            keep_last=self._keep_last,
+            keep_first=self._keep_first,
+        )
+
+    @classmethod
+    def _from_config(cls, config: SourceFilteredContextConfig) -> Self:
+        return cls(**config.model_dump())
+
+
+class SummarizingContextConfig(BaseModel):
+    model_client: ComponentModel
+    keep_last: int = 4
+    summarize_after: int = 4
+    summary_words: int = 200
+    keep_first: int = 1
+
+
+class SummarizingContext(WindowedContext, Component[SummarizingContextConfig]):
+    """Sends the task, a summary of older messages, and the last `keep_last`
+    messages.
+
+    Once `summarize_after` messages have fallen out of the recent window,
+    they are folded into the summary with one model call, together with the
+    previous summary; so older history costs one call per `summarize_after`
+    messages instead of being resent on every turn.
+
+    Args:
+        model_client (ChatCompletionClient): Client that writes the summaries.
+        keep_last (int): Recent messages to send verbatim.
+        summarize_after (int): Messages to collect before summarizing again.
+        summary_words (int): Length the summary is asked to stay within.
+        keep_first (int): Leading messages always sent; the task.
+
+    Attributes:
+        summary_tokens (int): Prompt and completion tokens the summaries cost.
+    """
+
+    component_config_schema = SummarizingContextConfig
+    component_provider_override = "team_utils.model_context.SummarizingContext"
+
+    def __init__(
+        self,
+        model_client: ChatCompletionClient,
+        keep_last: int = 4,
+        summarize_after: int = 4,
+        summary_words: int = 200,
+        keep_first: int = 1,
+    ) -> None:
+        super().__init__(keep_first)
+        self._model_client = model_client
+        self._keep_last = keep_last
+        self._summarize_after = summarize_after
+        self._summary_words = summary_words
+        self._summary: Optional[str] = None
+        self._folded = 0
+        self.summary_tokens = 0
+
+    async def _summarize(self, messages: List[LLMMessage]) -> str:
+        transcript = "\n\n".join(
+            f"{getattr(message, 'source', 'tool')}: {message.content}"
+            for message in messages
+        )
+        if self._summary:
+            transcript = f"Summary so far:\n{self._summary}\n\n{transcript}"
+        result = await self._model_client.create(
+            [
+                SystemMessage(content=SUMMARY_PROMPT.format(words=self._summary_words)),
+                UserMessage(content=transcript, source="user"),
+            ]
+        )
+        self.summary_tokens += (
+            result.usage.prompt_tokens + result.usage.completion_tokens
+        )
+        return str(result.content)
+
+    async def _select(self, messages: List[LLMMessage]) -> List[LLMMessage]:
+        end = len(messages) - self._keep_last
+        # Tool results stay with their call.
+        while 0 < end < len(messages) and isinstance(
+            messages[end], FunctionExecutionResultMessage
+        ):
+            end += 1
+        if end - self._folded >= self._summarize_after:
+            self._summary = await self._summarize(messages[self._folded : end])
+            self._folded = end
+        recent = messages[self._folded :]
+        if self._summary is None:
+            return recent
+        summary = UserMessage(
+            content=f"Summary of the earlier conversation:\n{self._summary}",
+            source="summary",
+        )
+        return [summary, *recent]
+
+    async def clear(self) -> None:
+        await super().clear()
+        self._summary = None
+        self._folded = 0
+
+    async def save_state(self) -> Mapping[str, Any]:
+        state = dict(await super().save_state())
+        state.update(summary=self._summary, folded=self._folded)
+        return state
+
+    async def load_state(self, state: Mapping[str, Any]) -> None:
+        await super().load_state(state)
+        self._summary = state.get("summary")
+        self._folded = state.get("folded", 0)
+
+    def _to_config(self) -> SummarizingContextConfig:
+        return SummarizingContextConfig(
+            model_client=self._model_client.dump_component(),
+            keep_last=self._keep_last,
+            summarize_after=self._summarize_after,
+            summary_words=self._summary_words,
+            keep_first=self._keep_first,
+        )
+
+    @classmethod
+    def _from_config(cls, config: SummarizingContextConfig) -> Self:
+        return cls(
+            model_client=ChatCompletionClient.load_component(config.model_client),
+            keep_last=config.keep_last,
+            summarize_after=config.summarize_after,
+            summary_words=config.summary_words,
+            keep_first=config.keep_first,
+        )
+
+
+def context_report(contexts: Mapping[str, WindowedContext]) -> str:
+    """Estimated message tokens per agent and turn: the whole history, what
+    was sent, and the share saved."""
+    lines = [f"{'agent':22} {'turn':>5} {'history':>8} {'sent':>8} {'saved':>6}"]
+    for agent, context in contexts.items():
+        for turn, (full, sent) in enumerate(context.history, start=1):
+            saved = 1 - sent / full if full else 0
+            lines.append(f"{agent:22} {turn:>5} {full:>8} {sent:>8} {saved:>6.0%}")
+        full = sum(full for full, _ in context.history)
+        sent = sum(sent for _, sent in context.history)
+        extra = getattr(context, "summary_tokens", 0)
+        saved = 1 - (sent + extra) / full if full else 0
+        summary = f"  (+{extra} for summaries)" if extra else ""
+        lines.append(
+            f"{agent:22} {'total':>5} {full:>8} {sent:>8} {saved:>6.0%}{summary}"
+        )
+    return "\n".join(lines)
@@ -0,0 +1,371 @@
+"""Record real model calls once, then replay them offline.
+
+`RecordReplayClient` is a `ChatCompletionClient` for benchmarking autogen
+teams without live provider calls. In "record" mode it forwards every request
+to a real client and appends the request's key, the result, any streamed
+chunks and their timing to a JSONL fixture. In "replay" mode it answers from
+the fixture alone, optionally waiting as long as the recorded call took, or
+as long as a given first-token latency and token rate imply. "auto" replays
+what the fixture has and records the rest.
+
+Requests are keyed by a hash of their normalized content: messages, tools,
+tool choice, JSON output and extra create arguments. Tool call ids are left
+out, since providers make up new ones on every call. A request with no exact
+match falls back to one with the same messages in another order, as when a
+`GraphFlow` delivers concurrent answers in whichever order they finished. The
+same request made twice in a run replays its recordings in order.
+"""
+
+import asyncio
+import hashlib
+import json
+import re
+import time
+from pathlib import Path
+from typing import Any, AsyncGenerator, Literal, Mapping, Optional, Sequence, Union
+
+from autogen_core import CancellationToken
+from autogen_core.models import (
+    ChatCompletionClient,
+    CreateResult,
+    LLMMessage,
+    ModelCapabilities,
+    ModelFamily,
+    ModelInfo,
+    RequestUsage,
+)
+from autogen_core.tools import Tool, ToolSchema
+from pydantic import BaseModel
+
+MODES = ("record", "replay", "auto")
+_VOLATILE_KEYS = {"id", "call_id"}
+
+
+class MissingRecordingError(LookupError):
+    """A request has no recording in the fixture, and there is no client to
+    record it with."""
+
+
+def _normalize(value: Any) -> Any:
+    if isinstance(value, BaseModel):
+        return _normalize(value.model_dump(mode="json"))
+    if isinstance(value, Mapping):
+        return {
+            key: _normalize(item)
+            for key, item in value.items()
+            if key not in _VOLATILE_KEYS and item is not None
+        }
+    if isinstance(value, (list, tuple)):
+        return [_normalize(item) for item in value]
+    if isinstance(value, str):
+        return re.sub(r"[ \t]+\n", "\n", value.replace("\r\n", "\n")).strip()
+    if isinstance(value, (int, float, bool)) or value is None:
+        return value
+    return str(value)
+
+
+def request_key(
+    messages: Sequence[LLMMessage],
+    tools: Sequence[Tool | ToolSchema] = [],
+    tool_choice: Tool | str = "auto",
+    json_output: Optional[bool | type[BaseModel]] = None,
+    extra_create_args: Mapping[str, Any] = {},
+    ordered: bool = True,
+) -> str:
+    """The fixture key of a request: a hash of its normalized content. With
+    `ordered=False`, the order of the messages does not change the key."""
+    if isinstance(json_output, type):
+        json_output = json_output.model_json_schema()
+    normalized = [_normalize(message) for message in messages]
+    if not ordered:
+        normalized.sort(key=lambda message: json.dumps(message, sort_keys=True))
+    request = {
+        "messages": normalized,
+        "tools": [
+            _normalize(tool.schema if isinstance(tool, Tool) else tool)
+            for tool in tools
+        ],
+        "tool_choice": (
+            tool_choice.name if isinstance(tool_choice, Tool) else tool_choice
+        ),
+        "json_output": _normalize(json_output),
+        "extra_create_args": _normalize(extra_create_args),
+    }
+    encoded = json.dumps(request, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(encoded.encode()).hexdigest()
+
+
+class RecordReplayClient(ChatCompletionClient):
+    """Records a client's responses to a fixture, or replays them from it.
+
+    Record mode replaces the fixture; auto mode adds to it.
+
+    Args:
+        fixture (str | Path): JSONL file the recordings are read from and
+            appended to.
+        client (ChatCompletionClient, optional): The real client. Required to
+            record.
+        mode (str): "record", "replay" or "auto".
+        latency (float, optional): Seconds before the first token of a
+            replayed call. Defaults to the recorded time to first token.
+        tokens_per_second (float, optional): Rate at which replayed
+            completion tokens arrive. Defaults to the recorded rate.
+        time_scale (float): Multiplies every replay delay; 0 replays
+            instantly.
+        model_info (ModelInfo, optional): Reported in replay mode when there
+            is no client. Defaults to the recorded one.
+    """
+
+    def __init__(
+        self,
+        fixture: Union[str, Path],
+        client: Optional[ChatCompletionClient] = None,
+        mode: Literal["record", "replay", "auto"] = "replay",
+        latency: Optional[float] = None,
+        tokens_per_second: Optional[float] = None,
+        time_scale: float = 1.0,
+        model_info: Optional[ModelInfo] = None,
+    ):
+        if mode not in MODES:
+            raise ValueError(f"mode must be one of {MODES}, not {mode!r}")
+        if mode != "replay" and client is None:
+            raise ValueError(f"{mode} mode needs a client to record with")
+        self.fixture = Path(fixture)
+        self.mode = mode
+        self.latency = latency
+        self.tokens_per_second = tokens_per_second
+        self.time_scale = time_scale
+        self._client = client
+        self._recordings: dict[str, list[dict]] = {}
+        self._unordered: dict[str, list[dict]] = {}
+        self._cursors: dict[str, int] = {}
+        self._model_info = model_info
+        if mode != "record" and self.fixture.exists():
+            self._load()
+        self._usage = RequestUsage(prompt_tokens=0, completion_tokens=0)
+        self.stats = {
+            "replayed": 0,
+            "recorded": 0,
+            "missing": 0,
+            "emulated_seconds": 0.0,
+        }
+
+    def _load(self) -> None:
+        with self.fixture.open() as f:
+            for line in f:
+                if line.strip():
+                    record = json.loads(line)
+                    self._index(record)
+                    self._model_info = self._model_info or record.get("model_info")
+
+    def _index(self, record: dict) -> None:
+        self._recordings.setdefault(record["key"], []).append(record)
+        self._unordered.setdefault(record["unordered_key"], []).append(record)
+
+    def _keys(self, messages, tools, tool_choice, json_output, extra_create_args):
+        request = (messages, tools, tool_choice, json_output, extra_create_args)
+        return request_key(*request), request_key(*request, ordered=False)
+
+    def _next_recording(self, keys: tuple[str, str]) -> Optional[dict]:
+        if self.mode == "record":
+            return None
+        for key, index in zip(keys, (self._recordings, self._unordered)):
+            if key in index:
+                # Repeats of a request replay its recordings in order, then
+                # the last.
+                recordings = index[key]
+                cursor = self._cursors.get(key, 0)
+                self._cursors[key] = cursor + 1
+                return recordings[min(cursor, len(recordings) - 1)]
+        return None
+
+    def _missing(self, key: str) -> MissingRecordingError:
+        self.stats["missing"] += 1
+        return MissingRecordingError(
+            f"no recording of request {key[:12]} in {self.fixture};"
+            " record it with mode='record' or 'auto'"
+        )
+
+    def _save(self, keys: tuple[str, str], result: CreateResult, timing, chunks=None):
+        record = {
+            "key": keys[0],
+            "unordered_key": keys[1],
+            "result": result.model_dump(mode="json"),
+            "chunks": chunks,
+            **timing,
+            "model_info": dict(self._client.model_info),
+        }
+        self.fixture.parent.mkdir(parents=True, exist_ok=True)
+        # Written as each call finishes, so an interrupted run keeps its
+        # recordings. Record mode starts the fixture over; auto adds to it.
+        fresh = self.mode == "record" and not self.stats["recorded"]
+        with self.fixture.open("w" if fresh else "a") as f:
+            f.write(json.dumps(record) + "\n")
+        self._index(record)
+        self.stats["recorded"] += 1
+
+    def _delays(self, record: dict, pieces: int) -> tuple[float, float]:
+        """Seconds before the first piece and between the pieces after it."""
+        first = self.latency if self.latency is not None else record["first_seconds"]
+        tokens = record["result"]["usage"]["completion_tokens"]
+        if self.tokens_per_second:
+            rest = tokens / self.tokens_per_second
+        else:
+            rest = max(0.0, record["total_seconds"] - record["first_seconds"])
+        gap = rest / max(1, pieces - 1)
+        return first * self.time_scale, gap * self.time_scale
+
+    async def _sleep(
+        self, seconds: float, cancellation_token: Optional[CancellationToken]
+    ) -> None:
+        if seconds <= 0:
+            return
+        self.stats["emulated_seconds"] += seconds
+        sleep = asyncio.ensure_future(asyncio.sleep(seconds))
+        if cancellation_token is not None:
+            cancellation_token.link_future(sleep)
+        await sleep
+
+    def _replayed(self, record: dict) -> CreateResult:
+        result = CreateResult.model_validate(record["result"])
+        self._count(result.usage)
+        self.stats["replayed"] += 1
+        return result
+
+    def _count(self, usage: RequestUsage) -> None:
+        self._usage = RequestUsage(
+            prompt_tokens=self._usage.prompt_tokens + usage.prompt_tokens,
+            completion_tokens=self._usage.completion_tokens + usage.completion_tokens,
+        )
+
+    async def create(
+        self,
+        messages: Sequence[LLMMessage],
+        *,
+        tools: Sequence[Tool | ToolSchema] = [],
+        tool_choice: Tool | Literal["auto", "required", "none"] = "auto",
+        json_output: Optional[bool | type[BaseModel]] = None,
+        extra_create_args: Mapping[str, Any] = {},
+        cancellation_token: Optional[CancellationToken] = None,
+    ) -> CreateResult:
+        keys = self._keys(messages, tools, tool_choice, json_output, extra_create_args)
+        record = self._next_recording(keys)
+        if record is not None:
+            first, gap = self._delays(record, 2)
+            await self._sleep(first + gap, cancellation_token)
+            return self._replayed(record)
+        if self._client is None:
+            raise self._missing(keys[0])
+        started = time.perf_counter()
+        result = await self._client.create(
+            messages,
+            tools=tools,
+            tool_choice=tool_choice,
+            json_output=json_output,
+            extra_create_args=extra_create_args,
+            cancellation_token=cancellation_token,
+        )
+        seconds = time.perf_counter() - started
+        # Without streaming, the first token is only seen with the last.
+        self._save(keys, result, {"first_seconds": seconds, "total_seconds": seconds})
+        self._count(result.usage)
+        return result
+
+    async def create_stream(
+        self,
+        messages: Sequence[LLMMessage],
+        *,
+        tools: Sequence[Tool | ToolSchema] = [],
+        tool_choice: Tool | Literal["auto", "required", "none"] = "auto",
+        json_output: Optional[bool | type[BaseModel]] = None,
+        extra_create_args: Mapping[str, Any] = {},
+        cancellation_token: Optional[CancellationToken] = None,
+    ) -> AsyncGenerator[Union[str, CreateResult], None]:
+        keys = self._keys(messages, tools, tool_choice, json_output, extra_create_args)
+        record = self._next_recording(keys)
+        if record is not None:
+            chunks = record["chunks"]
+            if chunks is None:
+                # Recorded without streaming: stream the text word by word.
+                content = record["result"]["content"]
+                chunks = (
+                    re.findall(r"\S+\s*|\s+", content)
+                    if isinstance(content, str)
+                    else []
+                )
+            first, gap = self._delays(record, len(chunks) + 1)
+            await self._sleep(first, cancellation_token)
+            for chunk in chunks:
+                yield chunk
+                await self._sleep(gap, cancellation_token)
+            yield self._replayed(record)
+            return
+        if self._client is None:
+            raise self._missing(keys[0])
+        chunks: list[str] = []
+        first_seconds = None
+        started = time.perf_counter()
+        async for chunk in self._client.create_stream(
+            messages,
+            tools=tools,
+            tool_choice=tool_choice,
+            json_output=json_output,
+            extra_create_args=extra_create_args,
+            cancellation_token=cancellation_token,
+        ):
+            if first_seconds is None:
+                first_seconds = time.perf_counter() - started
+            if isinstance(chunk, CreateResult):
+                self._save(
+                    keys,
+                    chunk,
+                    {
+                        "first_seconds": first_seconds,
+                        "total_seconds": time.perf_counter() - started,
+                    },
+                    chunks,
+                )
+                self._count(chunk.usage)
+            else:
+                chunks.append(chunk)
+            yield chunk
+
+    async def close(self) -> None:
+        if self._client is not None:
+            await self._client.close()
+
+    def actual_usage(self) -> RequestUsage:
+        return self._usage
+
+    def total_usage(self) -> RequestUsage:
+        return self._usage
+
+    def count_tokens(
+        self, messages: Sequence[LLMMessage], *, tools: Sequence[Tool | ToolSchema] = []
+    ) -> int:
+        if self._client is not None:
+            return self._client.count_tokens(messages, tools=tools)
+        return sum(len(str(message.content)) for message in messages) // 4
+
+    def remaining_tokens(
+        self, messages: Sequence[LLMMessage], *, tools: Sequence[Tool | ToolSchema] = []
+    ) -> int:
+        if self._client is not None:
+            return self._client.remaining_tokens(messages, tools=tools)
+        return 200000 - self.count_tokens(messages, tools=tools)
+
+    @property
+    def capabilities(self) -> ModelCapabilities:  # type: ignore
+        return self.model_info
+
+    @property
+    def model_info(self) -> ModelInfo:
+        if self._client is not None:
+            return self._client.model_info
+        return self._model_info or ModelInfo(
+            vision=False,
+            function_calling=True,
+            json_output=False,
+            family=ModelFamily.UNKNOWN,
+            structured_output=False,
+        )
@@ -0,0 +1,310 @@
+"""Cost and latency limits for autogen group chats.
+
+Teams that stop only on a phrase such as APPROVE or TERMINATE can run forever
+when the phrase never comes. `cost_aware_termination()` combines the phrase
+with a token budget (`TokenUsageTermination`), a wall-clock deadline
+(`TimeoutTermination`), a message cap (`MaxMessageTermination`) and
+`ConvergenceTermination`, which stops when an agent's successive drafts
+barely change or a critic repeats its feedback.
+
+The limits are combined by `ReportingTermination`, which works like the `|`
+operator but names each condition, remembers which ones fired, and counts the
+tokens the run used so that `report()` can estimate the tokens it saved.
+"""
+
+import difflib
+import time
+from dataclasses import dataclass
+from typing import Optional, Sequence
+
+from autogen_agentchat.base import TerminatedException, TerminationCondition
+from autogen_agentchat.conditions import (
+    MaxMessageTermination,
+    TextMentionTermination,
+    TimeoutTermination,
+    TokenUsageTermination,
+)
+from autogen_agentchat.messages import BaseAgentEvent, BaseChatMessage, StopMessage
+from autogen_core import Component, ComponentModel
+from pydantic import BaseModel
+from typing_extensions import Self
+
+
+def _at_least(a: str, b: str, threshold: float) -> bool:
+    # The quick ratios are cheap upper bounds of the real one.
+    matcher = difflib.SequenceMatcher(None, a, b)
+    return (
+        matcher.real_quick_ratio() >= threshold
+        and matcher.quick_ratio() >= threshold
+        and matcher.ratio() >= threshold
+    )
+
+
+class ConvergenceTerminationConfig(BaseModel):
+    source: str
+    threshold: float = 0.95
+    critic: Optional[str] = None
+    critic_threshold: float = 0.9
+
+
+class ConvergenceTermination(
+    TerminationCondition, Component[ConvergenceTerminationConfig]
+):
+    """Terminate when an agent's drafts stop changing or a critic repeats
+    itself.
+
+    Args:
+        source (str): Agent whose successive messages are compared.
+        threshold (float): Similarity at which two drafts count as the same.
+        critic (str, optional): Agent whose successive feedback is compared.
+        critic_threshold (float): Similarity at which two pieces of feedback
+            count as the same.
+    """
+
+    component_config_schema = ConvergenceTerminationConfig
+    component_provider_override = "team_utils.termination.ConvergenceTermination"
+
+    def __init__(
+        self,
+        source: str,
+        threshold: float = 0.95,
+        critic: Optional[str] = None,
+        critic_threshold: float = 0.9,
+    ) -> None:
+        self._source = source
+        self._threshold = threshold
+        self._critic = critic
+        self._critic_threshold = critic_threshold
+        self._last: dict[str, str] = {}
+        self._terminated = False
+
+    @property
+    def terminated(self) -> bool:
+        return self._terminated
+
+    async def __call__(
+        self, messages: Sequence[BaseAgentEvent | BaseChatMessage]
+    ) -> StopMessage | None:
+        if self._terminated:
+            raise TerminatedException("Termination condition has already been reached")
+        for message in messages:
+            if not isinstance(message, BaseChatMessage):
+                continue
+            if message.source == self._source:
+                threshold, what = self._threshold, "drafts converged"
+            elif message.source == self._critic:
+                threshold, what = self._critic_threshold, "feedback repeated"
+            else:
+                continue
+            text = message.to_model_text()
+            previous = self._last.get(message.source)
+            self._last[message.source] = text
+            if previous is not None and _at_least(previous, text, threshold):
+                self._terminated = True
+                return StopMessage(
+                    content=f"'{message.source}' {what} (similarity >= {threshold})",
+                    source="ConvergenceTermination",
+                )
+        return None
+
+    async def reset(self) -> None:
+        self._last = {}
+        self._terminated = False
+
+    def _to_config(self) -> ConvergenceTerminationConfig:
+        return ConvergenceTerminationConfig(
+            source=self._source,
+            threshold=self._threshold,
+            critic=self._critic,
+            critic_threshold=self._critic_threshold,
+        )
+
+    @classmethod
+    def _from_config(cls, config: ConvergenceTerminationConfig) -> Self:
+        return cls(**config.model_dump())
+
+
+def _projected_tokens(costs: list[int], remaining: int) -> int:
+    """Tokens of `remaining` more model calls. Every prompt carries the whole
+    history, so the cost of a call keeps growing by about as much as it grew
+    per call so far."""
+    if not costs or remaining <= 0:
+        return 0
+    growth = max((costs[-1] - costs[0]) / (len(costs) - 1), 0) if len(costs) > 1 else 0
+    return int(remaining * costs[-1] + growth * remaining * (remaining + 1) / 2)
+
+
+@dataclass
+class TerminationReport:
+    """What stopped a run and what it cost."""
+
+    fired: list[str]
+    reason: str
+    messages: int
+    tokens: int
+    seconds: float
+    # Tokens the run would have spent until `horizon` messages; 0 when no
+    # horizon is known. See `_projected_tokens`.
+    estimated_tokens_saved: int
+
+    def __str__(self) -> str:
+        return (
+            f"Stopped by {', '.join(self.fired) or 'nothing'} ({self.reason}) after"
+            f" {self.messages} messages, {self.tokens} tokens and"
+            f" {self.seconds:.1f}s; about {self.estimated_tokens_saved} tokens saved"
+        )
+
+
+class ReportingTerminationConfig(BaseModel):
+    conditions: dict[str, ComponentModel]
+    horizon: Optional[int] = None
+    goal: Optional[str] = None
+
+
+class ReportingTermination(TerminationCondition, Component[ReportingTerminationConfig]):
+    """Terminate when any of several named conditions does, and keep a record
+    of the run for `report()`.
+
+    Args:
+        conditions (dict[str, TerminationCondition]): Conditions by name.
+        horizon (int, optional): Message count the run would otherwise have
+            reached, to estimate the tokens saved by stopping earlier.
+        goal (str, optional): Name of the condition that marks a finished
+            task; stopping on it alone saves nothing.
+    """
+
+    component_config_schema = ReportingTerminationConfig
+    component_provider_override = "team_utils.termination.ReportingTermination"
+
+    def __init__(
+        self,
+        conditions: dict[str, TerminationCondition],
+        horizon: Optional[int] = None,
+        goal: Optional[str] = None,
+    ) -> None:
+        self._conditions = conditions
+        self._horizon = horizon
+        self._goal = goal
+        self._started: Optional[float] = None
+        self._terminated = False
+        # Tokens of each model call of the current run.
+        self._costs: list[int] = []
+        self._report = TerminationReport([], "", 0, 0, 0.0, 0)
+
+    @property
+    def terminated(self) -> bool:
+        return self._terminated
+
+    async def __call__(
+        self, messages: Sequence[BaseAgentEvent | BaseChatMessage]
+    ) -> StopMessage | None:
+        if self._terminated:
+            raise TerminatedException("Termination condition has already been reached")
+        if self._started is None:
+            # Deadlines run from the first message of a run, not from when
+            # the team was built or last reset.
+            for condition in self._conditions.values():
+                await condition.reset()
+            self._started = time.monotonic()
+            self._report = TerminationReport([], "", 0, 0, 0.0, 0)
+            self._costs = []
+
+        report = self._report
+        for message in messages:
+            if isinstance(message, BaseChatMessage):
+                report.messages += 1
+            if message.models_usage is not None:
+                usage = message.models_usage
+                cost = usage.prompt_tokens + usage.completion_tokens
+                report.tokens += cost
+                self._costs.append(cost)
+        report.seconds = time.monotonic() - self._started
+
+        stops = {}
+        for name, condition in self._conditions.items():
+            stop = await condition(messages)
+            if stop is not None:
+                stops[name] = stop
+        if not stops:
+            return None
+
+        self._terminated = True
+        report.fired = list(stops)
+        report.reason = "; ".join(stop.content for stop in stops.values())
+        if self._horizon and report.fired != [self._goal]:
+            report.estimated_tokens_saved = _projected_tokens(
+                self._costs, self._horizon - report.messages
+            )
+        return StopMessage(content=report.reason, source=", ".join(stops))
+
+    async def reset(self) -> None:
+        # The report of the finished run stays available until the next one.
+        self._started = None
+        self._terminated = False
+        for condition in self._conditions.values():
+            await condition.reset()
+
+    def report(self) -> TerminationReport:
+        """The record of the last (or current) run."""
+        return self._report
+
+    def _to_config(self) -> ReportingTerminationConfig:
+        return ReportingTerminationConfig(
+            conditions={
+                name: condition.dump_component()
+                for name, condition in self._conditions.items()
+            },
+            horizon=self._horizon,
+            goal=self._goal,
+        )
+
+    @classmethod
+    def _from_config(cls, config: ReportingTerminationConfig) -> Self:
+        return cls(
+            {
+                name: TerminationCondition.load_component(model)
+                for name, model in config.conditions.items()
+            },
+            horizon=config.horizon,
+            goal=config.goal,
+        )
+
+
+def cost_aware_termination(
+    text: str,
+    max_tokens: Optional[int] = None,
+    timeout_seconds: Optional[float] = None,
+    max_messages: Optional[int] = None,
+    converge_source: Optional[str] = None,
+    critic: Optional[str] = None,
+    threshold: float = 0.95,
+) -> ReportingTermination:
+    """Stops a team when `text` is mentioned or at the first limit reached.
+
+    Args:
+        text (str): Phrase that ends the run, e.g. "APPROVE".
+        max_tokens (int, optional): Total token budget of the run.
+        timeout_seconds (float, optional): Wall-clock deadline of the run.
+        max_messages (int, optional): Most messages, the task included. Also
+            the horizon for the tokens-saved estimate.
+        converge_source (str, optional): Agent whose drafts are checked for
+            convergence.
+        critic (str, optional): Agent whose feedback is checked for
+            repetition; needs `converge_source`.
+        threshold (float): Similarity at which drafts count as unchanged.
+
+    Returns:
+        ReportingTermination: The combined condition.
+    """
+    conditions: dict[str, TerminationCondition] = {"text": TextMentionTermination(text)}
+    if max_tokens:
+        conditions["token_budget"] = TokenUsageTermination(max_total_token=max_tokens)
+    if timeout_seconds:
+        conditions["deadline"] = TimeoutTermination(timeout_seconds)
+    if max_messages:
+        conditions["max_messages"] = MaxMessageTermination(max_messages)
+    if converge_source:
+        conditions["convergence"] = ConvergenceTermination(
+            converge_source, threshold=threshold, critic=critic
+        )
+    return ReportingTermination(conditions, horizon=max_messages, goal="text")
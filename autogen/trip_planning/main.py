@@ -1,5 +1,11 @@
+import argparse
 import asyncio
 import os
+import sys
+import time
+import uuid
+from pathlib import Path
+from typing import Mapping, Optional
 
 from dotenv import find_dotenv, load_dotenv
 
@@ -7,49 +13,255 @@ from dotenv import find_dotenv, load_dotenv
 load_dotenv(find_dotenv())
 
 from autogen_agentchat.agents import AssistantAgent
-from autogen_agentchat.conditions import TextMentionTermination
-from autogen_agentchat.teams import RoundRobinGroupChat
+from autogen_agentchat.base import TaskResult, Team, TerminationCondition
+from autogen_agentchat.teams import DiGraphBuilder, GraphFlow, RoundRobinGroupChat
 from autogen_agentchat.ui import Console
+from autogen_core.model_context import ChatCompletionContext
+from autogen_core.models import ChatCompletionClient
 from autogen_ext.models.anthropic import AnthropicChatCompletionClient
 
-model_client = AnthropicChatCompletionClient(
-    model="claude-3-7-sonnet-20250219", api_key=os.getenv("ANTHROPIC_API_KEY")
-)
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
 
-planner_agent = AssistantAgent(
-    "planner_agent",
-    model_client=model_client,
-    description="A helpful assistant that can plan trips.",
-    system_message="You are a helpful assistant that can suggest a travel plan for a user based on their request.",
+from team_utils import (
+    CheckpointStore,
+    ClientPool,
+    FullContext,
+    RecordReplayClient,
+    ReportingTermination,
+    SourceFilteredContext,
+    SummarizingContext,
+    TokenBudgetContext,
+    WindowedContext,
+    agent_client,
+    checkpointed_stream,
+    context_report,
+    cost_aware_termination,
 )
 
-local_agent = AssistantAgent(
-    "local_agent",
-    model_client=model_client,
-    description="A local assistant that can suggest local activities or places to visit.",
-    system_message="You are a helpful assistant that can suggest authentic and interesting local activities or places to visit for a user and can utilize any context information provided.",
-)
+TASK = "Plan a 3 day trip to Nepal."
+AGENT_NAMES = ("planner_agent", "local_agent", "language_agent", "travel_summary_agent")
 
-language_agent = AssistantAgent(
-    "language_agent",
-    model_client=model_client,
-    description="A helpful assistant that can provide language tips for a given destination.",
-    system_message="You are a helpful assistant that can review travel plans, providing feedback on important/critical tips about how best to address language or communication challenges for the given destination. If the plan already includes language tips, you can mention that the plan is satisfactory, with rationale.",
-)
 
-travel_summary_agent = AssistantAgent(
-    "travel_summary_agent",
-    model_client=model_client,
-    description="A helpful assistant that can summarize the travel plan.",
-    system_message="You are a helpful assistant that can take in all of the suggestions and advice from the other agents and provide a detailed final travel plan. You must ensure that the final plan is integrated and complete. YOUR FINAL RESPONSE MUST BE THE COMPLETE PLAN. When the plan is complete and all perspectives are integrated, you can respond with TERMINATE.",
-)
+def build_agents(
+    model_client: ChatCompletionClient,
+    contexts: Optional[Mapping[str, ChatCompletionContext]] = None,
+) -> dict[str, AssistantAgent]:
+    """Creates the trip planning agents, by name. With a `ClientPool`, each
+    agent gets its own view of the pool.
 
-termination = TextMentionTermination("TERMINATE")
-group_chat = RoundRobinGroupChat(
-    [planner_agent, local_agent, language_agent, travel_summary_agent],
-    termination_condition=termination,
-)
+    Args:
+        model_client (ChatCompletionClient): The client the agents share.
+        contexts (Mapping[str, ChatCompletionContext], optional): Model
+            context per agent name; agents not in it keep the whole history.
+    """
+    contexts = contexts or {}
+    planner_agent = AssistantAgent(
+        "planner_agent",
+        model_client=agent_client(model_client, "planner_agent"),
+        model_context=contexts.get("planner_agent"),
+        description="A helpful assistant that can plan trips.",
+        system_message="You are a helpful assistant that can suggest a travel plan for a user based on their request.",
+    )
+
+    local_agent = AssistantAgent(
+        "local_agent",
+        model_client=agent_client(model_client, "local_agent"),
+        model_context=contexts.get("local_agent"),
+        description="A local assistant that can suggest local activities or places to visit.",
+        system_message="You are a helpful assistant that can suggest authentic and interesting local activities or places to visit for a user and can utilize any context information provided.",
+    )
+
+    language_agent = AssistantAgent(
+        "language_agent",
+        model_client=agent_client(model_client, "language_agent"),
+        model_context=contexts.get("language_agent"),
+        description="A helpful assistant that can provide language tips for a given destination.",
+        system_message="You are a helpful assistant that can review travel plans, providing feedback on important/critical tips about how best to address language or communication challenges for the given destination. If the plan already includes language tips, you can mention that the plan is satisfactory, with rationale.",
+    )
+
+    travel_summary_agent = AssistantAgent(
+        "travel_summary_agent",
+        model_client=agent_client(model_client, "travel_summary_agent"),
+        model_context=contexts.get("travel_summary_agent"),
+        description="A helpful assistant that can summarize the travel plan.",
+        system_message="You are a helpful assistant that can take in all of the suggestions and advice from the other agents and provide a detailed final travel plan. You must ensure that the final plan is integrated and complete. YOUR FINAL RESPONSE MUST BE THE COMPLETE PLAN. When the plan is complete and all perspectives are integrated, you can respond with TERMINATE.",
+    )
+    return {
+        agent.name: agent
+        for agent in (planner_agent, local_agent, language_agent, travel_summary_agent)
+    }
+
+
+def windowed_contexts(model_client: ChatCompletionClient) -> dict[str, WindowedContext]:
+    """What each agent needs to see: the planner revises its plan from the
+    feedback, so it keeps a summary of older turns; the local and language
+    agents review the latest plan only; the summary agent integrates recent
+    advice from everyone, within a budget."""
+    return {
+        "planner_agent": SummarizingContext(
+            agent_client(model_client, "planner_summary"), keep_last=4
+        ),
+        "local_agent": SourceFilteredContext(["user", "planner_agent"], keep_last=2),
+        "language_agent": SourceFilteredContext(["user", "planner_agent"], keep_last=2),
+        "travel_summary_agent": TokenBudgetContext(max_tokens=8000),
+    }
+
+
+def full_contexts(model_client: ChatCompletionClient) -> dict[str, WindowedContext]:
+    """Every agent sees the whole history, as by default."""
+    return {name: FullContext() for name in AGENT_NAMES}
+
+
+CONTEXTS = {"windowed": windowed_contexts, "full": full_contexts}
+
+
+def build_termination() -> ReportingTermination:
+    """TERMINATE, or the first limit reached when the planner keeps going."""
+    return cost_aware_termination(
+        "TERMINATE",
+        max_tokens=60000,
+        timeout_seconds=300,
+        max_messages=13,
+        converge_source="planner_agent",
+    )
+
+
+def build_round_robin(
+    agents: dict[str, AssistantAgent],
+    termination: Optional[TerminationCondition] = None,
+) -> RoundRobinGroupChat:
+    """Every agent speaks in turn: planner, local, language, summary."""
+    return RoundRobinGroupChat(
+        list(agents.values()),
+        termination_condition=termination or build_termination(),
+    )
+
+
+def build_graph_flow(
+    agents: dict[str, AssistantAgent],
+    termination: Optional[TerminationCondition] = None,
+) -> GraphFlow:
+    """The planner's draft fans out to the local and language agents, which
+    run concurrently; the summary agent waits for both. The flow ends after
+    the summary, or earlier when the termination condition fires."""
+    builder = DiGraphBuilder()
+    for agent in agents.values():
+        builder.add_node(agent)
+    planner = agents["planner_agent"]
+    summary = agents["travel_summary_agent"]
+    for reviewer in (agents["local_agent"], agents["language_agent"]):
+        builder.add_edge(planner, reviewer)
+        builder.add_edge(reviewer, summary)
+    return GraphFlow(
+        participants=builder.get_participants(),
+        graph=builder.build(),
+        termination_condition=termination or build_termination(),
+    )
+
+
+TEAMS = {"round_robin": build_round_robin, "graph": build_graph_flow}
+
+
+async def run_team(
+    team: Team,
+    task: str = TASK,
+    console: bool = True,
+    store: Optional[CheckpointStore] = None,
+    run_id: Optional[str] = None,
+) -> tuple[TaskResult, float]:
+    """Runs the team on a task. With a checkpoint store, the team's state is
+    saved after every message, and a run ID that has a checkpoint resumes
+    that run instead.
+
+    Returns:
+        tuple[TaskResult, float]: The result and the wall-clock seconds.
+    """
+    started = time.perf_counter()
+    if store is not None:
+        stream = checkpointed_stream(team, task, store, run_id)
+    else:
+        stream = team.run_stream(task=task)
+    if console:
+        result = await Console(stream)
+    else:
+        async for result in stream:
+            pass
+    return result, time.perf_counter() - started
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Plan a trip with a team of agents.")
+    parser.add_argument(
+        "--mode",
+        choices=[*TEAMS, "compare"],
+        default="graph",
+        help="Team layout; compare runs both and reports their wall-clock time",
+    )
+    parser.add_argument("--task", default=TASK)
+    parser.add_argument(
+        "--context",
+        choices=CONTEXTS,
+        default="windowed",
+        help="What each agent sends to the model: its own window, or everything",
+    )
+    parser.add_argument(
+        "--checkpoints",
+        default="checkpoints.db",
+        help="SQLite file the run is checkpointed to after every message",
+    )
+    parser.add_argument(
+        "--resume", metavar="RUN_ID", help="Continue an interrupted run"
+    )
+    fixture = parser.add_mutually_exclusive_group()
+    fixture.add_argument(
+        "--record", metavar="FIXTURE", help="Record the model calls to FIXTURE"
+    )
+    fixture.add_argument(
+        "--replay",
+        metavar="FIXTURE",
+        help="Answer from the calls recorded in FIXTURE instead of the API",
+    )
+    args = parser.parse_args()
+
+    if args.replay:
+        # Offline, so without the pool's rate limits.
+        model_client = RecordReplayClient(args.replay)
+    else:
+        client = AnthropicChatCompletionClient(
+            model="claude-3-7-sonnet-20250219",
+            api_key=os.getenv("ANTHROPIC_API_KEY"),
+            max_retries=0,
+        )
+        if args.record:
+            client = RecordReplayClient(args.record, client, mode="record")
+        model_client = ClientPool(
+            client,
+            max_concurrency=4,
+            requests_per_minute=50,
+            tokens_per_minute=40000,
+        )
+    store = CheckpointStore(args.checkpoints)
+    run_id = args.resume or uuid.uuid4().hex[:12]
+    print(f"Run {run_id}; continue it with --resume {run_id} if interrupted.")
+    modes = list(TEAMS) if args.mode == "compare" else [args.mode]
+    timings = {}
+    for mode in modes:
+        # Fresh agents per mode, so no run sees another's history.
+        termination = build_termination()
+        contexts = CONTEXTS[args.context](model_client)
+        team = TEAMS[mode](build_agents(model_client, contexts), termination)
+        _, timings[mode] = await run_team(
+            team, args.task, store=store, run_id=f"{run_id}-{mode}"
+        )
+        print(termination.report())
+        print(context_report(contexts))
+    for mode, seconds in timings.items():
+        print(f"{mode}: {seconds:.1f}s")
+    if isinstance(model_client, ClientPool):
+        print(model_client.report())
+    store.close()
+    await model_client.close()
 
-asyncio.run(Console(group_chat.run_stream(task="Plan a 3 day trip to Nepal.")))
 
-# asyncio.run(model_client.close())
+if __name__ == "__main__":
+    asyncio.run(main())
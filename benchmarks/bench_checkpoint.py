@@ -0,0 +1,189 @@
+"""Checkpoint size and overhead, and model calls saved by resuming a crashed run.
+
+Runs `autogen/trip_planning` (round-robin and graph) against a fake model
+client that answers with a fixed number of words per agent; the summary agent
+says TERMINATE in round `--rounds`. Every agent keeps its whole history, the
+worst case for checkpoint size.
+
+First, each team runs to the end with and without `checkpointed_stream`, and
+the benchmark reports the wall-clock overhead of checkpointing, the time per
+save, and the size of the last checkpoint as plain JSON, as zlib-compressed
+JSON and as stored (shared strings, then zlib). Then the client fails on
+model call `--crash-at` (by default halfway through); the run is resumed
+from its checkpoint with a working client, and the benchmark reports the
+calls the resumed run made against those of an uninterrupted run and of
+starting over.
+
+Usage (from the repo root):
+    python benchmarks/bench_checkpoint.py --rounds 4 --crash-at 9
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import statistics
+import sys
+import tempfile
+import zlib
+from pathlib import Path
+
+sys.path.insert(
+    0, str(Path(__file__).resolve().parents[1] / "autogen" / "trip_planning")
+)
+
+from autogen_agentchat.conditions import MaxMessageTermination, TextMentionTermination
+from autogen_core.models import (
+    AssistantMessage,
+    CreateResult,
+    RequestUsage,
+    SystemMessage,
+)
+from autogen_ext.models.replay import ReplayChatCompletionClient
+from main import TASK, TEAMS, build_agents, run_team
+from team_utils import CheckpointStore, pack
+
+LENGTHS = {
+    "suggest a travel plan": ("planner", 450),
+    "local activities": ("local", 250),
+    "language or communication": ("language", 200),
+    "final travel plan": ("summary", 600),
+}
+
+
+class ProviderDown(Exception):
+    pass
+
+
+class FakeClient(ReplayChatCompletionClient):
+    """Answers with a fixed number of words per agent; fails on call
+    `crash_at` if given."""
+
+    def __init__(self, rounds: int, latency: float, crash_at: int | None = None):
+        super().__init__([])
+        self.rounds = rounds
+        self.latency = latency
+        self.crash_at = crash_at
+        self.calls = 0
+
+    async def create(self, messages, **kwargs) -> CreateResult:
+        self.calls += 1
+        if self.calls == self.crash_at:
+            raise ProviderDown(f"failed on call {self.calls}")
+        await asyncio.sleep(self.latency)
+        system = next((m.content for m in messages if isinstance(m, SystemMessage)), "")
+        name, words = next(v for marker, v in LENGTHS.items() if marker in system)
+        content = " ".join(f"{name}{len(messages)}w{i}" for i in range(words))
+        own = sum(isinstance(m, AssistantMessage) for m in messages)
+        if name == "summary" and own + 1 >= self.rounds:
+            content += " TERMINATE"
+        return CreateResult(
+            finish_reason="stop",
+            content=content,
+            usage=RequestUsage(prompt_tokens=0, completion_tokens=0),
+            cached=False,
+        )
+
+
+def build(mode: str, client):
+    termination = TextMentionTermination("TERMINATE") | MaxMessageTermination(200)
+    return TEAMS[mode](build_agents(client), termination)
+
+
+async def overhead(mode: str, args, store: CheckpointStore) -> dict:
+    plain, checkpointed = [], []
+    for n in range(args.runs):
+        client = FakeClient(args.rounds, args.model_latency_ms / 1000)
+        _, seconds = await run_team(build(mode, client), TASK, console=False)
+        plain.append(seconds)
+        client = FakeClient(args.rounds, args.model_latency_ms / 1000)
+        result, seconds = await run_team(
+            build(mode, client), TASK, False, store, f"{mode}-{n}"
+        )
+        checkpointed.append(seconds)
+    state = (await store.load(f"{mode}-0")).state
+    text = json.dumps(state).encode()
+    return {
+        "messages": len(result.messages),
+        "plain": statistics.median(plain),
+        "checkpointed": statistics.median(checkpointed),
+        "json": len(text),
+        "zlib": len(zlib.compress(text, 6)),
+        "stored": len(pack(state)),
+    }
+
+
+async def crash_and_resume(mode: str, args, store: CheckpointStore) -> dict:
+    latency = args.model_latency_ms / 1000
+    uninterrupted = FakeClient(args.rounds, latency)
+    expected, _ = await run_team(build(mode, uninterrupted), TASK, console=False)
+
+    run_id = f"{mode}-crash"
+    crash_at = args.crash_at or uninterrupted.calls // 2 + 1
+    crashing = FakeClient(args.rounds, latency, crash_at=crash_at)
+    # The runtime logs the crash from every agent.
+    logging.getLogger("autogen_core").setLevel(logging.CRITICAL)
+    try:
+        await run_team(build(mode, crashing), TASK, False, store, run_id)
+    except RuntimeError:
+        # Teams re-raise an agent's error as a RuntimeError.
+        pass
+    finally:
+        logging.getLogger("autogen_core").setLevel(logging.NOTSET)
+    turns = (await store.load(run_id)).turns
+    resumed = FakeClient(args.rounds, latency)
+    result, _ = await run_team(build(mode, resumed), TASK, False, store, run_id)
+    return {
+        "uninterrupted": uninterrupted.calls,
+        "crashed": crashing.calls - 1,
+        "checkpointed turns": turns,
+        "resumed": resumed.calls,
+        "same": len(result.messages) == len(expected.messages)
+        and result.stop_reason == expected.stop_reason,
+    }
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rounds", type=int, default=4)
+    parser.add_argument("--crash-at", type=int, default=None)
+    parser.add_argument("--model-latency-ms", type=float, default=20)
+    parser.add_argument("--runs", type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        store = CheckpointStore(str(Path(tmp) / "checkpoints.db"))
+        print(
+            f"{'team':12} {'msgs':>4} {'plain':>7} {'ckpt':>7} {'overhead':>8}"
+            f" {'per save':>8} {'json':>8} {'zlib':>7} {'stored':>7}"
+        )
+        for mode in TEAMS:
+            store.stats = {"saves": 0, "stored_bytes": 0, "seconds": 0.0}
+            r = await overhead(mode, args, store)
+            per_save = store.stats["seconds"] / store.stats["saves"]
+            print(
+                f"{mode:12} {r['messages']:>4} {r['plain']:>6.3f}s"
+                f" {r['checkpointed']:>6.3f}s"
+                f" {r['checkpointed'] / r['plain'] - 1:>8.1%}"
+                f" {per_save * 1000:>6.2f}ms {r['json']:>8} {r['zlib']:>7}"
+                f" {r['stored']:>7}"
+            )
+        print()
+        print(
+            f"{'team':12} {'full run':>8} {'before crash':>12} {'checkpointed':>12}"
+            f" {'resumed':>7} {'start over':>10} {'saved':>5}  result"
+        )
+        for mode in TEAMS:
+            r = await crash_and_resume(mode, args, store)
+            start_over = r["crashed"] + r["uninterrupted"]
+            total = r["crashed"] + r["resumed"]
+            print(
+                f"{mode:12} {r['uninterrupted']:>8} {r['crashed']:>12}"
+                f" {r['checkpointed turns']:>12} {r['resumed']:>7} {start_over:>10}"
+                f" {start_over - total:>5}  {'same' if r['same'] else 'differs'}"
+            )
+        store.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,155 @@
+"""Shared model client under provider limits: raw vs. `ClientPool`.
+
+Many agents (as in several trip planning teams at once) send requests through
+one client to a fake provider that enforces its own limits: more than
+`--provider-concurrency` requests in flight are rejected with 529
+(overloaded), and requests beyond `--provider-rpm` with 429 and a retry-after
+header. Compares the bare client, a pool that only retries, and a pool whose
+concurrency and rate limits match the provider's. Reports completed and
+failed requests, the rejections the provider sent, wall-clock time and
+request latency, then the pool's per-agent metrics.
+
+Usage (from the repo root):
+    python benchmarks/bench_client_pool.py --agents 8 --requests 25
+"""
+
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "autogen"))
+
+from autogen_core.models import CreateResult, RequestUsage, UserMessage
+from autogen_ext.models.replay import ReplayChatCompletionClient
+from team_utils import ClientPool, TokenBucket, agent_client
+
+
+class ProviderError(Exception):
+    def __init__(self, status_code: int, retry_after: float | None = None):
+        super().__init__(f"provider returned {status_code}")
+        self.status_code = status_code
+        headers = {"retry-after": f"{retry_after:.3f}"} if retry_after else {}
+        self.response = SimpleNamespace(status_code=status_code, headers=headers)
+
+
+class FakeProvider(ReplayChatCompletionClient):
+    """Answers after `latency` seconds unless its own limits are exceeded."""
+
+    def __init__(self, latency: float, concurrency: int, rpm: float):
+        super().__init__([])
+        self.latency = latency
+        self.concurrency = concurrency
+        # Only a second's worth of burst, as providers enforce short windows.
+        self.bucket = TokenBucket.per_minute(rpm, burst_seconds=1)
+        self.in_flight = 0
+        self.rejected = {429: 0, 529: 0}
+
+    async def create(self, messages, **kwargs) -> CreateResult:
+        if self.in_flight >= self.concurrency:
+            self.rejected[529] += 1
+            raise ProviderError(529)
+        self.bucket._refill()
+        if self.bucket._level < 1:
+            self.rejected[429] += 1
+            raise ProviderError(429, (1 - self.bucket._level) / self.bucket.rate)
+        self.bucket._level -= 1
+        self.in_flight += 1
+        try:
+            await asyncio.sleep(self.latency)
+        finally:
+            self.in_flight -= 1
+        return CreateResult(
+            finish_reason="stop",
+            content="ok",
+            usage=RequestUsage(prompt_tokens=200, completion_tokens=50),
+            cached=False,
+        )
+
+
+async def run(client, args) -> dict:
+    latencies: list[float] = []
+    failed = 0
+
+    async def agent(name: str) -> None:
+        nonlocal failed
+        view = agent_client(client, name)
+        for n in range(args.requests):
+            started = time.perf_counter()
+            try:
+                await view.create([UserMessage(content=f"request {n}", source=name)])
+                latencies.append(time.perf_counter() - started)
+            except ProviderError:
+                failed += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(agent(f"agent_{i}") for i in range(args.agents)))
+    return {
+        "completed": len(latencies),
+        "failed": failed,
+        "seconds": time.perf_counter() - started,
+        "p50": statistics.median(latencies) if latencies else 0,
+        "p95": statistics.quantiles(latencies, n=20)[18] if len(latencies) > 1 else 0,
+    }
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--agents", type=int, default=8)
+    parser.add_argument("--requests", type=int, default=25)
+    parser.add_argument("--model-latency-ms", type=float, default=200)
+    parser.add_argument("--provider-concurrency", type=int, default=6)
+    parser.add_argument("--provider-rpm", type=float, default=1200)
+    args = parser.parse_args()
+
+    def provider() -> FakeProvider:
+        return FakeProvider(
+            args.model_latency_ms / 1000, args.provider_concurrency, args.provider_rpm
+        )
+
+    setups = {
+        "raw client": lambda p: p,
+        "pool, retries": lambda p: ClientPool(
+            p, max_concurrency=64, base_delay=0.1, max_delay=2.0, max_retries=8
+        ),
+        "pool, limits": lambda p: ClientPool(
+            p,
+            max_concurrency=args.provider_concurrency,
+            requests_per_minute=args.provider_rpm,
+            burst_seconds=1,
+            base_delay=0.1,
+            max_delay=2.0,
+            max_retries=8,
+        ),
+    }
+    total = args.agents * args.requests
+    print(
+        f"{total} requests from {args.agents} agents; provider allows"
+        f" {args.provider_concurrency} in flight, {args.provider_rpm:g}/min,"
+        f" {args.model_latency_ms:g} ms each"
+    )
+    print(
+        f"{'client':14} {'done':>5} {'failed':>6} {'429s':>5} {'529s':>5}"
+        f" {'wall':>7} {'p50':>7} {'p95':>7}"
+    )
+    pool = None
+    for label, wrap in setups.items():
+        fake = provider()
+        client = wrap(fake)
+        result = await run(client, args)
+        print(
+            f"{label:14} {result['completed']:>5} {result['failed']:>6}"
+            f" {fake.rejected[429]:>5} {fake.rejected[529]:>5}"
+            f" {result['seconds']:>6.2f}s {result['p50']:>6.2f}s {result['p95']:>6.2f}s"
+        )
+        if isinstance(client, ClientPool):
+            pool = client
+    print()
+    print(pool.report())
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,98 @@
+"""Load test of the customer service server with a local fake model.
+
+Starts `CustomerServiceServer` in-process on a free port, backed by the
+scripted `FakeModel`, and runs many simulated customers against it over TCP.
+Each customer holds one conversation of a few turns (an FAQ question, a seat
+change and a follow-up question). Reports conversations per second and the
+per-message latency percentiles.
+
+Usage (from the repo root):
+    python benchmarks/bench_customer_service_server.py --conversations 200 --concurrency 50
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "openai"))
+
+from agents import set_tracing_disabled
+from customer_service_server import CustomerServiceServer
+from fake_model import FakeModel
+
+SCRIPT = [
+    "How many bags can I bring?",
+    "I want to change my seat",
+    "My confirmation is AB12CD and I want seat 12C",
+    "Is there wifi on the plane?",
+]
+
+
+async def customer(port: int, latencies: list[float]) -> None:
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    conversation_id = None
+    try:
+        for message in SCRIPT:
+            request = {"conversation_id": conversation_id, "message": message}
+            started = time.perf_counter()
+            writer.write(json.dumps(request).encode() + b"\n")
+            await writer.drain()
+            response = json.loads(await reader.readline())
+            latencies.append(time.perf_counter() - started)
+            if "error" in response:
+                raise RuntimeError(response["error"])
+            conversation_id = response["conversation_id"]
+    finally:
+        writer.close()
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--conversations", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--model-latency-ms", type=float, default=50)
+    args = parser.parse_args()
+    set_tracing_disabled(True)
+    logging.getLogger("openai.agents").setLevel(logging.ERROR)
+
+    model = FakeModel(latency=args.model_latency_ms / 1000)
+    service = CustomerServiceServer(model=model)
+    server = await service.start("127.0.0.1", 0)
+    port = server.sockets[0].getsockname()[1]
+
+    latencies: list[float] = []
+    semaphore = asyncio.Semaphore(args.concurrency)
+
+    async def limited() -> None:
+        async with semaphore:
+            await customer(port, latencies)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(limited() for _ in range(args.conversations)))
+    elapsed = time.perf_counter() - started
+    await service.stop(server)
+
+    percentiles = statistics.quantiles(latencies, n=100)
+    print(
+        f"{args.conversations} conversations x {len(SCRIPT)} messages,"
+        f" concurrency {args.concurrency}, model latency {args.model_latency_ms:g} ms"
+    )
+    print(f"conversations/sec  {args.conversations / elapsed:8.1f}")
+    print(f"messages/sec       {len(latencies) / elapsed:8.1f}")
+    print(f"model calls        {model.calls:8d}")
+    for label, value in (
+        ("p50", statistics.median(latencies)),
+        ("p90", percentiles[89]),
+        ("p99", percentiles[98]),
+    ):
+        print(f"latency {label}        {value * 1000:8.1f} ms")
+    print(f"server stats       {service.stats}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
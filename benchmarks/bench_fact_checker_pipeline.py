@@ -0,0 +1,153 @@
+"""End-to-end latency of the sequential vs. parallel llm_fact_checker pipelines.
+
+Both pipelines run against a local fake model whose latency grows with the
+number of tokens it writes, which is what makes the single critic call slow on
+long answers. Each fixture item lists its claims and their expected verdicts;
+the fake model plays critic, claim extractor, verifier and reviser from that.
+
+Usage (from the repo root):
+    python benchmarks/bench_fact_checker_pipeline.py --ms-per-token 2 --concurrency 4
+"""
+
+import argparse
+import asyncio
+import json
+import re
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "google_adk"))
+
+from adk_common.fake_llm import FakeLlm
+from google.adk.agents import SequentialAgent
+from google.adk.models import LlmRequest
+from google.adk.runners import InMemoryRunner
+from google.genai import types
+from llm_fact_checker.agent import build_parallel_auditor
+from llm_fact_checker.sub_agents.critic import critic_agent
+from llm_fact_checker.sub_agents.reviser import reviser_agent
+
+FIXTURES = Path(__file__).parent / "fixtures" / "fact_checker_qa.jsonl"
+JUSTIFICATION = (
+    "Based on my knowledge and the consulted sources, which were cross-checked"
+    " against each other for consistency, this assessment holds."
+)
+
+VERDICTS: dict[str, str] = {}
+
+
+def _request_text(llm_request: LlmRequest) -> str:
+    texts = [str(llm_request.config.system_instruction or "")]
+    for content in llm_request.contents:
+        texts.extend(part.text or "" for part in content.parts or [])
+    return "\n".join(texts)
+
+
+def _finding(number: int, claim: str) -> str:
+    return (
+        f"  * Claim {number}: {claim}\n"
+        f"      * Verdict: {VERDICTS.get(claim, 'Unsupported')}\n"
+        f"      * Justification: {JUSTIFICATION}"
+    )
+
+
+def respond(llm_request: LlmRequest) -> str:
+    """Plays whichever pipeline role the request's instruction asks for."""
+    text = _request_text(llm_request)
+    answer = text.rsplit("Answer:", 1)[-1].strip().split("\n")[0]
+    claims = re.split(r"(?<=\.)\s+", answer)
+    if "extract claims from" in text:
+        return json.dumps([{"claim": c, "answer_part": c} for c in claims])
+    if "# Claims to verify" in text:
+        batch = re.findall(r"Claim (\d+): (.+)", text.split("# Claims to verify")[1])
+        return "\n".join(_finding(int(n), claim) for n, claim in batch)
+    if "professional editor" in text:
+        return answer + "\n---END-OF-EDIT---"
+    # The single critic verifies every claim in one long generation.
+    reasoning = "\n\n".join(
+        f"Verifying claim {i}: {c} {JUSTIFICATION}"
+        for i, c in enumerate(claims, start=1)
+    )
+    findings = "\n".join(_finding(i, c) for i, c in enumerate(claims, start=1))
+    verdicts = {
+        "claims": [
+            {
+                "claim": c,
+                "verdict": VERDICTS.get(c, "Unsupported"),
+                "justification": JUSTIFICATION,
+                "references": [],
+            }
+            for c in claims
+        ],
+        "overall_verdict": "Inaccurate",
+    }
+    return (
+        f"{reasoning}\n\n{findings}\n  * Overall verdict: Inaccurate\n\n"
+        f"```json\n{json.dumps(verdicts)}\n```"
+    )
+
+
+async def audit(agent, item: dict) -> float:
+    runner = InMemoryRunner(agent=agent, app_name="bench")
+    session = await runner.session_service.create_session(app_name="bench", user_id="u")
+    answer = " ".join(claim["text"] for claim in item["claims"])
+    message = types.Content(
+        role="user",
+        parts=[types.Part(text=f"Question: {item['question']}\nAnswer: {answer}")],
+    )
+    started = time.perf_counter()
+    async for _ in runner.run_async(
+        user_id="u", session_id=session.id, new_message=message
+    ):
+        pass
+    return time.perf_counter() - started
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--ms-per-token", type=float, default=2.0)
+    parser.add_argument("--call-latency-ms", type=float, default=300)
+    parser.add_argument("--concurrency", type=int, default=4)
+    args = parser.parse_args()
+
+    model = FakeLlm(
+        responder=respond,
+        latency=args.call_latency_ms / 1000,
+        seconds_per_output_token=args.ms_per_token / 1000,
+    )
+    items = [json.loads(line) for line in FIXTURES.read_text().splitlines() if line]
+    for item in items:
+        VERDICTS.update({claim["text"]: claim["verdict"] for claim in item["claims"]})
+
+    sequential = SequentialAgent(
+        name="llm_auditor",
+        sub_agents=[
+            critic_agent.clone({"model": model, "tools": []}),
+            reviser_agent.clone({"model": model}),
+        ],
+    )
+    parallel = build_parallel_auditor(model, max_concurrency=args.concurrency, tools=[])
+
+    print(f"{'item':8} {'claims':>6} {'sequential':>11} {'parallel':>9} {'speedup':>8}")
+    totals = {"sequential": [], "parallel": []}
+    for item in items:
+        seq = await audit(sequential, item)
+        par = await audit(parallel, item)
+        totals["sequential"].append(seq)
+        totals["parallel"].append(par)
+        print(
+            f"{item['id']:8} {len(item['claims']):>6} {seq:>10.2f}s {par:>8.2f}s"
+            f" {seq / par:>7.2f}x"
+        )
+    seq_mean = statistics.mean(totals["sequential"])
+    par_mean = statistics.mean(totals["parallel"])
+    print(
+        f"{'mean':8} {'':>6} {seq_mean:>10.2f}s {par_mean:>8.2f}s"
+        f" {seq_mean / par_mean:>7.2f}x"
+    )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,116 @@
+"""FAQ lookup latency of the BM25 index at 10k and 100k entries.
+
+Synthetic FAQ entries are drawn from a Zipf-distributed vocabulary and mixed
+with the real airline FAQ. For each size the script reports the cold index
+build, the warm start from the pickled index, lookup latency percentiles and
+top-1 accuracy for queries made of words from one entry's question, next to a
+linear scan that checks every entry for each query.
+
+Usage (from the repo root):
+    python benchmarks/bench_faq_lookup.py --sizes 10000 100000 --queries 1000
+"""
+
+import argparse
+import itertools
+import json
+import random
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "openai"))
+
+from faq_engine import DATA_PATH, FaqIndex, tokenize
+
+VOCABULARY_SIZE = 20000
+
+
+def make_dataset(path: Path, size: int, rng: random.Random) -> list[dict]:
+    words = [f"w{n}" for n in range(VOCABULARY_SIZE)]
+    cum_weights = list(
+        itertools.accumulate(1 / (rank + 1) for rank in range(VOCABULARY_SIZE))
+    )
+    items = [json.loads(line) for line in DATA_PATH.read_text().splitlines() if line]
+    while len(items) < size:
+        question = rng.choices(words, cum_weights=cum_weights, k=rng.randint(6, 12))
+        answer = rng.choices(words, cum_weights=cum_weights, k=rng.randint(20, 40))
+        items.append({"question": " ".join(question), "answer": " ".join(answer)})
+    with path.open("w") as f:
+        for item in items:
+            f.write(json.dumps(item) + "\n")
+    return items
+
+
+def make_queries(items: list[dict], count: int, rng: random.Random) -> list:
+    queries = []
+    for doc_id in rng.sample(range(len(items)), count):
+        words = items[doc_id]["question"].split()
+        queries.append((doc_id, " ".join(rng.sample(words, max(3, len(words) // 2)))))
+    return queries
+
+
+def linear_scan(entries: list[set], query: str) -> int:
+    terms = set(tokenize(query))
+    return max(range(len(entries)), key=lambda i: len(terms & entries[i]))
+
+
+def timed(func, queries) -> tuple[list[float], int]:
+    latencies, correct = [], 0
+    for doc_id, query in queries:
+        started = time.perf_counter()
+        best = func(query)
+        latencies.append((time.perf_counter() - started) * 1000)
+        correct += best == doc_id
+    return latencies, correct
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10000, 100000])
+    parser.add_argument("--queries", type=int, default=1000)
+    parser.add_argument("--scan-queries", type=int, default=50)
+    args = parser.parse_args()
+    rng = random.Random(0)
+
+    print(
+        f"{'entries':>8} {'build':>8} {'load':>8} {'p50':>8} {'p99':>8}"
+        f" {'top1':>6} {'scan p50':>9}"
+    )
+    for size in args.sizes:
+        with tempfile.TemporaryDirectory() as tmp:
+            data_path = Path(tmp) / "faq.jsonl"
+            items = make_dataset(data_path, size, rng)
+            started = time.perf_counter()
+            FaqIndex.load_or_build(data_path)
+            build = time.perf_counter() - started
+            started = time.perf_counter()
+            index = FaqIndex.load_or_build(data_path)
+            load = time.perf_counter() - started
+
+            entry_ids = {id(entry): n for n, entry in enumerate(index.entries)}
+
+            def lookup(query: str) -> int:
+                hits = index.search(query, k=3)
+                return entry_ids[id(hits[0].entry)] if hits else -1
+
+            latencies, correct = timed(lookup, make_queries(items, args.queries, rng))
+
+            entries = [
+                set(tokenize(f"{item['question']} {item['answer']}")) for item in items
+            ]
+            scan, _ = timed(
+                lambda query: linear_scan(entries, query),
+                make_queries(items, args.scan_queries, rng),
+            )
+        print(
+            f"{size:>8} {build:>7.2f}s {load:>7.2f}s"
+            f" {statistics.median(latencies):>6.3f}ms"
+            f" {statistics.quantiles(latencies, n=100)[98]:>6.3f}ms"
+            f" {correct / len(latencies):>6.1%} {statistics.median(scan):>7.2f}ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""Model calls and latency saved by routing obvious requests past triage.
+
+Each labelled message in `fixtures/intent_messages.jsonl` opens a fresh
+customer service conversation, once starting at the triage agent as before
+and once starting wherever the local `IntentRouter` sends it. Both runs use
+the scripted `FakeModel` with a fixed per-call latency. Reports routing
+accuracy (a misroute is a message routed to the wrong agent; falling back to
+triage is never wrong), the share of messages that skipped triage, model calls
+per message and the mean end-to-end latency per message.
+
+Usage (from the repo root):
+    python benchmarks/bench_intent_router.py --model-latency-ms 300
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "openai"))
+
+from agents import RunConfig, Runner, set_tracing_disabled
+from customer_service import (
+    AirlineAgentContext,
+    intent_router,
+    pre_route,
+    triage_agent,
+)
+from fake_model import FakeModel
+from intent_router import NO_ROUTE
+
+FIXTURE = Path(__file__).parent / "fixtures" / "intent_messages.jsonl"
+
+
+async def run_messages(messages: list[dict], model: FakeModel, routed: bool) -> list:
+    run_config = RunConfig(model=model)
+    latencies = []
+    for item in messages:
+        context = AirlineAgentContext()
+        started = time.perf_counter()
+        agent = triage_agent
+        if routed:
+            agent = await pre_route(agent, item["text"], context)
+        await Runner.run(
+            agent,
+            [{"role": "user", "content": item["text"]}],
+            context=context,
+            run_config=run_config,
+        )
+        latencies.append(time.perf_counter() - started)
+    return latencies
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--model-latency-ms", type=float, default=300)
+    args = parser.parse_args()
+    set_tracing_disabled(True)
+    logging.getLogger("openai.agents").setLevel(logging.ERROR)
+
+    with open(FIXTURE, encoding="utf-8") as f:
+        messages = [json.loads(line) for line in f if line.strip()]
+
+    correct = misrouted = 0
+    classify_us = []
+    for item in messages:
+        route = intent_router.classify(item["text"])
+        classify_us.append(route.seconds * 1e6)
+        if (route.intent or NO_ROUTE) == item["intent"]:
+            correct += 1
+        elif route.intent is not None:
+            misrouted += 1
+    report = intent_router.report()
+
+    latency = args.model_latency_ms / 1000
+    results = {}
+    for label, routed in (("triage", False), ("pre-routed", True)):
+        model = FakeModel(latency=latency)
+        latencies = await run_messages(messages, model, routed)
+        results[label] = (model.calls, statistics.mean(latencies))
+
+    print(
+        f"{len(messages)} messages, model latency {args.model_latency_ms:g} ms,"
+        f" classify {statistics.median(classify_us):.0f} us (p50)"
+    )
+    print(f"routing accuracy   {correct / len(messages):8.1%}")
+    print(f"misrouted          {misrouted:8d}")
+    print(f"fast path          {report['fast_path_rate']:8.1%}  {report['by_intent']}")
+    print(f"{'path':12} {'model calls':>12} {'calls/msg':>10} {'mean latency':>13}")
+    for label, (calls, mean) in results.items():
+        print(
+            f"{label:12} {calls:>12} {calls / len(messages):>10.2f}"
+            f" {mean * 1000:>10.0f} ms"
+        )
+    (base_calls, base_mean), (calls, mean) = results["triage"], results["pre-routed"]
+    print(
+        f"saved              {base_calls - calls} calls"
+        f" ({1 - calls / base_calls:.1%}), {(base_mean - mean) * 1000:.0f} ms/message"
+    )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
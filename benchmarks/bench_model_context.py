@@ -0,0 +1,111 @@
+"""Prompt tokens of the trip planning team: whole history vs. per-agent windows.
+
+Runs `autogen/trip_planning` as a round-robin team for 1, 2 and 4 rounds
+(every agent speaks once per round) with each agent sending its whole
+history (`--context full`) and with the per-agent contexts of
+`windowed_contexts()`: the planner summarizes older turns, the local and
+language agents see only the task and the planner's latest plan, and the
+summary agent keeps a token budget. A fake model client answers with fixed
+lengths per agent and reports prompt tokens as characters / 4 of what it was
+sent, system message included. Reports prompt tokens per agent, the tokens
+the planner's summaries cost, and the total saved.
+
+Usage (from the repo root):
+    python benchmarks/bench_model_context.py --rounds 1 2 4 --details
+"""
+
+import argparse
+import asyncio
+import sys
+from pathlib import Path
+
+sys.path.insert(
+    0, str(Path(__file__).resolve().parents[1] / "autogen" / "trip_planning")
+)
+
+from autogen_agentchat.conditions import MaxMessageTermination
+from autogen_core.models import CreateResult, RequestUsage, SystemMessage
+from autogen_ext.models.replay import ReplayChatCompletionClient
+from main import AGENT_NAMES, CONTEXTS, TASK, build_agents, build_round_robin
+from team_utils import ClientPool, context_report
+
+# Answer length in words, per agent, recognized by its system message.
+LENGTHS = {
+    "suggest a travel plan": ("planner_agent", 450),
+    "local activities": ("local_agent", 250),
+    "language or communication": ("language_agent", 200),
+    "final travel plan": ("travel_summary_agent", 600),
+    "Summarize the conversation": ("summary", 150),
+}
+
+
+class FakeClient(ReplayChatCompletionClient):
+    """Answers with a fixed number of words per agent, instantly."""
+
+    def __init__(self):
+        super().__init__([])
+        self.calls = 0
+
+    async def create(self, messages, **kwargs) -> CreateResult:
+        self.calls += 1
+        system = next((m.content for m in messages if isinstance(m, SystemMessage)), "")
+        name, words = next(
+            (value for marker, value in LENGTHS.items() if marker in system),
+            ("agent", 100),
+        )
+        content = " ".join(f"{name}{self.calls}w{i}" for i in range(words))
+        return CreateResult(
+            finish_reason="stop",
+            content=content,
+            usage=RequestUsage(
+                prompt_tokens=sum(len(str(m.content)) for m in messages) // 4,
+                completion_tokens=len(content) // 4,
+            ),
+            cached=False,
+        )
+
+
+async def run(policy: str, rounds: int):
+    pool = ClientPool(FakeClient(), max_concurrency=64)
+    contexts = CONTEXTS[policy](pool)
+    team = build_round_robin(
+        build_agents(pool, contexts),
+        MaxMessageTermination(1 + rounds * len(AGENT_NAMES)),
+    )
+    await team.run(task=TASK)
+    return pool.metrics, contexts
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rounds", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument(
+        "--details", action="store_true", help="Print the per-turn context report"
+    )
+    args = parser.parse_args()
+
+    agents = " ".join(f"{name.split('_')[0]:>9}" for name in AGENT_NAMES)
+    print(f"{'rounds':>6} {'context':9} {agents} {'summaries':>9} {'total':>8} saved")
+    for rounds in args.rounds:
+        totals = {}
+        for policy in ("full", "windowed"):
+            metrics, contexts = await run(policy, rounds)
+            prompts = [metrics[name].prompt_tokens for name in AGENT_NAMES]
+            summaries = sum(
+                m.prompt_tokens + m.completion_tokens
+                for name, m in metrics.items()
+                if name not in AGENT_NAMES
+            )
+            totals[policy] = sum(prompts) + summaries
+            saved = 1 - totals[policy] / totals["full"]
+            print(
+                f"{rounds:>6} {policy:9} "
+                + " ".join(f"{tokens:>9}" for tokens in prompts)
+                + f" {summaries:>9} {totals[policy]:>8} {saved:>5.0%}"
+            )
+            if args.details and policy == "windowed":
+                print(context_report(contexts))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,94 @@
+"""Wall time per turn when a model issues several function calls at once.
+
+A local fake model emits N calls of a blocking tool in a single turn and then
+answers. Each turn is timed with the tools as plain sync functions (run on the
+loop, one after another), through `concurrent_tools`, and through
+`concurrent_tools(..., sequential=True)`.
+
+Usage (from the repo root):
+    python benchmarks/bench_parallel_tool_calls.py --calls 1 2 4 8 --latency-ms 10 50
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "google_adk"))
+
+from adk_common import ToolExecutor
+from adk_common.fake_llm import FakeLlm, call_tools_then_reply
+from adk_common.parallel_tools import concurrent_tools
+from google.adk.agents import Agent
+from google.adk.runners import InMemoryRunner
+from google.genai import types
+
+TOOL_SECONDS = 0.05
+
+
+def lookup(key: str) -> dict:
+    """Looks up a key in a slow backing service."""
+    time.sleep(TOOL_SECONDS)
+    return {"status": "success", "report": f"value for {key}"}
+
+
+async def time_turns(tools: list, calls: int, turns: int) -> float:
+    agent = Agent(
+        name="bench_agent",
+        model=FakeLlm(
+            responder=call_tools_then_reply(
+                [("lookup", {"key": f"k{i}"}) for i in range(calls)], "done"
+            )
+        ),
+        instruction="Benchmark agent.",
+        tools=tools,
+    )
+    runner = InMemoryRunner(agent=agent, app_name="bench")
+    session = await runner.session_service.create_session(app_name="bench", user_id="u")
+    message = types.Content(role="user", parts=[types.Part(text="go")])
+
+    async def turn() -> None:
+        async for _ in runner.run_async(
+            user_id="u", session_id=session.id, new_message=message
+        ):
+            pass
+
+    await turn()  # Warm-up: builds tool declarations and starts pool threads.
+    started = time.perf_counter()
+    for _ in range(turns):
+        await turn()
+    return (time.perf_counter() - started) / turns * 1000
+
+
+def main() -> None:
+    global TOOL_SECONDS
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--calls", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--latency-ms", type=float, nargs="+", default=[10, 50])
+    parser.add_argument("--turns", type=int, default=5)
+    args = parser.parse_args()
+
+    executor = ToolExecutor(max_threads=max(args.calls))
+    modes = {
+        "inline": [lookup],
+        "concurrent": concurrent_tools(lookup, executor=executor),
+        "sequential": concurrent_tools(lookup, sequential=True, executor=executor),
+    }
+    print(f"{'tool ms':>8} {'calls':>6} " + " ".join(f"{m:>11}" for m in modes))
+    for latency_ms in args.latency_ms:
+        TOOL_SECONDS = latency_ms / 1000
+        for calls in args.calls:
+            row = [
+                asyncio.run(time_turns(tools, calls, args.turns))
+                for tools in modes.values()
+            ]
+            print(
+                f"{latency_ms:>8g} {calls:>6} "
+                + " ".join(f"{ms:>9.1f}ms" for ms in row)
+            )
+    executor.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,197 @@
+"""Team orchestration overhead, measured offline by record and replay.
+
+Records the model calls of three teams to a fixture through
+`RecordReplayClient`: `trip_planning` as a round-robin team and as a graph,
+and the `round_robin.py` primary/critic team with streaming turned on. The
+recorded "provider" is a local scripted client with a time to first token and
+a token rate, so the fixture can be made without an API key; pass
+`--fixture` to replay one recorded from the real API with
+`trip_planning/main.py --record` instead.
+
+Each team is then replayed twice: at the recorded speed, and with no model
+latency at all, which leaves only autogen's own orchestration time. Reports
+model calls, wall-clock time live and in both replays, orchestration time
+per call, and whether the replayed transcript matches the recorded one
+(ignoring the order of concurrent answers).
+
+Usage (from the repo root):
+    python benchmarks/bench_record_replay.py --ttft-ms 300 --tokens-per-second 80
+    python benchmarks/bench_record_replay.py --fixture trip.jsonl
+"""
+
+import argparse
+import asyncio
+import statistics
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.insert(
+    0, str(Path(__file__).resolve().parents[1] / "autogen" / "trip_planning")
+)
+
+from autogen_agentchat.agents import AssistantAgent
+from autogen_agentchat.conditions import MaxMessageTermination, TextMentionTermination
+from autogen_agentchat.messages import BaseChatMessage
+from autogen_agentchat.teams import RoundRobinGroupChat
+from autogen_core.models import CreateResult, RequestUsage, SystemMessage
+from autogen_ext.models.replay import ReplayChatCompletionClient
+from main import TASK, TEAMS, build_agents, build_termination
+from team_utils import RecordReplayClient
+
+
+class ScriptedProvider(ReplayChatCompletionClient):
+    """Answers in the voice of each agent, at a fixed first-token latency and
+    token rate. Streams word by word."""
+
+    def __init__(self, ttft: float, tokens_per_second: float):
+        super().__init__([])
+        self.ttft = ttft
+        self.tokens_per_second = tokens_per_second
+        self.turns: dict[str, int] = {}
+
+    def _answer(self, messages) -> str:
+        system = next((m.content for m in messages if isinstance(m, SystemMessage)), "")
+        turn = self.turns.get(system, 0)
+        self.turns[system] = turn + 1
+        if "final travel plan" in system:
+            return "Day 1: Kathmandu. Day 2: Bhaktapur. Day 3: Nagarkot. TERMINATE"
+        if "critic" in system:
+            return "APPROVE" if turn >= 2 else f"Tighten stanza {turn + 1}."
+        words = " ".join(f"idea{len(messages)}-{i}" for i in range(60))
+        return f"Turn {turn} after {len(messages)} messages: {words}"
+
+    def _result(self, messages, content: str) -> CreateResult:
+        return CreateResult(
+            finish_reason="stop",
+            content=content,
+            usage=RequestUsage(
+                prompt_tokens=sum(len(str(m.content)) for m in messages) // 4,
+                completion_tokens=len(content) // 4,
+            ),
+            cached=False,
+        )
+
+    async def create(self, messages, **kwargs) -> CreateResult:
+        content = self._answer(messages)
+        await asyncio.sleep(self.ttft + len(content) / 4 / self.tokens_per_second)
+        return self._result(messages, content)
+
+    async def create_stream(self, messages, **kwargs):
+        content = self._answer(messages)
+        await asyncio.sleep(self.ttft)
+        for word in content.split(" "):
+            await asyncio.sleep(len(word) / 4 / self.tokens_per_second)
+            yield word + " "
+        yield self._result(messages, content)
+
+
+def trip_planning(mode: str):
+    def build(client):
+        return TEAMS[mode](build_agents(client), build_termination()), TASK
+
+    return build
+
+
+def streaming_critic(client):
+    agents = [
+        AssistantAgent(
+            "primary",
+            model_client=client,
+            system_message="You are a helpful AI assistant.",
+            model_client_stream=True,
+        ),
+        AssistantAgent(
+            "critic",
+            model_client=client,
+            system_message="You are a critic AI. Say ONLY 'APPROVE' when done.",
+            model_client_stream=True,
+        ),
+    ]
+    termination = TextMentionTermination("APPROVE") | MaxMessageTermination(12)
+    team = RoundRobinGroupChat(agents, termination_condition=termination)
+    return team, "Write a short poem about the fall season."
+
+
+SCENARIOS = {
+    "trip round_robin": trip_planning("round_robin"),
+    "trip graph": trip_planning("graph"),
+    "poem, streamed": streaming_critic,
+}
+
+
+async def run(build, client) -> tuple[list[tuple[str, str]], float]:
+    team, task = build(client)
+    loop = asyncio.get_running_loop()
+    started = loop.time()
+    result = await team.run(task=task)
+    transcript = [
+        (m.source, m.to_text())
+        for m in result.messages
+        if isinstance(m, BaseChatMessage)
+    ]
+    return transcript, loop.time() - started
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--ttft-ms", type=float, default=300)
+    parser.add_argument("--tokens-per-second", type=float, default=80)
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument(
+        "--fixture", type=Path, help="Replay this recording of trip_planning"
+    )
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        scenarios = SCENARIOS
+        recorded: dict[str, tuple] = {}
+        fixtures = {name: args.fixture for name in scenarios}
+        if args.fixture is None:
+            for name, build in scenarios.items():
+                fixtures[name] = Path(tmp) / f"{name}.jsonl"
+                provider = ScriptedProvider(args.ttft_ms / 1000, args.tokens_per_second)
+                client = RecordReplayClient(fixtures[name], provider, mode="record")
+                recorded[name] = await run(build, client)
+        else:
+            scenarios = {k: v for k, v in SCENARIOS.items() if k.startswith("trip")}
+
+        print(
+            f"{'team':17} {'calls':>5} {'live':>7} {'replay':>7} {'no model':>8}"
+            f" {'per call':>9} {'model share':>11}  transcript"
+        )
+        for name, build in scenarios.items():
+            timings: dict[float, list[float]] = {1.0: [], 0.0: []}
+            try:
+                for _ in range(args.runs):
+                    for scale in timings:
+                        client = RecordReplayClient(fixtures[name], time_scale=scale)
+                        transcript, seconds = await run(build, client)
+                        timings[scale].append(seconds)
+            except RuntimeError:
+                # Teams re-raise an agent's error as a RuntimeError.
+                if not client.stats["missing"]:
+                    raise
+                print(f"{name:17} requests missing from {fixtures[name]}")
+                continue
+            calls = client.stats["replayed"]
+            replay = statistics.median(timings[1.0])
+            orchestration = statistics.median(timings[0.0])
+            live = f"{recorded[name][1]:6.2f}s" if name in recorded else "     -"
+            same = "-"
+            if name in recorded:
+                # Concurrent agents may answer in either order.
+                same = (
+                    "same"
+                    if sorted(transcript) == sorted(recorded[name][0])
+                    else "differs"
+                )
+            print(
+                f"{name:17} {calls:>5} {live:>7} {replay:>6.2f}s"
+                f" {orchestration:>7.3f}s {orchestration / calls * 1000:>7.2f}ms"
+                f" {1 - orchestration / replay:>10.1%}  {same}"
+            )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,94 @@
+"""Tokens and latency saved by stopping the reviser at ---END-OF-EDIT---.
+
+A local fake model writes the revised answer, the end-of-edit marker and then
+keeps going with trailing commentary, as chatty models do. The reviser runs
+once with the plain model (full generation, marker stripped afterwards) and
+once wrapped in `EarlyStopLlm`.
+
+Usage (from the repo root):
+    python benchmarks/bench_reviser_early_stop.py --trailing-tokens 200
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "google_adk"))
+
+from adk_common.early_stop import EarlyStopLlm, MarkerMatcher
+from adk_common.fake_llm import FakeLlm
+from google.adk.runners import InMemoryRunner
+from google.genai import types
+from llm_fact_checker.sub_agents.reviser import reviser_agent
+from llm_fact_checker.sub_agents.reviser.agent import _END_OF_EDIT_MARK
+
+ANSWER = (
+    "The Eiffel Tower is a wrought-iron lattice tower in Paris. It was completed"
+    " in 1889 for the World's Fair and is repainted about every seven years."
+)
+
+
+async def revise(model) -> tuple[float, int, str]:
+    agent = reviser_agent.clone({"model": model})
+    runner = InMemoryRunner(agent=agent, app_name="bench")
+    session = await runner.session_service.create_session(app_name="bench", user_id="u")
+    message = types.Content(role="user", parts=[types.Part(text="Findings: ...")])
+    started = time.perf_counter()
+    text, tokens = "", 0
+    async for event in runner.run_async(
+        user_id="u", session_id=session.id, new_message=message
+    ):
+        if event.content and event.content.parts and not event.partial:
+            text = event.content.parts[0].text
+            if event.usage_metadata:
+                tokens = event.usage_metadata.candidates_token_count or 0
+    return time.perf_counter() - started, tokens, text
+
+
+def check_matcher() -> None:
+    """The marker is found however the stream happens to be chunked."""
+    stream = f"{ANSWER}\n{_END_OF_EDIT_MARK}\ntrailing"
+    for size in range(1, len(_END_OF_EDIT_MARK) + 2):
+        matcher = MarkerMatcher(_END_OF_EDIT_MARK)
+        emitted = "".join(
+            matcher.feed(stream[i : i + size]) for i in range(0, len(stream), size)
+        )
+        assert matcher.found and emitted == f"{ANSWER}\n", size
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--trailing-tokens", type=int, default=200)
+    parser.add_argument("--ms-per-token", type=float, default=10)
+    parser.add_argument("--runs", type=int, default=3)
+    args = parser.parse_args()
+    check_matcher()
+
+    trailing = " Note: the revision keeps the structure of the original." * (
+        args.trailing_tokens // 12 + 1
+    )
+    fake = FakeLlm(
+        responder=lambda _: f"{ANSWER}\n{_END_OF_EDIT_MARK}\n{trailing}",
+        seconds_per_output_token=args.ms_per_token / 1000,
+    )
+    models = {
+        "full": fake,
+        "early_stop": EarlyStopLlm(inner=fake, stop_marker=_END_OF_EDIT_MARK),
+    }
+    results = {}
+    for label, model in models.items():
+        runs = [await revise(model) for _ in range(args.runs)]
+        seconds = sum(run[0] for run in runs) / len(runs)
+        tokens = sum(run[1] for run in runs) / len(runs)
+        assert runs[0][2].strip() == ANSWER, runs[0][2]
+        results[label] = (seconds, tokens)
+        print(f"{label:11s} {seconds * 1000:8.1f} ms/run {tokens:7.0f} output tokens")
+    saved_ms = (results["full"][0] - results["early_stop"][0]) * 1000
+    saved_tokens = results["full"][1] - results["early_stop"][1]
+    print(f"{'saved':11s} {saved_ms:8.1f} ms/run {saved_tokens:7.0f} output tokens")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,117 @@
+"""Seat reservation throughput across many flights under contention.
+
+Concurrent customers reserve seats on thousands of flights. Flights are
+picked with a Zipf distribution and most customers want the same few seats
+(Economy Plus windows and aisles), so hot flights see constant collisions.
+A customer who loses a seat retries once with the first free seat of the same
+cabin. The run checks that no seat ends up held twice, then reports
+reservations per second and the latency of `reserve` calls, both in memory
+and with SQLite persistence.
+
+Usage (from the repo root):
+    python benchmarks/bench_seat_inventory.py --flights 5000 --attempts 200000
+"""
+
+import argparse
+import asyncio
+import itertools
+import random
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "openai"))
+
+from seat_inventory import SEATS, SeatInventory, SeatUnavailableError
+
+POPULAR = [s for s in SEATS if s.economy_plus and s.letter in "ACDF"]
+
+
+async def run(inventory: SeatInventory, args, rng: random.Random) -> dict:
+    flights = [f"FLT-{n}" for n in range(args.flights)]
+    cum_weights = list(itertools.accumulate(1 / (r + 1) for r in range(args.flights)))
+    requests = iter(range(args.attempts))
+    latencies: list[float] = []
+    counts = {"reserved": 0, "conflicts": 0, "sold_out": 0}
+
+    async def reserve(flight: str, label: str, confirmation: str) -> None:
+        started = time.perf_counter()
+        try:
+            await inventory.reserve(flight, label, confirmation)
+        finally:
+            latencies.append(time.perf_counter() - started)
+
+    async def customer() -> None:
+        for n in requests:
+            flight = rng.choices(flights, cum_weights=cum_weights)[0]
+            seat = rng.choice(POPULAR) if rng.random() < 0.8 else rng.choice(SEATS)
+            try:
+                await reserve(flight, seat.label, f"C{n:07d}")
+                counts["reserved"] += 1
+                continue
+            except SeatUnavailableError:
+                counts["conflicts"] += 1
+            free = await inventory.available(flight, cabin=seat.cabin)
+            if not free:
+                counts["sold_out"] += 1
+                continue
+            try:
+                await reserve(flight, free[0].label, f"C{n:07d}")
+                counts["reserved"] += 1
+            except SeatUnavailableError:
+                counts["conflicts"] += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(customer() for _ in range(args.concurrency)))
+    elapsed = time.perf_counter() - started
+
+    # No seat is held twice and the bitmaps agree with the bookings.
+    for flight in flights:
+        seats = list(inventory.assignments(flight).values())
+        assert len(seats) == len(set(seats)) == inventory.occupancy(flight), flight
+    reserved = sum(inventory.occupancy(flight) for flight in flights)
+    assert reserved == counts["reserved"], (reserved, counts)
+    return {
+        **counts,
+        "seconds": elapsed,
+        "per_second": counts["reserved"] / elapsed,
+        "p50_us": statistics.median(latencies) * 1e6,
+        "p99_us": statistics.quantiles(latencies, n=100)[98] * 1e6,
+    }
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--flights", type=int, default=5000)
+    parser.add_argument("--attempts", type=int, default=200000)
+    parser.add_argument("--sqlite-attempts", type=int, default=20000)
+    parser.add_argument("--concurrency", type=int, default=500)
+    args = parser.parse_args()
+
+    print(
+        f"{'store':8} {'attempts':>9} {'reserved':>9} {'conflicts':>10}"
+        f" {'sold out':>9} {'res/s':>9} {'p50':>9} {'p99':>9}"
+    )
+    with tempfile.TemporaryDirectory() as tmp:
+        for label, inventory, attempts in (
+            ("memory", SeatInventory(), args.attempts),
+            (
+                "sqlite",
+                SeatInventory(str(Path(tmp) / "seats.db")),
+                args.sqlite_attempts,
+            ),
+        ):
+            run_args = argparse.Namespace(**{**vars(args), "attempts": attempts})
+            result = await run(inventory, run_args, random.Random(0))
+            print(
+                f"{label:8} {attempts:>9} {result['reserved']:>9}"
+                f" {result['conflicts']:>10} {result['sold_out']:>9}"
+                f" {result['per_second']:>9.0f} {result['p50_us']:>7.0f}us"
+                f" {result['p99_us']:>7.0f}us"
+            )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
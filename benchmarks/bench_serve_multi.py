@@ -0,0 +1,201 @@
+"""Load test of `google_adk/serve_multi.py` at different worker counts.
+
+Serves the offline `cpu_agent` fixture (a fake model and a CPU-bound tool
+run inline, see `fixtures/adk_agents`) through the dispatcher with 1, 2, 4,
+... workers, and runs many simulated users against it over HTTP. Each user
+creates a session and sends a few turns to `/run`. Reports turns per second,
+the speedup over one worker and per-turn latency percentiles; the speedup
+is bounded by the number of cores, which is printed too.
+
+With `--replace`, the largest pool is run once more with a shared SQLite
+session store while every worker is replaced mid-run (SIGHUP), and the
+failed requests are counted; there should be none.
+
+Usage (from the repo root):
+    python benchmarks/bench_serve_multi.py --workers 1 2 4 --users 64 --concurrency 32
+    python benchmarks/bench_serve_multi.py --workers 4 --replace
+"""
+
+import argparse
+import asyncio
+import os
+import signal
+import socket
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import httpx
+
+REPO = Path(__file__).resolve().parents[1]
+AGENTS_DIR = REPO / "benchmarks" / "fixtures" / "adk_agents"
+SERVE_MULTI = REPO / "google_adk" / "serve_multi.py"
+APP = "cpu_agent"
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+async def start_dispatcher(
+    workers: int, session_service_uri: str, env: dict
+) -> tuple[asyncio.subprocess.Process, str]:
+    port = _free_port()
+    process = await asyncio.create_subprocess_exec(
+        sys.executable,
+        str(SERVE_MULTI),
+        str(AGENTS_DIR),
+        "--workers",
+        str(workers),
+        "--port",
+        str(port),
+        "--session_service_uri",
+        session_service_uri,
+        "--log_level",
+        "warning",
+        env=env,
+        stdout=asyncio.subprocess.DEVNULL,
+        stderr=asyncio.subprocess.DEVNULL,
+    )
+    url = f"http://127.0.0.1:{port}"
+    async with httpx.AsyncClient() as client:
+        for _ in range(1200):
+            if process.returncode is not None:
+                raise RuntimeError(f"serve_multi exited with {process.returncode}")
+            try:
+                if (await client.get(f"{url}/dispatcher/stats")).status_code == 200:
+                    return process, url
+            except httpx.HTTPError:
+                await asyncio.sleep(0.1)
+    process.terminate()
+    raise RuntimeError("serve_multi did not start")
+
+
+async def user(
+    client: httpx.AsyncClient, n: int, turns: int, latencies: list[float]
+) -> int:
+    """One session of `turns` turns; returns the number of failed requests."""
+    response = await client.post(f"/apps/{APP}/users/user-{n}/sessions", json={})
+    if response.status_code != 200:
+        return 1
+    session_id = response.json()["id"]
+    failed = 0
+    for turn in range(turns):
+        request = {
+            "app_name": APP,
+            "user_id": f"user-{n}",
+            "session_id": session_id,
+            "new_message": {"role": "user", "parts": [{"text": f"turn {turn}"}]},
+        }
+        started = time.perf_counter()
+        response = await client.post("/run", json=request)
+        if response.status_code != 200:
+            failed += 1
+            continue
+        latencies.append(time.perf_counter() - started)
+    return failed
+
+
+async def load(args, workers: int, session_service_uri: str, replace: bool) -> dict:
+    env = {
+        **os.environ,
+        "BENCH_CPU_MS": str(args.cpu_ms),
+        "BENCH_MODEL_MS": str(args.model_ms),
+    }
+    process, url = await start_dispatcher(workers, session_service_uri, env)
+    latencies: list[float] = []
+    semaphore = asyncio.Semaphore(args.concurrency)
+    try:
+        async with httpx.AsyncClient(base_url=url, timeout=120) as client:
+
+            async def limited(n: int) -> int:
+                async with semaphore:
+                    return await user(client, n, args.turns, latencies)
+
+            # Warm up every worker before timing.
+            await asyncio.gather(*(user(client, -n - 1, 1, []) for n in range(workers)))
+            latencies.clear()
+            started = time.perf_counter()
+            tasks = [limited(n) for n in range(args.users)]
+            failed = 0
+            if replace:
+                process.send_signal(signal.SIGHUP)
+                # Keep the load on until every worker has been replaced.
+                n = args.users
+                while (await client.get("/dispatcher/stats")).json()[
+                    "replaced"
+                ] < workers:
+                    batch = range(n, n + args.concurrency)
+                    failed += sum(await asyncio.gather(*map(limited, batch)))
+                    n += args.concurrency
+            failed += sum(await asyncio.gather(*tasks))
+            elapsed = time.perf_counter() - started
+            stats = (await client.get("/dispatcher/stats")).json()
+    finally:
+        process.terminate()
+        await process.wait()
+
+    percentiles = statistics.quantiles(latencies, n=100)
+    return {
+        "workers": workers,
+        "turns_per_s": len(latencies) / elapsed,
+        "p50_ms": statistics.median(latencies) * 1000,
+        "p99_ms": percentiles[98] * 1000,
+        "failed": failed,
+        "replaced": stats["replaced"],
+    }
+
+
+def print_row(result: dict, baseline: float) -> None:
+    print(
+        f"{result['workers']:>7} {result['turns_per_s']:>10.1f}"
+        f" {result['turns_per_s'] / baseline:>7.2f}x"
+        f" {result['p50_ms']:>9.1f} {result['p99_ms']:>9.1f}"
+        f" {result['failed']:>6} {result['replaced']:>8}"
+    )
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--users", type=int, default=64)
+    parser.add_argument("--turns", type=int, default=4)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--cpu-ms", type=float, default=20)
+    parser.add_argument("--model-ms", type=float, default=20)
+    parser.add_argument(
+        "--replace",
+        action="store_true",
+        help="Also replace every worker of the largest pool mid-run",
+    )
+    args = parser.parse_args()
+
+    print(
+        f"{args.users} users x {args.turns} turns, concurrency {args.concurrency},"
+        f" tool CPU {args.cpu_ms:g} ms, model latency {args.model_ms:g} ms,"
+        f" {os.cpu_count()} cores"
+    )
+    print(
+        f"{'workers':>7} {'turns/s':>10} {'speedup':>8} {'p50 ms':>9}"
+        f" {'p99 ms':>9} {'failed':>6} {'replaced':>8}"
+    )
+    baseline = None
+    for workers in args.workers:
+        result = await load(args, workers, "memory://", replace=False)
+        baseline = baseline or result["turns_per_s"]
+        print_row(result, baseline)
+
+    if args.replace:
+        with tempfile.TemporaryDirectory() as directory:
+            uri = f"sqlite:///{directory}/sessions.db"
+            result = await load(args, max(args.workers), uri, replace=True)
+        print("\nReplacing every worker mid-run, sessions in SQLite:")
+        print_row(result, baseline)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
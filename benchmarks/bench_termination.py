@@ -0,0 +1,161 @@
+"""Tokens and time saved by cost-aware termination of a primary/critic team.
+
+Runs the `round_robin.py` team (a primary writer and a critic) against a
+scripted fake model client in four scenarios: the critic approves, the critic
+never approves while the primary's drafts barely change, the critic repeats
+the same feedback, and both keep producing new text. Each scenario runs with
+the old condition (APPROVE, with a message cap standing in for "forever") and
+with `cost_aware_termination`. Reports which condition fired, the tokens
+spent, the estimated and the actual tokens saved.
+
+Usage (from the repo root):
+    python benchmarks/bench_termination.py --model-latency-ms 20
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "autogen"))
+
+from autogen_agentchat.agents import AssistantAgent
+from autogen_agentchat.conditions import MaxMessageTermination, TextMentionTermination
+from autogen_agentchat.teams import RoundRobinGroupChat
+from autogen_core.models import CreateResult, RequestUsage, SystemMessage
+from autogen_ext.models.replay import ReplayChatCompletionClient
+from team_utils import cost_aware_termination
+
+HORIZON = 41
+POEM = (
+    "Crimson leaves drift down the lane, amber light on window pane,\n"
+    "cool wind hums a quiet tune, harvest gold beneath the moon."
+)
+
+
+def approves(agent: str, n: int) -> str:
+    if agent == "critic":
+        feedback = ["Sharpen the imagery.", "The last line's rhythm stumbles."]
+        return "APPROVE" if n >= 2 else feedback[n]
+    return f"Revision {n}: " + " ".join(f"image{n * 13 + i}" for i in range(30))
+
+
+def converging(agent: str, n: int) -> str:
+    if agent == "critic":
+        return f"Point {n}: consider {['rhythm', 'rhyme', 'tone', 'pacing'][n % 4]}."
+    return f"{POEM} ({n})"
+
+
+def repeating(agent: str, n: int) -> str:
+    if agent == "critic":
+        return "The second line feels flat; make it more vivid."
+    return f"Draft {n}: " + " ".join(f"word{n * 7 + i}" for i in range(40))
+
+
+def diverging(agent: str, n: int) -> str:
+    if agent == "critic":
+        return f"Round {n}: " + " ".join(f"note{n * 5 + i}" for i in range(15))
+    return f"Draft {n}: " + " ".join(f"line{n * 11 + i}" for i in range(40))
+
+
+SCENARIOS = {
+    "approves": approves,
+    "converging": converging,
+    "repeating": repeating,
+    "diverging": diverging,
+}
+
+
+class ScriptedClient(ReplayChatCompletionClient):
+    """Plays the primary and the critic from a script, with a fixed delay."""
+
+    def __init__(self, script, latency: float):
+        super().__init__([])
+        self.script = script
+        self.latency = latency
+        self.turns = {"primary": 0, "critic": 0}
+
+    async def create(self, messages, **kwargs) -> CreateResult:
+        system = next((m.content for m in messages if isinstance(m, SystemMessage)))
+        agent = "critic" if "critic" in system else "primary"
+        content = self.script(agent, self.turns[agent])
+        self.turns[agent] += 1
+        await asyncio.sleep(self.latency)
+        prompt = sum(len(str(m.content)) for m in messages) // 4
+        return CreateResult(
+            finish_reason="stop",
+            content=content,
+            usage=RequestUsage(
+                prompt_tokens=prompt, completion_tokens=len(content) // 4
+            ),
+            cached=False,
+        )
+
+
+async def run(script, termination, latency: float) -> tuple[int, int, float, str]:
+    client = ScriptedClient(script, latency)
+    team = RoundRobinGroupChat(
+        [
+            AssistantAgent(
+                "primary",
+                model_client=client,
+                system_message="You are a helpful AI assistant.",
+            ),
+            AssistantAgent(
+                "critic",
+                model_client=client,
+                system_message="You are a critic AI. Say ONLY 'APPROVE' when done.",
+            ),
+        ],
+        termination_condition=termination,
+    )
+    started = time.perf_counter()
+    result = await team.run(task="Write a short poem about the fall season.")
+    tokens = sum(
+        m.models_usage.prompt_tokens + m.models_usage.completion_tokens
+        for m in result.messages
+        if m.models_usage
+    )
+    return (
+        len(result.messages),
+        tokens,
+        time.perf_counter() - started,
+        result.stop_reason,
+    )
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--model-latency-ms", type=float, default=20)
+    parser.add_argument("--max-tokens", type=int, default=3000)
+    args = parser.parse_args()
+    latency = args.model_latency_ms / 1000
+
+    print(
+        f"{'scenario':11} {'fired':14} {'msgs':>5} {'tokens':>7} {'baseline':>9}"
+        f" {'saved':>6} {'est. saved':>10} {'time':>6} {'baseline':>9}"
+    )
+    for name, script in SCENARIOS.items():
+        baseline = TextMentionTermination("APPROVE") | MaxMessageTermination(HORIZON)
+        base_msgs, base_tokens, base_seconds, _ = await run(script, baseline, latency)
+        termination = cost_aware_termination(
+            "APPROVE",
+            max_tokens=args.max_tokens,
+            timeout_seconds=120,
+            max_messages=HORIZON,
+            converge_source="primary",
+            critic="critic",
+        )
+        msgs, tokens, seconds, _ = await run(script, termination, latency)
+        report = termination.report()
+        print(
+            f"{name:11} {','.join(report.fired):14} {msgs:>5} {tokens:>7}"
+            f" {base_tokens:>9} {base_tokens - tokens:>6}"
+            f" {report.estimated_tokens_saved:>10} {seconds:>5.2f}s"
+            f" {base_seconds:>8.2f}s"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,102 @@
+"""Event-loop lag with blocking ADK tools run inline vs offloaded to a pool.
+
+Runs many concurrent sessions of an agent backed by a local fake model. Each
+session makes one tool call that either blocks on I/O (`time.sleep`) or burns
+CPU, and an `EventLoopLagMonitor` records how long the loop was stalled.
+
+Usage (from the repo root):
+    python benchmarks/bench_tool_offload.py --sessions 32 --io-ms 50
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "google_adk"))
+
+from adk_common import EventLoopLagMonitor, ToolExecutor
+from adk_common.fake_llm import FakeLlm, call_tools_then_reply
+from google.adk.agents import Agent
+from google.adk.runners import InMemoryRunner
+from google.genai import types
+
+IO_SECONDS = 0.05
+CPU_ITERATIONS = 200_000
+
+
+def slow_lookup(query: str) -> dict:
+    """Looks up a value from a slow backing service."""
+    time.sleep(IO_SECONDS)
+    return {"status": "success", "report": f"Result for {query}"}
+
+
+def crunch_numbers(query: str) -> dict:
+    """Runs a CPU-heavy computation for the query."""
+    total = 0
+    for i in range(CPU_ITERATIONS):
+        total += (i * len(query)) % 7
+    return {"status": "success", "report": f"Checksum {total}"}
+
+
+def build_agent(tool) -> Agent:
+    name = tool.__name__
+    return Agent(
+        name="bench_agent",
+        model=FakeLlm(
+            responder=call_tools_then_reply([(name, {"query": "x"})], "done"),
+            latency=0.005,
+        ),
+        instruction="Benchmark agent.",
+        tools=[tool],
+    )
+
+
+async def run_sessions(agent: Agent, sessions: int) -> dict:
+    runner = InMemoryRunner(agent=agent, app_name="bench")
+
+    async def one(i: int) -> None:
+        session = await runner.session_service.create_session(
+            app_name="bench", user_id="u", session_id=f"s{i}"
+        )
+        message = types.Content(role="user", parts=[types.Part(text="go")])
+        async for _ in runner.run_async(
+            user_id="u", session_id=session.id, new_message=message
+        ):
+            pass
+
+    async with EventLoopLagMonitor() as monitor:
+        started = time.perf_counter()
+        await asyncio.gather(*(one(i) for i in range(sessions)))
+        wall = time.perf_counter() - started
+    return {"wall_s": round(wall, 3), **monitor.summary()}
+
+
+def main() -> None:
+    global IO_SECONDS
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sessions", type=int, default=32)
+    parser.add_argument("--io-ms", type=float, default=50)
+    parser.add_argument("--threads", type=int, default=16)
+    args = parser.parse_args()
+    IO_SECONDS = args.io_ms / 1000
+
+    executor = ToolExecutor(max_threads=args.threads)
+    cases = {
+        "io_inline": slow_lookup,
+        "io_thread_pool": executor.offload(slow_lookup, timeout=30),
+        "cpu_inline": crunch_numbers,
+        "cpu_thread_pool": executor.offload(crunch_numbers, timeout=30),
+        "cpu_process_pool": executor.offload(crunch_numbers, cpu_bound=True),
+    }
+    results = {}
+    for label, tool in cases.items():
+        results[label] = asyncio.run(run_sessions(build_agent(tool), args.sessions))
+        print(f"{label:18s} {json.dumps(results[label])}")
+    executor.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,215 @@
+"""Per-turn tracing overhead of the customer service agents.
+
+Runs customer service turns (triage, handoff to the FAQ agent, FAQ lookup)
+against the scripted `FakeModel` with no model latency, so the time of a turn
+is the agents' own work plus tracing. Every turn is wrapped in
+`trace("Customer service", group_id=...)` as in `main()`, with one group per
+simulated conversation. Compares tracing disabled, a processor that writes
+and flushes every span to a file as it ends, and `SampledTraceProcessor` at
+several sampling rates, plus a deliberately slow sink with a small queue to
+show that a backed-up exporter drops spans instead of slowing turns down.
+
+A turn is several milliseconds of the SDK's own work, so tracing overhead is
+small next to wall-clock noise; besides per-turn latency the benchmark reports
+the spans the SDK created per turn and the time spent inside the processor,
+which is what tracing adds to the request path.
+Sampled runs open their traces with the processor's `trace()`, so unsampled
+turns create no spans at all.
+
+Usage (from the repo root):
+    python benchmarks/bench_trace_export.py --turns 400
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "openai"))
+
+from agents import (
+    RunConfig,
+    Runner,
+    set_trace_processors,
+    set_tracing_disabled,
+    trace,
+)
+from agents.tracing import TracingProcessor
+from customer_service import AirlineAgentContext, triage_agent
+from fake_model import FakeModel
+from trace_export import JsonlFileExporter, OtlpFileExporter, SampledTraceProcessor
+
+MESSAGES = ["How many bags can I bring?", "Is there wifi on the plane?"]
+
+
+class PerSpanFileProcessor(TracingProcessor):
+    """Exports every span synchronously as it ends."""
+
+    def __init__(self, path: str):
+        self._file = open(path, "a", encoding="utf-8")
+        self.stats = {"exported": 0, "dropped": 0}
+
+    def on_trace_start(self, trace) -> None:
+        pass
+
+    def on_trace_end(self, trace) -> None:
+        pass
+
+    def on_span_start(self, span) -> None:
+        pass
+
+    def on_span_end(self, span) -> None:
+        self._file.write(json.dumps(span.export(), default=str) + "\n")
+        self._file.flush()
+        self.stats["exported"] += 1
+
+    def shutdown(self, timeout=None) -> None:
+        self._file.close()
+
+    def force_flush(self) -> None:
+        self._file.flush()
+
+
+class TimedProcessor(TracingProcessor):
+    """Measures the time the agents spend inside another processor."""
+
+    def __init__(self, inner: TracingProcessor):
+        self.inner = inner
+        self.seconds = 0.0
+        self.spans = 0
+
+    def _timed(self, method, item) -> None:
+        started = time.perf_counter()
+        method(item)
+        self.seconds += time.perf_counter() - started
+
+    def on_trace_start(self, trace) -> None:
+        self._timed(self.inner.on_trace_start, trace)
+
+    def on_trace_end(self, trace) -> None:
+        self._timed(self.inner.on_trace_end, trace)
+
+    def on_span_start(self, span) -> None:
+        self._timed(self.inner.on_span_start, span)
+
+    def on_span_end(self, span) -> None:
+        self.spans += 1
+        self._timed(self.inner.on_span_end, span)
+
+    def shutdown(self, timeout=None) -> None:
+        self.inner.shutdown()
+
+    def force_flush(self) -> None:
+        self.inner.force_flush()
+
+
+class SlowExporter(JsonlFileExporter):
+    def export(self, items: list) -> None:
+        time.sleep(0.2)
+        super().export(items)
+
+
+async def run_turns(turns: int, run_config: RunConfig, processor=None) -> list:
+    open_trace = (
+        processor.trace if isinstance(processor, SampledTraceProcessor) else trace
+    )
+    durations = []
+    for n in range(turns):
+        started = time.perf_counter()
+        with open_trace("Customer service", group_id=f"conversation-{n // 4}"):
+            await Runner.run(
+                triage_agent,
+                MESSAGES[n % len(MESSAGES)],
+                context=AirlineAgentContext(),
+                run_config=run_config,
+            )
+        durations.append(time.perf_counter() - started)
+    return durations
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--turns", type=int, default=400)
+    parser.add_argument("--rounds", type=int, default=3)
+    args = parser.parse_args()
+    logging.getLogger("openai.agents").setLevel(logging.ERROR)
+    run_config = RunConfig(model=FakeModel())
+
+    with tempfile.TemporaryDirectory() as tmp:
+        out = Path(tmp)
+        setups: list[tuple[str, Any]] = [
+            ("disabled", None),
+            ("per-span sync", lambda: PerSpanFileProcessor(str(out / "sync.jsonl"))),
+        ]
+        for rate in (0.0, 0.01, 0.1, 1.0):
+            setups.append(
+                (
+                    f"sampled {rate:g}",
+                    lambda rate=rate: SampledTraceProcessor(
+                        JsonlFileExporter(str(out / f"jsonl-{rate}.jsonl")),
+                        sample_rate=rate,
+                    ),
+                )
+            )
+        setups.append(
+            (
+                "otlp 1.0",
+                lambda: SampledTraceProcessor(OtlpFileExporter(str(out / "otlp.json"))),
+            )
+        )
+        setups.append(
+            (
+                "slow sink 1.0",
+                lambda: SampledTraceProcessor(
+                    SlowExporter(str(out / "slow.jsonl")),
+                    max_queue_size=256,
+                    max_batch_size=64,
+                ),
+            )
+        )
+
+        # Warm up imports and caches before measuring.
+        set_tracing_disabled(True)
+        await run_turns(20, run_config)
+
+        processors = {label: make() if make else None for label, make in setups}
+        timed = {label: TimedProcessor(p) for label, p in processors.items() if p}
+        durations: dict[str, list[float]] = {label: [] for label in processors}
+        # Setups take turns within each round, so drift in machine speed over
+        # the run does not favour whichever setup happens to run first.
+        for _ in range(args.rounds):
+            for label, processor in processors.items():
+                set_tracing_disabled(processor is None)
+                set_trace_processors([timed[label]] if processor else [])
+                durations[label] += await run_turns(args.turns, run_config, processor)
+
+        print(
+            f"{'processor':14} {'p50/turn':>10} {'p99/turn':>10} {'vs off':>10}"
+            f" {'spans/turn':>10} {'in-proc/turn':>12} {'exported':>9} {'dropped':>8}"
+        )
+        baseline = statistics.median(durations["disabled"])
+        for label, processor in processors.items():
+            if processor:
+                processor.shutdown()
+            p50 = statistics.median(durations[label])
+            p99 = statistics.quantiles(durations[label], n=100)[98]
+            stats = processor.stats if processor else {"exported": 0, "dropped": 0}
+            turns = len(durations[label])
+            spans = timed[label].spans / turns if processor else 0
+            in_processor = timed[label].seconds / turns if processor else 0
+            print(
+                f"{label:14} {p50 * 1e6:>8.0f}us {p99 * 1e6:>8.0f}us"
+                f" {(p50 - baseline) * 1e6:>8.0f}us {spans:>10.1f}"
+                f" {in_processor * 1e6:>10.1f}us"
+                f" {stats['exported']:>9} {stats['dropped']:>8}"
+            )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,77 @@
+"""Wall-clock time of the trip planning team: round-robin vs. graph.
+
+Runs `autogen/trip_planning` as a `RoundRobinGroupChat` and as a `GraphFlow`
+in which the local and language agents both react to the planner's draft at
+the same time. Agents answer through a local fake model client with a fixed
+latency per call; the summary agent's answer ends with TERMINATE, as the real
+one is instructed to. Reports wall-clock time, model calls, and the stop
+reason of each run.
+
+Usage (from the repo root):
+    python benchmarks/bench_trip_planning.py --model-latency-ms 500 --runs 3
+"""
+
+import argparse
+import asyncio
+import statistics
+import sys
+from pathlib import Path
+
+sys.path.insert(
+    0, str(Path(__file__).resolve().parents[1] / "autogen" / "trip_planning")
+)
+
+from autogen_core.models import CreateResult, RequestUsage, SystemMessage
+from autogen_ext.models.replay import ReplayChatCompletionClient
+from main import TASK, TEAMS, build_agents, run_team
+
+
+class SlowFakeClient(ReplayChatCompletionClient):
+    """Answers every call after a fixed delay, in the voice of the agent."""
+
+    def __init__(self, latency: float):
+        super().__init__([])
+        self.latency = latency
+        self.calls = 0
+
+    async def create(self, messages, **kwargs) -> CreateResult:
+        self.calls += 1
+        system = next((m.content for m in messages if isinstance(m, SystemMessage)), "")
+        await asyncio.sleep(self.latency)
+        if "final travel plan" in system:
+            content = "Day 1: Kathmandu. Day 2: Bhaktapur. Day 3: Nagarkot. TERMINATE"
+        else:
+            content = f"Suggestions after {len(messages)} messages."
+        return CreateResult(
+            finish_reason="stop",
+            content=content,
+            usage=RequestUsage(prompt_tokens=0, completion_tokens=0),
+            cached=False,
+        )
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--model-latency-ms", type=float, default=500)
+    parser.add_argument("--runs", type=int, default=3)
+    args = parser.parse_args()
+
+    timings = {}
+    for mode, build_team in TEAMS.items():
+        seconds = []
+        for _ in range(args.runs):
+            client = SlowFakeClient(args.model_latency_ms / 1000)
+            team = build_team(build_agents(client))
+            result, elapsed = await run_team(team, TASK, console=False)
+            seconds.append(elapsed)
+        timings[mode] = statistics.median(seconds)
+        print(
+            f"{mode:12} {timings[mode]:6.2f}s  model calls/run"
+            f" {client.calls:2d}  stop: {result.stop_reason}"
+        )
+    speedup = timings["round_robin"] / timings["graph"]
+    print(f"graph speedup {speedup:.2f}x at {args.model_latency_ms:g} ms per call")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,37 @@
+"""An offline agent for the serve_multi load test.
+
+Every turn calls a CPU-bound tool once, run inline on the event loop like
+the blocking tools of the examples, before a local fake model answers.
+`BENCH_CPU_MS` sets how long the tool computes and `BENCH_MODEL_MS` the
+latency of each model call.
+"""
+
+import os
+import time
+
+from adk_common.fake_llm import FakeLlm, call_tools_then_reply
+from google.adk.agents import Agent
+
+CPU_SECONDS = float(os.getenv("BENCH_CPU_MS", "20")) / 1000
+MODEL_SECONDS = float(os.getenv("BENCH_MODEL_MS", "20")) / 1000
+
+
+def crunch_numbers(query: str) -> dict:
+    """Runs a CPU-heavy computation for the query."""
+    total = 0
+    deadline = time.thread_time() + CPU_SECONDS
+    while time.thread_time() < deadline:
+        for i in range(1000):
+            total += (i * len(query)) % 7
+    return {"status": "success", "report": f"Checksum {total}"}
+
+
+root_agent = Agent(
+    name="cpu_agent",
+    model=FakeLlm(
+        responder=call_tools_then_reply([("crunch_numbers", {"query": "x"})], "done"),
+        latency=MODEL_SECONDS,
+    ),
+    instruction="Benchmark agent.",
+    tools=[crunch_numbers],
+)
@@ -0,0 +1,212 @@
+"""Google ADK cases: the weather agent team, tool dispatch, session growth and
+the llm_auditor pipeline, on `FakeLlm` with no latency."""
+
+import json
+import statistics
+import time
+
+from harness import REPO, Settings, add_path, case, import_ms, median_ms
+
+add_path("google_adk")
+add_path("benchmarks")
+
+import bench_fact_checker_pipeline as fact_checker
+from adk_common.fake_llm import FakeLlm, call_tools_then_reply, last_function_responses
+from adk_common.instrumentation import Instrumentation
+from google.adk.agents import Agent, SequentialAgent
+from google.adk.models import LlmRequest
+from google.adk.runners import InMemoryRunner
+from google.genai import types
+from llm_fact_checker.agent import build_parallel_auditor
+from llm_fact_checker.sub_agents.critic import critic_agent
+from llm_fact_checker.sub_agents.reviser import reviser_agent
+from weather_agent_team.agent_team import weather_agent_team
+
+
+def _user_text(llm_request: LlmRequest) -> str:
+    for content in reversed(llm_request.contents):
+        if content.role == "user" and content.parts and content.parts[0].text:
+            return content.parts[0].text.lower()
+    return ""
+
+
+def _route(llm_request: LlmRequest):
+    """The weather agent: hands greetings and goodbyes to its sub-agents,
+    looks up the weather itself."""
+    if last_function_responses(llm_request):
+        return "Here is the weather you asked for."
+    text = _user_text(llm_request)
+    for word, agent in (("hello", "greeting_agent"), ("bye", "farewell_agent")):
+        if word in text:
+            call = ("transfer_to_agent", {"agent_name": agent})
+            return call_tools_then_reply([call], "")(llm_request)
+    return call_tools_then_reply([("get_weather", {"city": "London"})], "")(llm_request)
+
+
+class Conversation:
+    """A runner and one session of `agent`."""
+
+    def __init__(self, agent):
+        self.runner = InMemoryRunner(agent=agent, app_name="suite")
+        self.session_id = None
+
+    async def new_session(self) -> None:
+        session = await self.runner.session_service.create_session(
+            app_name="suite", user_id="u"
+        )
+        self.session_id = session.id
+
+    async def turn(self, text: str) -> None:
+        message = types.Content(role="user", parts=[types.Part(text=text)])
+        async for _ in self.runner.run_async(
+            user_id="u", session_id=self.session_id, new_message=message
+        ):
+            pass
+
+
+def _weather_team():
+    greeting, farewell = weather_agent_team.sub_agents
+    replies = {
+        greeting.name: call_tools_then_reply([("say_hello", {"name": "Ada"})], "Hi!"),
+        farewell.name: call_tools_then_reply([("say_goodbye", {})], "Bye!"),
+    }
+    sub_agents = [
+        agent.clone({"model": FakeLlm(responder=replies[agent.name])})
+        for agent in (greeting, farewell)
+    ]
+    return weather_agent_team.clone(
+        {"model": FakeLlm(responder=_route), "sub_agents": sub_agents}
+    )
+
+
+@case("adk.weather_agent_v2")
+async def weather_agent_v2(settings: Settings) -> dict[str, float]:
+    """One turn per route of the team, each in a new session."""
+    conversation = Conversation(_weather_team())
+    metrics = {}
+    for route, text in (
+        ("greeting", "Hello, I'm Ada"),
+        ("weather", "What is the weather in London?"),
+        ("farewell", "Bye!"),
+    ):
+
+        async def turn():
+            await conversation.new_session()
+            await conversation.turn(text)
+
+        metrics[f"{route}_turn_ms"] = await median_ms(turn, settings.repeat)
+    return metrics
+
+
+@case("adk.instrumentation")
+async def instrumentation(settings: Settings) -> dict[str, float]:
+    """The weather turn (two model calls and a tool call) with and without
+    `Instrumentation` callbacks on every agent of the team."""
+    metrics = {}
+    for name, team in (
+        ("plain", _weather_team()),
+        ("instrumented", Instrumentation().instrument(_weather_team())),
+    ):
+        conversation = Conversation(team)
+
+        async def turn():
+            await conversation.new_session()
+            await conversation.turn("What is the weather in London?")
+
+        metrics[f"{name}_turn_ms"] = await median_ms(turn, settings.repeat)
+    metrics["overhead_ms"] = metrics["instrumented_turn_ms"] - metrics["plain_turn_ms"]
+    return metrics
+
+
+def noop() -> dict:
+    """Does nothing."""
+    return {"status": "success"}
+
+
+@case("adk.tool_dispatch")
+async def tool_dispatch(settings: Settings) -> dict[str, float]:
+    """A turn that calls one tool against a turn that answers directly; the
+    difference is the cost of dispatching the call and its extra model turn."""
+    metrics = {}
+    for name, calls in (("no_tool", []), ("one_tool", [("noop", {})])):
+        agent = Agent(
+            name="agent",
+            model=FakeLlm(responder=call_tools_then_reply(calls, "Done.")),
+            instruction="Answer.",
+            tools=[noop],
+        )
+        conversation = Conversation(agent)
+
+        async def turn():
+            await conversation.new_session()
+            await conversation.turn("Go")
+
+        metrics[f"{name}_turn_ms"] = await median_ms(turn, settings.repeat)
+    metrics["dispatch_ms"] = metrics["one_tool_turn_ms"] - metrics["no_tool_turn_ms"]
+    return metrics
+
+
+@case("adk.session_growth")
+async def session_growth(settings: Settings) -> dict[str, float]:
+    """`settings.turns` turns in one session: the first and last turns, and
+    what each turn of history adds."""
+    agent = Agent(
+        name="agent",
+        model=FakeLlm(responder=call_tools_then_reply([], "Done.")),
+        instruction="Answer.",
+    )
+    conversation = Conversation(agent)
+    await conversation.new_session()
+    timings = []
+    for n in range(settings.turns):
+        started = time.perf_counter()
+        await conversation.turn(f"Message {n}")
+        timings.append((time.perf_counter() - started) * 1000)
+    window = max(1, settings.turns // 8)
+    first = statistics.median(timings[1 : window + 1])
+    last = statistics.median(timings[-window:])
+    return {
+        "first_turns_ms": first,
+        "last_turns_ms": last,
+        "growth_us": (last - first) * 1000 / max(1, settings.turns - window),
+    }
+
+
+@case("adk.llm_auditor")
+async def llm_auditor(settings: Settings) -> dict[str, float]:
+    """The sequential and parallel fact checkers on the first fixture item."""
+    item = json.loads(fact_checker.FIXTURES.read_text().splitlines()[0])
+    fact_checker.VERDICTS.update(
+        {claim["text"]: claim["verdict"] for claim in item["claims"]}
+    )
+    model = FakeLlm(responder=fact_checker.respond)
+    sequential = SequentialAgent(
+        name="llm_auditor",
+        sub_agents=[
+            critic_agent.clone({"model": model, "tools": []}),
+            reviser_agent.clone({"model": model}),
+        ],
+    )
+    parallel = build_parallel_auditor(model, max_concurrency=4, tools=[])
+    return {
+        "sequential_ms": await median_ms(
+            lambda: fact_checker.audit(sequential, item), settings.repeat
+        ),
+        "parallel_ms": await median_ms(
+            lambda: fact_checker.audit(parallel, item), settings.repeat
+        ),
+    }
+
+
+@case("adk.import", memory=False)
+async def imports(settings: Settings) -> dict[str, float]:
+    path = REPO / "google_adk"
+    return {
+        "adk_ms": import_ms("google.adk.runners", path, settings.import_repeat),
+        "weather_agent_team_ms": import_ms(
+            "weather_agent_team.agent_team", path, settings.import_repeat
+        ),
+        "llm_fact_checker_ms": import_ms(
+            "llm_fact_checker.agent", path, settings.import_repeat
+        ),
+    }
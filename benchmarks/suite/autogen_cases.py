@@ -0,0 +1,128 @@
+"""AutoGen AgentChat cases: the trip planning teams, tool dispatch and
+history growth, on scripted clients that answer instantly."""
+
+from harness import REPO, Settings, add_path, case, import_ms, median_ms
+
+add_path("autogen", "trip_planning")
+add_path("benchmarks")
+
+from autogen_agentchat.agents import AssistantAgent
+from autogen_agentchat.conditions import MaxMessageTermination
+from autogen_agentchat.teams import RoundRobinGroupChat
+from autogen_core import FunctionCall
+from autogen_core.models import (
+    CreateResult,
+    FunctionExecutionResultMessage,
+    ModelFamily,
+    RequestUsage,
+)
+from autogen_ext.models.replay import ReplayChatCompletionClient
+from bench_record_replay import ScriptedProvider
+from main import TASK, TEAMS, build_agents, build_termination
+
+
+def _instant() -> ScriptedProvider:
+    return ScriptedProvider(ttft=0, tokens_per_second=float("inf"))
+
+
+@case("autogen.trip_planning")
+async def trip_planning(settings: Settings) -> dict[str, float]:
+    """A whole run of each trip planning team, and its time per model call."""
+    metrics = {}
+    for mode, build in TEAMS.items():
+        client = _instant()
+
+        async def run():
+            client.turns.clear()
+            await build(build_agents(client), build_termination()).run(task=TASK)
+
+        metrics[f"{mode}_run_ms"] = await median_ms(run, settings.repeat)
+        metrics[f"{mode}_per_call_ms"] = metrics[f"{mode}_run_ms"] / sum(
+            client.turns.values()
+        )
+    return metrics
+
+
+class ToolCallingClient(ReplayChatCompletionClient):
+    """Calls the first tool it is given once, then answers."""
+
+    def __init__(self):
+        super().__init__(
+            [],
+            model_info={
+                "vision": False,
+                "function_calling": True,
+                "json_output": False,
+                "family": ModelFamily.UNKNOWN,
+                "structured_output": False,
+            },
+        )
+
+    async def create(self, messages, *, tools=(), **kwargs) -> CreateResult:
+        usage = RequestUsage(prompt_tokens=0, completion_tokens=0)
+        if tools and not isinstance(messages[-1], FunctionExecutionResultMessage):
+            tool = tools[0] if isinstance(tools[0], dict) else tools[0].schema
+            call = FunctionCall(id="call-1", arguments="{}", name=tool["name"])
+            return CreateResult(
+                finish_reason="function_calls",
+                content=[call],
+                usage=usage,
+                cached=False,
+            )
+        return CreateResult(
+            finish_reason="stop", content="Done.", usage=usage, cached=False
+        )
+
+
+def noop() -> str:
+    """Does nothing."""
+    return "Done."
+
+
+@case("autogen.tool_dispatch")
+async def tool_dispatch(settings: Settings) -> dict[str, float]:
+    """An agent turn with one tool call against a turn answered directly."""
+    metrics = {}
+    for name, tools in (("no_tool", []), ("one_tool", [noop])):
+
+        async def turn():
+            agent = AssistantAgent("agent", ToolCallingClient(), tools=tools)
+            await agent.run(task="Go")
+
+        metrics[f"{name}_turn_ms"] = await median_ms(turn, settings.repeat)
+    metrics["dispatch_ms"] = metrics["one_tool_turn_ms"] - metrics["no_tool_turn_ms"]
+    return metrics
+
+
+async def _chat(messages: int) -> None:
+    client = _instant()
+    agents = [
+        AssistantAgent(name, model_client=client, system_message=f"You are {name}.")
+        for name in ("primary", "critic")
+    ]
+    team = RoundRobinGroupChat(
+        agents, termination_condition=MaxMessageTermination(messages)
+    )
+    await team.run(task="Write a short poem about the fall season.")
+
+
+@case("autogen.history_growth")
+async def history_growth(settings: Settings) -> dict[str, float]:
+    """Time per turn of a two-agent round-robin chat, 4 and `settings.turns`
+    messages long; every agent keeps the whole history."""
+    metrics = {}
+    for name, messages in (("short", 4), ("long", settings.turns)):
+        run_ms = await median_ms(lambda: _chat(messages), settings.repeat)
+        metrics[f"{name}_per_turn_ms"] = run_ms / (messages - 1)
+    return metrics
+
+
+@case("autogen.import", memory=False)
+async def imports(settings: Settings) -> dict[str, float]:
+    path = REPO / "autogen" / "trip_planning"
+    return {
+        "agentchat_ms": import_ms(
+            "autogen_agentchat.teams", path, settings.import_repeat
+        ),
+        "trip_planning_ms": import_ms("main", path, settings.import_repeat),
+    }
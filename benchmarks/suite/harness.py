@@ -0,0 +1,168 @@
+"""Registry, measurement and comparison for the benchmark suite.
+
+A case is an async function of the suite's `Settings` that returns its
+metrics, registered with `@case(name)`. Metric names end with their unit
+(`_ms`, `_us` or `_kib`), and for all of them lower is better; this is what
+`compare()` relies on to flag regressions. The harness adds each case's peak
+Python memory (`peak_kib`, from one extra run under `tracemalloc`), and
+`import_ms()` times imports in a fresh interpreter.
+"""
+
+import contextlib
+import gc
+import io
+import os
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Awaitable, Callable
+
+REPO = Path(__file__).resolve().parents[2]
+
+# Differences below these are noise, however large relative to the baseline.
+NOISE_FLOOR = {"ms": 0.25, "us": 20.0, "kib": 256.0}
+
+
+@dataclass
+class Settings:
+    """How hard the cases work.
+
+    Attributes:
+        repeat (int): Timed repetitions; cases report the median.
+        turns (int): Turns of the history growth cases.
+        import_repeat (int): Fresh interpreters per import time; the best
+            is reported.
+    """
+
+    repeat: int = 20
+    turns: int = 40
+    import_repeat: int = 3
+
+
+Case = Callable[[Settings], Awaitable[dict[str, float]]]
+# Name -> (case, whether to measure its peak memory).
+CASES: dict[str, tuple[Case, bool]] = {}
+
+
+def case(name: str, memory: bool = True) -> Callable[[Case], Case]:
+    """Registers a benchmark case under `name` (`<stack>.<subject>`).
+
+    Args:
+        name (str): Case name, `<stack>.<subject>`.
+        memory (bool): Whether to add the case's peak memory; off for cases
+            whose work happens in other processes.
+    """
+
+    def register(function: Case) -> Case:
+        CASES[name] = (function, memory)
+        return function
+
+    return register
+
+
+def add_path(*parts: str) -> None:
+    """Puts a directory of the repo on `sys.path`, as the examples expect."""
+    path = str(REPO.joinpath(*parts))
+    if path not in sys.path:
+        sys.path.insert(0, path)
+
+
+async def median_ms(function: Callable[[], Awaitable], repeat: int) -> float:
+    """Median wall-clock milliseconds of `function()`, after one warm-up.
+    Garbage collection is paused while timing, as `timeit` does."""
+    await function()
+    timings = []
+    gc.collect()
+    gc.disable()
+    try:
+        for _ in range(repeat):
+            started = time.perf_counter()
+            await function()
+            timings.append((time.perf_counter() - started) * 1000)
+    finally:
+        gc.enable()
+    return statistics.median(timings)
+
+
+@contextlib.contextmanager
+def quiet():
+    """Hides what the examples print (tool logs, agent banners)."""
+    with contextlib.redirect_stdout(io.StringIO()):
+        yield
+
+
+async def run_case(name: str, settings: Settings) -> dict[str, float]:
+    """The metrics of case `name`, plus its peak traced memory."""
+    function, memory = CASES[name]
+    with quiet():
+        metrics = await function(settings)
+        if not memory:
+            return metrics
+        tracemalloc.start()
+        try:
+            await function(Settings(repeat=1, turns=settings.turns, import_repeat=1))
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+    return {**metrics, "peak_kib": peak / 1024}
+
+
+def import_ms(module: str, path: Path, repeat: int) -> float:
+    """Best-of-`repeat` milliseconds to import `module` in a fresh
+    interpreter with `path` on `sys.path`."""
+    code = (
+        "import sys, time\n"
+        f"sys.path.insert(0, {str(path)!r})\n"
+        "started = time.perf_counter()\n"
+        f"import {module}\n"
+        "sys.stderr.write(f'\\n{(time.perf_counter() - started) * 1000}\\n')\n"
+    )
+    timings = []
+    for _ in range(repeat):
+        done = subprocess.run(
+            [sys.executable, "-c", code],
+            cwd=path,
+            capture_output=True,
+            text=True,
+            env={**os.environ, "PYTHONDONTWRITEBYTECODE": "1"},
+            check=True,
+        )
+        timings.append(float(done.stderr.strip().splitlines()[-1]))
+    return min(timings)
+
+
+def _unit(metric: str) -> str:
+    return metric.rsplit("_", 1)[-1]
+
+
+def compare(
+    results: dict[str, dict[str, float]],
+    baseline: dict[str, dict[str, float]],
+    threshold: float,
+) -> list[tuple[str, str, float, float]]:
+    """The metrics that got worse than `baseline` by more than `threshold`
+    (a fraction) and more than the noise floor of their unit.
+
+    Args:
+        results (dict): Metrics by case, of this run.
+        baseline (dict): Metrics by case, of an earlier run.
+        threshold (float): Allowed relative increase.
+
+    Returns:
+        list[tuple[str, str, float, float]]: Case, metric, baseline value and
+            current value of each regression.
+    """
+    regressions = []
+    for name, metrics in results.items():
+        for metric, value in metrics.items():
+            before = baseline.get(name, {}).get(metric)
+            unit = _unit(metric)
+            if before is None or unit not in NOISE_FLOOR:
+                continue
+            if value - before > max(before * threshold, NOISE_FLOOR[unit]):
+                regressions.append((name, metric, before, value))
+    return regressions
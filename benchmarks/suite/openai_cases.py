@@ -0,0 +1,125 @@
+"""OpenAI Agents SDK cases: the airline triage agent, tool dispatch and
+history growth, on the scripted `FakeModel` with no latency and tracing off."""
+
+import logging
+import statistics
+import time
+
+from harness import REPO, Settings, add_path, case, import_ms, median_ms
+
+add_path("openai")
+
+from agents import Agent, RunConfig, Runner, function_tool, set_tracing_disabled
+from context_window import ContextWindow
+from customer_service import AirlineAgentContext, faq_agent, pre_route, triage_agent
+from fake_model import FakeModel
+
+set_tracing_disabled(True)
+logging.getLogger("openai.agents").setLevel(logging.ERROR)
+
+RUN_CONFIG = RunConfig(model=FakeModel())
+QUESTIONS = [
+    "How many bags can I bring on the plane?",
+    "Is there wifi on the plane?",
+    "How many seats are there on the plane?",
+    "What food do you serve?",
+]
+
+
+async def _run(agent, items, context=None):
+    return await Runner.run(
+        agent, items, context=context or AirlineAgentContext(), run_config=RUN_CONFIG
+    )
+
+
+@case("openai.triage_agent")
+async def triage(settings: Settings) -> dict[str, float]:
+    """A question handed to the FAQ agent, a seat request handed to the seat
+    booking agent, and the question again with `pre_route` skipping triage."""
+    question = [{"role": "user", "content": QUESTIONS[0]}]
+    seat = [{"role": "user", "content": "I want to change my seat"}]
+
+    async def routed():
+        context = AirlineAgentContext()
+        agent = await pre_route(triage_agent, QUESTIONS[0], context)
+        await _run(agent, question, context)
+
+    return {
+        "faq_turn_ms": await median_ms(
+            lambda: _run(triage_agent, question), settings.repeat
+        ),
+        "seat_turn_ms": await median_ms(
+            lambda: _run(triage_agent, seat), settings.repeat
+        ),
+        "routed_faq_turn_ms": await median_ms(routed, settings.repeat),
+    }
+
+
+@function_tool(name_override="faq_lookup_tool")
+def noop(question: str) -> str:
+    """Does nothing."""
+    return "Done."
+
+
+@case("openai.tool_dispatch")
+async def tool_dispatch(settings: Settings) -> dict[str, float]:
+    """A turn with one tool call against a turn answered directly. `FakeModel`
+    calls any tool named `faq_lookup_tool`, so the tool is a no-op by that
+    name."""
+    items = [{"role": "user", "content": QUESTIONS[0]}]
+    plain = Agent[AirlineAgentContext](name="Plain Agent", instructions="Answer.")
+    tooled = plain.clone(name="Tool Agent", tools=[noop])
+    metrics = {
+        "no_tool_turn_ms": await median_ms(lambda: _run(plain, items), settings.repeat),
+        "one_tool_turn_ms": await median_ms(
+            lambda: _run(tooled, items), settings.repeat
+        ),
+    }
+    metrics["dispatch_ms"] = metrics["one_tool_turn_ms"] - metrics["no_tool_turn_ms"]
+    return metrics
+
+
+async def _conversation(turns: int, window: ContextWindow | None) -> list[float]:
+    """Turn times of a conversation with the FAQ agent that resends the whole
+    history, or the items of `window`."""
+    context = AirlineAgentContext()
+    history = []
+    timings = []
+    for n in range(turns):
+        question = QUESTIONS[n % len(QUESTIONS)]
+        started = time.perf_counter()
+        if window is None:
+            history.append({"role": "user", "content": question})
+            result = await _run(faq_agent, history, context)
+            history = result.to_input_list()
+        else:
+            window.add_user_message(question)
+            result = await _run(faq_agent, window.input_items(context), context)
+            window.add_result(result)
+        timings.append((time.perf_counter() - started) * 1000)
+    return timings
+
+
+@case("openai.history_growth")
+async def history_growth(settings: Settings) -> dict[str, float]:
+    """`settings.turns` turns resending the whole history and through
+    `ContextWindow`: the first turns, and the last turns of each."""
+    window = max(1, settings.turns // 8)
+    full = await _conversation(settings.turns, None)
+    windowed = await _conversation(settings.turns, ContextWindow())
+    return {
+        "first_turns_ms": statistics.median(full[1 : window + 1]),
+        "full_last_turns_ms": statistics.median(full[-window:]),
+        "windowed_last_turns_ms": statistics.median(windowed[-window:]),
+    }
+
+
+@case("openai.import", memory=False)
+async def imports(settings: Settings) -> dict[str, float]:
+    path = REPO / "openai"
+    return {
+        "agents_ms": import_ms("agents", path, settings.import_repeat),
+        "customer_service_ms": import_ms(
+            "customer_service", path, settings.import_repeat
+        ),
+    }
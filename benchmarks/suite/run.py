@@ -0,0 +1,144 @@
+"""Offline micro-benchmarks of all three stacks, with regression checks.
+
+Runs the cases of `adk_cases.py`, `openai_cases.py` and `autogen_cases.py`
+against deterministic local models that answer instantly, so what is
+measured is each framework's own cost: time per turn of the example agents
+and teams, the extra time of a turn with one no-op tool call, how turns slow
+down as the history grows, the import time of the frameworks and examples,
+and the peak Python memory of each case. Times are medians of `--repeat`
+runs after a warm-up; import times are the best of `--import-repeat` fresh
+interpreters.
+
+Results are written as JSON (`--out`) together with the Python version,
+platform, package versions and git commit. Given the results of an earlier
+run (`--baseline`), every metric that got worse by more than `--threshold`
+and more than the noise floor of its unit is reported, and the script exits
+with status 1. Timings on a shared machine drift by tens of percent from
+minute to minute, so cases that look slower are run again up to `--retries`
+times, keeping each metric's best value, and only what stays slower is
+reported. Baselines are machine-specific; make them on the machine that
+checks against them.
+
+Usage (from the repo root):
+    python benchmarks/suite/run.py --out baseline.json
+    python benchmarks/suite/run.py --baseline baseline.json --threshold 0.25
+    python benchmarks/suite/run.py --filter adk. openai.triage_agent
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import platform
+import subprocess
+import sys
+import time
+import warnings
+from importlib import metadata
+
+from harness import CASES, REPO, Settings, compare, quiet, run_case
+
+with quiet():
+    import adk_cases  # noqa: F401
+    import autogen_cases  # noqa: F401
+    import openai_cases  # noqa: F401
+
+PACKAGES = ("google-adk", "openai-agents", "autogen-agentchat", "autogen-ext")
+
+
+def environment() -> dict:
+    versions = {}
+    for package in PACKAGES:
+        try:
+            versions[package] = metadata.version(package)
+        except metadata.PackageNotFoundError:
+            versions[package] = None
+    commit = subprocess.run(
+        ["git", "rev-parse", "--short", "HEAD"],
+        cwd=REPO,
+        capture_output=True,
+        text=True,
+    ).stdout.strip()
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "packages": versions,
+        "commit": commit or None,
+        "time": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+    }
+
+
+def print_case(name: str, metrics: dict, baseline: dict) -> None:
+    for metric, value in metrics.items():
+        before = baseline.get(name, {}).get(metric)
+        change = f"{value / before - 1:>7.0%}" if before else ""
+        before = f"{before:>10.2f}" if before is not None else ""
+        print(f"{name:24} {metric:26} {value:>10.2f} {before:>10} {change}")
+
+
+async def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--filter", nargs="+", default=[], help="Run the cases whose name starts so"
+    )
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--turns", type=int, default=40)
+    parser.add_argument("--import-repeat", type=int, default=3)
+    parser.add_argument("--out", help="Write the results to this JSON file")
+    parser.add_argument("--baseline", help="Results of an earlier run to check against")
+    parser.add_argument("--threshold", type=float, default=0.25)
+    parser.add_argument("--retries", type=int, default=2)
+    args = parser.parse_args()
+    warnings.simplefilter("ignore")
+    logging.disable(logging.WARNING)
+
+    baseline = {}
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)["results"]
+    settings = Settings(
+        repeat=args.repeat, turns=args.turns, import_repeat=args.import_repeat
+    )
+    names = [
+        name
+        for name in CASES
+        if not args.filter or any(name.startswith(f) for f in args.filter)
+    ]
+
+    print(f"{'case':24} {'metric':26} {'value':>10} {'baseline':>10} {'change':>7}")
+    results = {}
+    for name in names:
+        results[name] = await run_case(name, settings)
+        print_case(name, results[name], baseline)
+
+    regressions = compare(results, baseline, args.threshold)
+    for _ in range(args.retries):
+        slower = sorted({name for name, *_ in regressions})
+        if not slower:
+            break
+        print(f"\nRunning again, as they look slower: {', '.join(slower)}")
+        for name in slower:
+            again = await run_case(name, settings)
+            results[name] = {
+                metric: min(value, again.get(metric, value))
+                for metric, value in results[name].items()
+            }
+            print_case(name, results[name], baseline)
+        regressions = compare(results, baseline, args.threshold)
+
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump({"environment": environment(), "results": results}, f, indent=2)
+        print(f"\nResults written to {args.out}")
+    if regressions:
+        print(f"\n{len(regressions)} regression(s) beyond {args.threshold:.0%}:")
+        for name, metric, before, value in regressions:
+            print(f"  {name} {metric}: {before:.2f} -> {value:.2f}")
+        return 1
+    if baseline:
+        print(f"\nNo regressions beyond {args.threshold:.0%}.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
@@ -0,0 +1 @@
+from .tool_executor import EventLoopLagMonitor, ToolExecutor, default_executor
@@ -0,0 +1,148 @@
+"""Stop a streaming generation as soon as the model writes a stop marker.
+
+Stripping a marker after the fact still pays for every token the model writes
+past it. `EarlyStopLlm` wraps another model, always streams from it, scans the
+text incrementally for the marker (which may be split across chunks) and closes
+the stream the moment the marker is complete, returning only the text before
+it.
+"""
+
+import logging
+import time
+from contextlib import aclosing
+from typing import AsyncGenerator
+
+from google.adk.models import BaseLlm, LlmRequest, LlmResponse
+from google.genai import types
+from pydantic import PrivateAttr
+
+logger = logging.getLogger(__name__)
+
+
+class MarkerMatcher:
+    """Incrementally finds `marker` in a stream of text chunks.
+
+    Text that might be the start of the marker is held back until the next
+    chunk shows whether it is, so emitted text never contains part of it.
+    """
+
+    def __init__(self, marker: str):
+        self.marker = marker
+        self.found = False
+        self._pending = ""
+
+    def feed(self, chunk: str) -> str:
+        """Consumes a chunk and returns the text that is safe to emit."""
+        if self.found:
+            return ""
+        buffer = self._pending + chunk
+        index = buffer.find(self.marker)
+        if index != -1:
+            self.found = True
+            self._pending = ""
+            return buffer[:index]
+        # Hold back the longest suffix that is a prefix of the marker.
+        keep = 0
+        for size in range(min(len(buffer), len(self.marker) - 1), 0, -1):
+            if self.marker.startswith(buffer[-size:]):
+                keep = size
+                break
+        self._pending = buffer[len(buffer) - keep :]
+        return buffer[: len(buffer) - keep]
+
+    def flush(self) -> str:
+        """Returns held-back text once the stream has ended without the marker."""
+        pending, self._pending = self._pending, ""
+        return pending
+
+
+class EarlyStopLlm(BaseLlm):
+    """Streams from `inner` and cancels generation at `stop_marker`.
+
+    The final response carries `custom_metadata["early_stop"]` with whether the
+    marker was hit, the time it took and the output size, and the instance keeps
+    running totals in `stats`.
+    """
+
+    model: str = "early-stop"
+    inner: BaseLlm
+    stop_marker: str
+    _stats: dict = PrivateAttr(
+        default_factory=lambda: {"runs": 0, "stopped_early": 0, "seconds": 0.0}
+    )
+
+    def model_post_init(self, context) -> None:
+        super().model_post_init(context)
+        self.model = self.inner.model
+
+    @property
+    def stats(self) -> dict:
+        return dict(self._stats)
+
+    async def generate_content_async(
+        self, llm_request: LlmRequest, stream: bool = False
+    ) -> AsyncGenerator[LlmResponse, None]:
+        started = time.perf_counter()
+        matcher = MarkerMatcher(self.stop_marker)
+        text_parts: list[str] = []
+        final = None
+        async with aclosing(
+            self.inner.generate_content_async(llm_request, stream=True)
+        ) as responses:
+            async for response in responses:
+                if not response.partial:
+                    # The stream ended before the marker; this is the aggregate.
+                    final = response
+                    break
+                parts = response.content.parts if response.content else None
+                if not parts or any(part.text is None for part in parts):
+                    if stream:
+                        yield response
+                    continue
+                emitted = matcher.feed("".join(part.text for part in parts))
+                if emitted:
+                    text_parts.append(emitted)
+                    if stream:
+                        yield LlmResponse(
+                            content=types.Content(
+                                role="model", parts=[types.Part(text=emitted)]
+                            ),
+                            partial=True,
+                        )
+                if matcher.found:
+                    # Leaving the `async with` closes the upstream stream.
+                    break
+
+        elapsed = time.perf_counter() - started
+        self._stats["runs"] += 1
+        self._stats["seconds"] += elapsed
+        if matcher.found:
+            self._stats["stopped_early"] += 1
+            text = "".join(text_parts)
+            final = LlmResponse(
+                content=types.Content(role="model", parts=[types.Part(text=text)]),
+                usage_metadata=types.GenerateContentResponseUsageMetadata(
+                    # Provider usage never arrives for a cancelled stream.
+                    candidates_token_count=(len(text) + len(self.stop_marker))
+                    // 4
+                ),
+            )
+        elif final is None:
+            # The stream ended without an aggregate response.
+            text = "".join(text_parts) + matcher.flush()
+            final = LlmResponse(
+                content=types.Content(role="model", parts=[types.Part(text=text)])
+            )
+
+        report = {
+            "stopped_early": matcher.found,
+            "seconds": round(elapsed, 3),
+            "output_tokens": (
+                final.usage_metadata.candidates_token_count
+                if final.usage_metadata
+                else None
+            ),
+        }
+        final.custom_metadata = {**(final.custom_metadata or {}), "early_stop": report}
+        logger.info("Generation for %s finished: %s", self.model, report)
+        yield final
@@ -0,0 +1,111 @@
+"""Deterministic local model for running ADK agents offline.
+
+`FakeLlm` plugs into any `Agent(model=...)` slot. A responder function decides
+what the "model" says for each request, and a fixed latency stands in for the
+network round trip, so benchmarks measure ADK orchestration and tools without
+API keys or provider noise.
+"""
+
+import asyncio
+from typing import AsyncGenerator, Callable, Union
+
+from google.adk.models import BaseLlm, LlmRequest, LlmResponse
+from google.genai import types
+
+_STREAM_CHUNK_CHARS = 16
+
+Responder = Callable[[LlmRequest], Union[str, types.Content]]
+
+
+def last_function_responses(llm_request: LlmRequest) -> list[types.FunctionResponse]:
+    """Returns the function responses in the latest request content, if any."""
+    if not llm_request.contents:
+        return []
+    parts = llm_request.contents[-1].parts or []
+    return [part.function_response for part in parts if part.function_response]
+
+
+def call_tools_then_reply(
+    calls: list[tuple[str, dict]], reply: Union[str, Callable[[LlmRequest], str]]
+) -> Responder:
+    """Builds a responder that calls `calls` in one turn, then answers `reply`.
+
+    Args:
+        calls (list): (tool name, args) pairs emitted together in a single turn.
+        reply (str | Callable): Final text, or a function of the request that
+            returns it once the tool results are in.
+    """
+
+    def respond(llm_request: LlmRequest) -> Union[str, types.Content]:
+        if last_function_responses(llm_request) or not calls:
+            return reply(llm_request) if callable(reply) else reply
+        return types.Content(
+            role="model",
+            parts=[
+                types.Part(function_call=types.FunctionCall(name=name, args=args))
+                for name, args in calls
+            ],
+        )
+
+    return respond
+
+
+class FakeLlm(BaseLlm):
+    """A scripted model with a fixed per-call latency."""
+
+    model: str = "fake-llm"
+    responder: Responder
+    latency: float = 0.0
+    """Seconds each call takes before the response is returned."""
+    seconds_per_output_token: float = 0.0
+    """Extra generation time per output token, so long answers take longer."""
+
+    async def generate_content_async(
+        self, llm_request: LlmRequest, stream: bool = False
+    ) -> AsyncGenerator[LlmResponse, None]:
+        content = self.responder(llm_request)
+        if isinstance(content, str):
+            content = types.Content(role="model", parts=[types.Part(text=content)])
+        usage = _estimate_usage(llm_request, content)
+        text_only = all(part.text is not None for part in content.parts or [])
+        if stream and text_only and self.seconds_per_output_token:
+            # Stream the text in small chunks, paying per-token time as we go.
+            await asyncio.sleep(self.latency)
+            text = "".join(part.text for part in content.parts)
+            for start in range(0, len(text), _STREAM_CHUNK_CHARS):
+                chunk = text[start : start + _STREAM_CHUNK_CHARS]
+                await asyncio.sleep(self.seconds_per_output_token * len(chunk) / 4)
+                yield LlmResponse(
+                    content=types.Content(role="model", parts=[types.Part(text=chunk)]),
+                    partial=True,
+                )
+        else:
+            delay = self.latency + (
+                self.seconds_per_output_token * usage.candidates_token_count
+            )
+            if delay:
+                await asyncio.sleep(delay)
+        yield LlmResponse(content=content, usage_metadata=usage)
+
+
+def _estimate_usage(
+    llm_request: LlmRequest, content: types.Content
+) -> types.GenerateContentResponseUsageMetadata:
+    """Approximates token counts at four characters per token."""
+
+    def chars(contents: list[types.Content]) -> int:
+        return sum(
+            len(part.text or "")
+            + len(str(part.function_call or ""))
+            + len(str(part.function_response or ""))
+            for item in contents
+            for part in item.parts or []
+        )
+
+    prompt = chars(llm_request.contents) // 4 + 1
+    output = chars([content]) // 4 + 1
+    return types.GenerateContentResponseUsageMetadata(
+        prompt_token_count=prompt,
+        candidates_token_count=output,
+        total_token_count=prompt + output,
+    )
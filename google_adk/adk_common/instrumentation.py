@@ -0,0 +1,531 @@
+"""Metrics, spans and structured logs for ADK agent trees.
+
+`Instrumentation.instrument(agent)` adds model and tool callbacks to an agent
+and every agent below it: sub-agents and agents wrapped in an `AgentTool`.
+They go first in each agent's callback lists, ahead of the agent's own
+callbacks (such as the critic's reference rendering), and never change a
+request or a response. For every model call they record a span, the latency,
+and the input, output and cached tokens; for every tool call a span, the
+latency and whether it failed (raised, or returned `{"status": "error"}`).
+
+Latencies go into histograms per agent, and per tool. `prometheus_text()`
+renders all metrics in the Prometheus text exposition format, and
+`metrics_records()` as JSON-ready dicts. Spans are kept in memory (the most
+recent `max_spans`) and logged as structured records on the
+`adk_common.instrumentation.spans` logger.
+
+`start_logging()` routes logging through a `QueueHandler`, so tools and
+callbacks never wait on I/O: a `QueueListener` thread formats the records as
+JSON lines and writes them to stderr or a file. `start_export()` writes the
+metrics to a directory every few seconds: `metrics.prom`, for a textfile
+collector or a scrape sidecar, and `metrics.jsonl`, one snapshot per line.
+`instrument_from_env()` does all three when ADK_METRICS_DIR is set.
+"""
+
+import atexit
+import bisect
+import json
+import logging
+import os
+import queue
+import threading
+import time
+from collections import deque
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from pathlib import Path
+from typing import Any, Iterator, Optional
+
+from google.adk.agents import BaseAgent, LlmAgent
+from google.adk.agents.callback_context import CallbackContext
+from google.adk.models import LlmRequest, LlmResponse
+from google.adk.tools import BaseTool, ToolContext
+from google.adk.tools.agent_tool import AgentTool
+
+logger = logging.getLogger(__name__)
+span_logger = logging.getLogger(__name__ + ".spans")
+
+# Seconds; from a fast tool call to a long generation.
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+
+# Name -> (type, help) of every metric recorded.
+METRICS = {
+    "adk_model_calls_total": ("counter", "Model calls."),
+    "adk_model_errors_total": ("counter", "Model calls that failed."),
+    "adk_model_tokens_total": ("counter", "Model tokens, by kind."),
+    "adk_model_latency_seconds": ("histogram", "Model call latency."),
+    "adk_tool_calls_total": ("counter", "Tool calls."),
+    "adk_tool_errors_total": ("counter", "Tool calls that failed."),
+    "adk_tool_latency_seconds": ("histogram", "Tool call latency."),
+}
+
+
+class Histogram:
+    """Counts of observations per bucket, as Prometheus histograms keep them.
+
+    Args:
+        buckets (tuple[float, ...]): Upper bounds, ascending; an implicit
+            +Inf bucket follows.
+    """
+
+    def __init__(self, buckets: tuple[float, ...] = DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def cumulative(self) -> list[tuple[str, int]]:
+        """(upper bound, observations at or below it) per bucket."""
+        bounds = [f"{bound:g}" for bound in self.buckets] + ["+Inf"]
+        total, result = 0, []
+        for bound, count in zip(bounds, self.counts):
+            total += count
+            result.append((bound, total))
+        return result
+
+
+def _label_text(labels: tuple[tuple[str, str], ...]) -> str:
+    def escape(value: str) -> str:
+        return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+    return ",".join(f'{key}="{escape(str(value))}"' for key, value in labels)
+
+
+class Metrics:
+    """Counters and histograms by metric name and labels. Thread-safe.
+
+    Args:
+        buckets (tuple[float, ...]): Bucket bounds of every histogram.
+    """
+
+    def __init__(self, buckets: tuple[float, ...] = DEFAULT_BUCKETS):
+        self.buckets = buckets
+        self._counters: dict[str, dict[tuple, float]] = {}
+        self._histograms: dict[str, dict[tuple, Histogram]] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, name: str, labels: dict, amount: float = 1) -> None:
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            series = self._counters.setdefault(name, {})
+            series[key] = series.get(key, 0) + amount
+
+    def observe(self, name: str, labels: dict, value: float) -> None:
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            series = self._histograms.setdefault(name, {})
+            if key not in series:
+                series[key] = Histogram(self.buckets)
+            series[key].observe(value)
+
+    def counter(self, name: str, **labels) -> float:
+        """Current value of one counter series; 0 if never incremented."""
+        with self._lock:
+            return self._counters.get(name, {}).get(tuple(sorted(labels.items())), 0)
+
+    def prometheus_text(self) -> str:
+        """All metrics in the Prometheus text exposition format."""
+        lines = []
+        with self._lock:
+            for name in sorted({*self._counters, *self._histograms}):
+                kind, help_text = METRICS.get(name, ("untyped", name))
+                lines.append(f"# HELP {name} {help_text}")
+                lines.append(f"# TYPE {name} {kind}")
+                for labels, value in sorted(self._counters.get(name, {}).items()):
+                    lines.append(f"{name}{{{_label_text(labels)}}} {value:g}")
+                for labels, histogram in sorted(self._histograms.get(name, {}).items()):
+                    for bound, count in histogram.cumulative():
+                        bucket_labels = _label_text(labels + (("le", bound),))
+                        lines.append(f"{name}_bucket{{{bucket_labels}}} {count}")
+                    lines.append(
+                        f"{name}_sum{{{_label_text(labels)}}} {histogram.sum:g}"
+                    )
+                    lines.append(
+                        f"{name}_count{{{_label_text(labels)}}} {histogram.count}"
+                    )
+        return "\n".join(lines) + "\n"
+
+    def records(self) -> list[dict]:
+        """One JSON-ready dict per series."""
+        records = []
+        with self._lock:
+            for name, series in sorted(self._counters.items()):
+                for labels, value in sorted(series.items()):
+                    records.append(
+                        {"metric": name, "labels": dict(labels), "value": value}
+                    )
+            for name, series in sorted(self._histograms.items()):
+                for labels, histogram in sorted(series.items()):
+                    records.append(
+                        {
+                            "metric": name,
+                            "labels": dict(labels),
+                            "buckets": dict(histogram.cumulative()),
+                            "sum": histogram.sum,
+                            "count": histogram.count,
+                        }
+                    )
+        return records
+
+
+def _walk(agent: BaseAgent, seen: set) -> Iterator[BaseAgent]:
+    if id(agent) in seen:
+        return
+    seen.add(id(agent))
+    yield agent
+    for sub_agent in agent.sub_agents:
+        yield from _walk(sub_agent, seen)
+    if isinstance(agent, LlmAgent):
+        for tool in agent.tools:
+            if isinstance(tool, AgentTool):
+                yield from _walk(tool.agent, seen)
+
+
+def _is_error(tool_response: Any) -> bool:
+    return isinstance(tool_response, dict) and tool_response.get("status") == "error"
+
+
+class Instrumentation:
+    """Model and tool callbacks that record metrics and spans.
+
+    Args:
+        metrics (Metrics, optional): Where to record; a new registry if
+            omitted.
+        max_spans (int): Finished spans kept in `spans`.
+
+    Attributes:
+        spans (deque[dict]): The most recent finished spans.
+    """
+
+    def __init__(self, metrics: Optional[Metrics] = None, max_spans: int = 1000):
+        self.metrics = metrics or Metrics()
+        self.spans: deque[dict] = deque(maxlen=max_spans)
+        # Start times of calls in flight. A model call whose before-callback
+        # short-circuits never finishes; its entry is replaced by the next.
+        self._models: dict[tuple[str, str], tuple[float, float, str]] = {}
+        self._tools: dict[str, tuple[float, float]] = {}
+        self._exporter: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+
+    def instrument(self, agent: BaseAgent) -> BaseAgent:
+        """Adds the callbacks to `agent` and every agent below it, once.
+
+        Returns:
+            BaseAgent: `agent`, for use in assignments.
+        """
+        callbacks = {
+            "before_model_callback": self.before_model,
+            "after_model_callback": self.after_model,
+            "on_model_error_callback": self.on_model_error,
+            "before_tool_callback": self.before_tool,
+            "after_tool_callback": self.after_tool,
+            "on_tool_error_callback": self.on_tool_error,
+        }
+        for node in _walk(agent, set()):
+            if not isinstance(node, LlmAgent):
+                continue
+            for field, callback in callbacks.items():
+                current = getattr(node, field)
+                if current is None:
+                    current = []
+                elif not isinstance(current, list):
+                    current = [current]
+                if callback not in current:
+                    setattr(node, field, [callback, *current])
+        return agent
+
+    def _finish(
+        self,
+        kind: str,
+        name: str,
+        agent: str,
+        invocation_id: str,
+        started: tuple[float, float],
+        error: Optional[str] = None,
+        **attributes,
+    ) -> None:
+        wall, perf = started
+        seconds = time.perf_counter() - perf
+        labels = {"agent": agent} if kind == "model" else {"agent": agent, "tool": name}
+        self.metrics.inc(f"adk_{kind}_calls_total", labels)
+        self.metrics.observe(f"adk_{kind}_latency_seconds", labels, seconds)
+        if error is not None:
+            self.metrics.inc(f"adk_{kind}_errors_total", labels)
+        span = {
+            "kind": kind,
+            "name": name,
+            "agent": agent,
+            "invocation_id": invocation_id,
+            "start": wall,
+            "duration_ms": seconds * 1000,
+            "status": "ok" if error is None else "error",
+            **({"error": error} if error is not None else {}),
+            **attributes,
+        }
+        self.spans.append(span)
+        span_logger.info(
+            "%s %s of %s: %.1f ms",
+            kind,
+            name,
+            agent,
+            seconds * 1000,
+            extra={"span": span},
+        )
+
+    def before_model(
+        self, callback_context: CallbackContext, llm_request: LlmRequest
+    ) -> None:
+        key = (callback_context.invocation_id, callback_context.agent_name)
+        self._models[key] = (time.time(), time.perf_counter(), llm_request.model or "")
+
+    def after_model(
+        self, callback_context: CallbackContext, llm_response: LlmResponse
+    ) -> None:
+        if llm_response.partial:
+            return None
+        key = (callback_context.invocation_id, callback_context.agent_name)
+        started = self._models.pop(key, None)
+        if started is None:
+            return None
+        *started, model = started
+        usage = llm_response.usage_metadata
+        tokens = {
+            "input": usage and usage.prompt_token_count or 0,
+            "output": usage and usage.candidates_token_count or 0,
+            "cached": usage and usage.cached_content_token_count or 0,
+        }
+        for kind, count in tokens.items():
+            if count:
+                self.metrics.inc(
+                    "adk_model_tokens_total",
+                    {"agent": callback_context.agent_name, "kind": kind},
+                    count,
+                )
+        self._finish(
+            "model",
+            model,
+            callback_context.agent_name,
+            callback_context.invocation_id,
+            tuple(started),
+            error=llm_response.error_code,
+            **{f"{kind}_tokens": count for kind, count in tokens.items()},
+        )
+        return None
+
+    def on_model_error(
+        self,
+        callback_context: CallbackContext,
+        llm_request: LlmRequest,
+        error: Exception,
+    ) -> None:
+        key = (callback_context.invocation_id, callback_context.agent_name)
+        started = self._models.pop(key, None)
+        if started is not None:
+            *started, model = started
+            self._finish(
+                "model",
+                model,
+                callback_context.agent_name,
+                callback_context.invocation_id,
+                tuple(started),
+                error=f"{type(error).__name__}: {error}",
+            )
+        return None
+
+    def before_tool(
+        self, tool: BaseTool, args: dict[str, Any], tool_context: ToolContext
+    ) -> None:
+        self._tools[tool_context.function_call_id] = (time.time(), time.perf_counter())
+
+    def after_tool(
+        self,
+        tool: BaseTool,
+        args: dict[str, Any],
+        tool_context: ToolContext,
+        tool_response: Any,
+    ) -> None:
+        started = self._tools.pop(tool_context.function_call_id, None)
+        if started is not None:
+            error = None
+            if _is_error(tool_response):
+                error = str(tool_response.get("error_message", "status: error"))
+            self._finish(
+                "tool",
+                tool.name,
+                tool_context.agent_name,
+                tool_context.invocation_id,
+                started,
+                error=error,
+            )
+        return None
+
+    def on_tool_error(
+        self,
+        tool: BaseTool,
+        args: dict[str, Any],
+        tool_context: ToolContext,
+        error: Exception,
+    ) -> None:
+        started = self._tools.pop(tool_context.function_call_id, None)
+        if started is not None:
+            self._finish(
+                "tool",
+                tool.name,
+                tool_context.agent_name,
+                tool_context.invocation_id,
+                started,
+                error=f"{type(error).__name__}: {error}",
+            )
+        return None
+
+    def prometheus_text(self) -> str:
+        return self.metrics.prometheus_text()
+
+    def metrics_records(self) -> list[dict]:
+        return self.metrics.records()
+
+    def report(self) -> str:
+        """Calls, error rate and mean latency per agent and tool."""
+        lines = [
+            f"{'agent':24} {'model/tool':22} {'calls':>6} {'errors':>7} {'mean':>9}"
+        ]
+        for record in self.metrics.records():
+            if "buckets" not in record:
+                continue
+            labels = record["labels"]
+            kind = record["metric"].split("_")[1]
+            errors = self.metrics.counter(f"adk_{kind}_errors_total", **labels)
+            lines.append(
+                f"{labels['agent']:24} {labels.get('tool', 'model'):22}"
+                f" {record['count']:>6} {errors / record['count']:>7.0%}"
+                f" {record['sum'] / record['count'] * 1000:>7.1f}ms"
+            )
+        return "\n".join(lines)
+
+    def write_metrics(self, directory: str) -> None:
+        """Replaces `metrics.prom` and appends a snapshot to `metrics.jsonl`
+        in `directory`."""
+        path = Path(directory)
+        path.mkdir(parents=True, exist_ok=True)
+        temporary = path / "metrics.prom.tmp"
+        temporary.write_text(self.prometheus_text(), encoding="utf-8")
+        # A reader sees the old file or the new one, never half of one.
+        os.replace(temporary, path / "metrics.prom")
+        snapshot = {"time": time.time(), "metrics": self.metrics_records()}
+        with open(path / "metrics.jsonl", "a", encoding="utf-8") as f:
+            f.write(json.dumps(snapshot) + "\n")
+
+    def start_export(self, directory: str, interval: float = 10.0) -> None:
+        """Writes the metrics to `directory` every `interval` seconds from a
+        background thread, and once more at `stop_export()` or exit."""
+        if self._exporter is not None:
+            return
+
+        def export() -> None:
+            while not self._stop.wait(interval):
+                try:
+                    self.write_metrics(directory)
+                except OSError:
+                    logger.exception("Could not write metrics to %s", directory)
+            self.write_metrics(directory)
+
+        self._stop.clear()
+        self._exporter = threading.Thread(
+            target=export, name="adk-metrics-export", daemon=True
+        )
+        self._exporter.start()
+        atexit.register(self.stop_export)
+
+    def stop_export(self) -> None:
+        if self._exporter is None:
+            return
+        self._stop.set()
+        self._exporter.join()
+        self._exporter = None
+
+
+# Attributes every LogRecord has; anything else came in through `extra`.
+_RECORD_FIELDS = set(vars(logging.makeLogRecord({}))) | {"message", "asctime"}
+
+
+class JsonFormatter(logging.Formatter):
+    """Formats a record as one JSON line, with its `extra` fields."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        data = {
+            "time": datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        data.update(
+            (key, value)
+            for key, value in vars(record).items()
+            if key not in _RECORD_FIELDS
+        )
+        if record.exc_info:
+            data["exception"] = self.formatException(record.exc_info)
+        return json.dumps(data, default=str, ensure_ascii=False)
+
+
+def start_logging(
+    path: Optional[str] = None,
+    level: int = logging.INFO,
+    loggers: Optional[list[str]] = None,
+) -> QueueListener:
+    """Sends all logging through a queue to a thread that writes JSON lines
+    to `path`, or to stderr. Logging calls only enqueue the record.
+
+    Args:
+        path (str, optional): File to append to; stderr if omitted.
+        level (int): Level to log at.
+        loggers (list[str], optional): Only these loggers (and their
+            children) log at `level`; the others stay at WARNING. All
+            loggers if omitted.
+
+    Returns:
+        QueueListener: The writer thread; it is stopped, and the queue
+            drained, at exit.
+    """
+    handler = (
+        logging.FileHandler(path, encoding="utf-8") if path else logging.StreamHandler()
+    )
+    handler.setFormatter(JsonFormatter())
+    records: queue.Queue = queue.Queue(-1)
+    listener = QueueListener(records, handler, respect_handler_level=True)
+    root = logging.getLogger()
+    root.addHandler(QueueHandler(records))
+    if loggers is None:
+        root.setLevel(level)
+    else:
+        root.setLevel(logging.WARNING)
+        for name in loggers:
+            logging.getLogger(name).setLevel(level)
+    listener.start()
+    atexit.register(listener.stop)
+    return listener
+
+
+default_instrumentation = Instrumentation()
+
+
+def instrument_from_env(agent: BaseAgent) -> BaseAgent:
+    """Instruments `agent` with `default_instrumentation` when
+    ADK_METRICS_DIR is set: structured logs and spans go to `log.jsonl` in
+    that directory, and metrics to `metrics.prom` and `metrics.jsonl` every
+    ADK_METRICS_INTERVAL seconds (10 by default)."""
+    directory = os.getenv("ADK_METRICS_DIR")
+    if not directory:
+        return agent
+    Path(directory).mkdir(parents=True, exist_ok=True)
+    if default_instrumentation._exporter is None:
+        start_logging(str(Path(directory) / "log.jsonl"))
+        default_instrumentation.start_export(
+            directory, float(os.getenv("ADK_METRICS_INTERVAL", "10"))
+        )
+    return default_instrumentation.instrument(agent)
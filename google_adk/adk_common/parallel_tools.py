@@ -0,0 +1,66 @@
+"""Concurrent execution of the function calls a model issues in one turn.
+
+ADK dispatches every function call of a model turn as its own task and merges
+the responses back in the original call order. A synchronous tool, however, runs
+on the event loop itself, so the calls still execute one after another.
+`concurrent_tools` offloads independent tools so their calls overlap, and
+serializes tools marked as stateful so they keep the model's call order.
+"""
+
+import asyncio
+import functools
+import inspect
+import weakref
+from typing import Any, Callable, Iterable
+
+from .tool_executor import ToolExecutor, default_executor
+
+
+def concurrent_tools(
+    *funcs: Callable[..., Any],
+    stateful: Iterable[Callable[..., Any]] = (),
+    sequential: bool = False,
+    executor: ToolExecutor = default_executor,
+) -> list[Callable[..., Any]]:
+    """Prepares tool functions so calls from the same turn run concurrently.
+
+    Args:
+        *funcs (Callable): Tool functions, sync or async.
+        stateful (Iterable[Callable]): Tools that read or write shared state.
+            Their calls run one at a time, in the order the model issued them.
+        sequential (bool): Treat every tool as stateful, i.e. restore strictly
+            sequential execution.
+        executor (ToolExecutor): Pool that synchronous tools are offloaded to.
+
+    Returns:
+        list: Tool functions to pass as an agent's `tools`.
+    """
+    stateful = set(stateful)
+    # One lock shared by all stateful tools of this agent, per event loop.
+    locks = weakref.WeakKeyDictionary()
+    tools = []
+    for func in funcs:
+        tool = func
+        if not inspect.iscoroutinefunction(func):
+            tool = executor.offload(func)
+        if sequential or func in stateful:
+            tool = _serialized(tool, locks)
+        tools.append(tool)
+    return tools
+
+
+def _serialized(
+    tool: Callable[..., Any], locks: "weakref.WeakKeyDictionary"
+) -> Callable[..., Any]:
+    @functools.wraps(tool)
+    async def wrapper(*args, **kwargs):
+        # asyncio.Lock wakes waiters first-in first-out, and ADK starts the calls
+        # of a turn in order, so the calls keep the model's order.
+        loop = asyncio.get_running_loop()
+        lock = locks.get(loop)
+        if lock is None:
+            lock = locks[loop] = asyncio.Lock()
+        async with lock:
+            return await tool(*args, **kwargs)
+
+    return wrapper
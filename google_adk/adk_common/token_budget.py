@@ -0,0 +1,265 @@
+"""Token budgets for tool outputs entering an ADK session's history.
+
+Every tool result becomes part of the conversation and is resent to the model
+on each later turn. `TokenBudget` measures tool outputs in the
+`after_tool_callback`, shrinks oversized results with a configurable strategy,
+charges them against per-agent and per-session budgets, and ends a turn early
+once a budget is spent. Usage is written to session state, so it shows up in
+the `state_delta` of the run's events.
+"""
+
+import json
+import logging
+import re
+from typing import Any, Callable, Optional
+
+from google.adk.agents.callback_context import CallbackContext
+from google.adk.models import LlmRequest, LlmResponse
+from google.adk.tools import BaseTool, ToolContext
+from google.genai import types
+
+logger = logging.getLogger(__name__)
+
+STATE_KEY = "token_budget"
+_NOTE_TOKENS = 30
+
+Summarizer = Callable[[str, int], str]
+
+
+def estimate_tokens(value: Any) -> int:
+    """Approximates the token count of a tool result at four characters per token."""
+    if not isinstance(value, str):
+        value = json.dumps(value, default=str, ensure_ascii=False)
+    return (len(value) + 3) // 4
+
+
+def extractive_summary(text: str, max_tokens: int) -> str:
+    """Keeps the leading sentence of each paragraph until `max_tokens` is used."""
+    leads = []
+    for paragraph in re.split(r"\n\s*\n", text):
+        sentence = re.split(r"(?<=[.!?])\s", paragraph.strip(), maxsplit=1)[0]
+        if sentence:
+            leads.append(sentence)
+    return _cut_text("\n".join(leads), max_tokens)
+
+
+def _cut_text(text: str, max_tokens: int) -> str:
+    max_chars = max_tokens * 4
+    if len(text) <= max_chars:
+        return text
+    return text[: max(0, max_chars - 3)] + "..."
+
+
+def _shrink(value: Any, max_tokens: int, strategy: str, summarizer: Summarizer):
+    """Shrinks a JSON-like value to roughly `max_tokens`, keeping its shape."""
+    if estimate_tokens(value) <= max_tokens:
+        return value
+    if isinstance(value, str):
+        if strategy == "summarize":
+            return summarizer(value, max_tokens)
+        if strategy == "sample":
+            half = max_tokens * 2
+            return value[:half] + " ... " + value[-half:]
+        return _cut_text(value, max_tokens)
+    if isinstance(value, list):
+        kept, used = [], 0
+        if strategy == "sample":
+            # Evenly spaced items, as many as fit on average.
+            per_item = max(1, estimate_tokens(value) // max(1, len(value)))
+            count = max(1, min(len(value), max_tokens // per_item))
+            step = len(value) / count
+            candidates = [value[int(i * step)] for i in range(count)]
+        else:
+            candidates = value
+        for item in candidates:
+            cost = estimate_tokens(item)
+            if used + cost > max_tokens:
+                if not kept:
+                    kept.append(_shrink(item, max_tokens, strategy, summarizer))
+                break
+            kept.append(item)
+            used += cost
+        return kept
+    if isinstance(value, dict):
+        # Share the budget between keys in proportion to their size.
+        total = max(1, estimate_tokens(value))
+        return {
+            key: _shrink(
+                item,
+                max(1, max_tokens * estimate_tokens(item) // total),
+                strategy,
+                summarizer,
+            )
+            for key, item in value.items()
+        }
+    return value
+
+
+class TokenBudget:
+    """Per-agent and per-session token budget for tool outputs.
+
+    Args:
+        max_tool_output_tokens (int): Largest single tool result allowed into
+            history; bigger results are shrunk to this size.
+        agent_budget (int, optional): Total tool-output tokens one agent may add
+            to a session.
+        session_budget (int, optional): Total tool-output tokens all agents may
+            add to a session.
+        strategy (str): How to shrink oversized results: "truncate" keeps the
+            head, "sample" keeps evenly spaced list items (or head and tail of
+            text), "summarize" passes text through `summarizer`.
+        summarizer (Callable, optional): `(text, max_tokens) -> str` used by the
+            "summarize" strategy. Defaults to `extractive_summary`.
+        counter (Callable, optional): Token counter for a tool result. Defaults
+            to `estimate_tokens`.
+    """
+
+    def __init__(
+        self,
+        max_tool_output_tokens: int = 2000,
+        agent_budget: Optional[int] = None,
+        session_budget: Optional[int] = None,
+        strategy: str = "truncate",
+        summarizer: Optional[Summarizer] = None,
+        counter: Optional[Callable[[Any], int]] = None,
+    ):
+        if strategy not in ("truncate", "sample", "summarize"):
+            raise ValueError(f"Unknown truncation strategy: {strategy}")
+        self.max_tool_output_tokens = max_tool_output_tokens
+        self.agent_budget = agent_budget
+        self.session_budget = session_budget
+        self.strategy = strategy
+        self.summarizer = summarizer or extractive_summary
+        self.counter = counter or estimate_tokens
+
+    def _remaining(self, usage: dict, agent_name: str) -> Optional[int]:
+        limits = []
+        if self.session_budget is not None:
+            limits.append(self.session_budget - usage["session_tokens"])
+        if self.agent_budget is not None:
+            limits.append(self.agent_budget - usage["agents"].get(agent_name, 0))
+        return min(limits) if limits else None
+
+    def _charge(self, state, agent_name: str, tokens: int, shrunk: bool) -> dict:
+        usage = _usage(state)
+        usage["session_tokens"] += tokens
+        usage["agents"][agent_name] = usage["agents"].get(agent_name, 0) + tokens
+        usage["truncated_results"] += int(shrunk)
+        # Assign a fresh dict so the change is recorded in the event's state delta.
+        state[STATE_KEY] = usage
+        return usage
+
+    def after_tool_callback(
+        self,
+        tool: BaseTool,
+        args: dict[str, Any],
+        tool_context: ToolContext,
+        tool_response: Any,
+    ) -> Optional[dict]:
+        """Measures a tool result and shrinks it to fit before it enters history."""
+        del args  # unused
+        agent_name = tool_context.agent_name
+        usage = _usage(tool_context.state)
+        limit = self.max_tool_output_tokens
+        remaining = self._remaining(usage, agent_name)
+        if remaining is not None:
+            limit = max(0, min(limit, remaining))
+
+        tokens = self.counter(tool_response)
+        if tokens <= limit:
+            self._charge(tool_context.state, agent_name, tokens, shrunk=False)
+            return None
+
+        if limit == 0:
+            shrunk = {
+                "status": "error",
+                "error_message": "Token budget exhausted; tool output dropped.",
+            }
+        else:
+            # Leave room for the "truncated" note added below.
+            target = max(1, limit - _NOTE_TOKENS)
+            shrunk = _shrink(tool_response, target, self.strategy, self.summarizer)
+            if not isinstance(shrunk, dict):
+                shrunk = {"result": shrunk}
+            shrunk = dict(shrunk)
+            shrunk["truncated"] = {
+                "strategy": self.strategy,
+                "original_tokens": tokens,
+                "kept_tokens": self.counter(shrunk),
+            }
+        logger.info(
+            "Tool %s output shrunk from %d to %d tokens (%s)",
+            tool.name,
+            tokens,
+            self.counter(shrunk),
+            self.strategy,
+        )
+        self._charge(tool_context.state, agent_name, self.counter(shrunk), shrunk=True)
+        return shrunk
+
+    def before_model_callback(
+        self, callback_context: CallbackContext, llm_request: LlmRequest
+    ) -> Optional[LlmResponse]:
+        """Ends the turn without calling the model once the budget is spent."""
+        del llm_request  # unused
+        usage = _usage(callback_context.state)
+        remaining = self._remaining(usage, callback_context.agent_name)
+        if remaining is None or remaining > 0:
+            return None
+        usage["exhausted"] = True
+        callback_context.state[STATE_KEY] = usage
+        logger.warning(
+            "Token budget exhausted for agent %s: %s",
+            callback_context.agent_name,
+            usage,
+        )
+        return LlmResponse(
+            content=types.Content(
+                role="model",
+                parts=[
+                    types.Part(
+                        text=(
+                            "I've reached the token budget for this session, so I'm"
+                            " stopping here. Please start a new session to continue."
+                        )
+                    )
+                ],
+            )
+        )
+
+    def trim_grounding(
+        self, callback_context: CallbackContext, llm_response: LlmResponse
+    ) -> Optional[LlmResponse]:
+        """Shrinks retrieved grounding text before it is rendered into the reply.
+
+        Use as an `after_model_callback` ahead of the callback that renders the
+        references, since the rendered text is what enters history.
+        """
+        metadata = llm_response.grounding_metadata
+        if not metadata or not metadata.grounding_chunks:
+            return None
+        per_chunk = self.max_tool_output_tokens // len(metadata.grounding_chunks)
+        tokens, shrunk = 0, False
+        for chunk in metadata.grounding_chunks:
+            context = chunk.retrieved_context
+            if context and context.text:
+                if self.counter(context.text) > per_chunk:
+                    context.text = _shrink(
+                        context.text, per_chunk, self.strategy, self.summarizer
+                    )
+                    shrunk = True
+                tokens += self.counter(context.text)
+        self._charge(
+            callback_context.state, callback_context.agent_name, tokens, shrunk
+        )
+        return None
+
+
+def _usage(state) -> dict:
+    usage = state.get(STATE_KEY) or {}
+    return {
+        "session_tokens": usage.get("session_tokens", 0),
+        "agents": dict(usage.get("agents", {})),
+        "truncated_results": usage.get("truncated_results", 0),
+        "exhausted": usage.get("exhausted", False),
+    }
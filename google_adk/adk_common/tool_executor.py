@@ -0,0 +1,231 @@
+"""Bounded thread/process pool offload for blocking ADK tools.
+
+ADK calls a synchronous tool function directly on the event loop, so a tool that
+blocks on the network or burns CPU stalls every session served by that loop.
+`ToolExecutor.offload` wraps such a function in an async tool that runs it in a
+bounded thread pool (or a process pool for CPU-heavy work), with a per-tool
+concurrency limit and a timeout that comes back as a structured tool error.
+"""
+
+import asyncio
+import functools
+import inspect
+import logging
+import os
+import threading
+import time
+import weakref
+from concurrent.futures import (
+    Executor,
+    Future,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+)
+from typing import Any, Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class ToolExecutor:
+    """Owns the worker pools that blocking tools are offloaded to.
+
+    Args:
+        max_threads (int): Size of the shared thread pool for blocking I/O tools.
+        max_processes (int, optional): Size of the process pool for CPU-bound
+            tools. Defaults to the number of CPUs.
+    """
+
+    def __init__(self, max_threads: int = 8, max_processes: Optional[int] = None):
+        self.max_threads = max_threads
+        self.max_processes = max_processes or os.cpu_count() or 1
+        self._thread_pool: Optional[ThreadPoolExecutor] = None
+        self._process_pool: Optional[ProcessPoolExecutor] = None
+        self._pool_lock = threading.Lock()
+        self._stats: dict[str, dict[str, float]] = {}
+
+    def _get_pool(self, cpu_bound: bool) -> Executor:
+        with self._pool_lock:
+            if cpu_bound:
+                if self._process_pool is None:
+                    self._process_pool = ProcessPoolExecutor(
+                        max_workers=self.max_processes
+                    )
+                return self._process_pool
+            if self._thread_pool is None:
+                self._thread_pool = ThreadPoolExecutor(
+                    max_workers=self.max_threads, thread_name_prefix="adk_tool"
+                )
+            return self._thread_pool
+
+    def offload(
+        self,
+        func: Callable[..., Any],
+        *,
+        cpu_bound: bool = False,
+        max_concurrency: Optional[int] = None,
+        timeout: Optional[float] = None,
+    ) -> Callable[..., Any]:
+        """Wraps a blocking tool function so it runs off the event loop.
+
+        The wrapper keeps the name, docstring and signature of `func`, so ADK
+        builds the same function declaration for the model. Pass the wrapper in
+        an agent's `tools` list instead of the original function; the original
+        stays importable by name, which the process pool needs to pickle it.
+
+        Args:
+            func (Callable): The synchronous tool function.
+            cpu_bound (bool): Run in the process pool instead of the thread pool.
+                The arguments and return value must be picklable and the
+                function must not take a `tool_context`.
+            max_concurrency (int, optional): Maximum number of concurrent calls of
+                this tool. Extra calls wait for a free slot.
+            timeout (float, optional): Seconds to wait for a slot plus the call
+                itself before returning a timeout error to the model.
+
+        Returns:
+            Callable: An async tool function.
+        """
+        if inspect.iscoroutinefunction(func):
+            raise TypeError(f"Tool '{func.__name__}' is already async.")
+        if cpu_bound and "tool_context" in inspect.signature(func).parameters:
+            raise TypeError(
+                f"Tool '{func.__name__}' takes a tool_context and cannot run in a"
+                " process pool."
+            )
+
+        name = func.__name__
+        stats = self._stats.setdefault(
+            name,
+            {"calls": 0, "timeouts": 0, "in_flight": 0, "max_queue_wait_s": 0.0},
+        )
+        # asyncio.Semaphore binds to the loop it is first used on, so keep one per
+        # loop (benchmarks and tests start a fresh loop per asyncio.run()).
+        semaphores = weakref.WeakKeyDictionary()
+
+        async def _run(loop: asyncio.AbstractEventLoop, call: Callable[[], Any]):
+            queued_at = time.perf_counter()
+            semaphore = None
+            if max_concurrency:
+                semaphore = semaphores.get(loop)
+                if semaphore is None:
+                    semaphore = semaphores[loop] = asyncio.Semaphore(max_concurrency)
+                await semaphore.acquire()
+            stats["max_queue_wait_s"] = max(
+                stats["max_queue_wait_s"], time.perf_counter() - queued_at
+            )
+            stats["in_flight"] += 1
+
+            def release() -> None:
+                stats["in_flight"] -= 1
+                if semaphore is not None:
+                    semaphore.release()
+
+            def on_done(_: Future) -> None:
+                # The slot is held until the worker itself is done, not just
+                # until the awaiting call gives up on it (timeout).
+                try:
+                    loop.call_soon_threadsafe(release)
+                except RuntimeError:  # The loop is already closed.
+                    pass
+
+            try:
+                future = self._get_pool(cpu_bound).submit(call)
+            except BaseException:
+                release()
+                raise
+            future.add_done_callback(on_done)
+            return await asyncio.wrap_future(future, loop=loop)
+
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            loop = asyncio.get_running_loop()
+            stats["calls"] += 1
+            call = functools.partial(func, *args, **kwargs)
+            try:
+                return await asyncio.wait_for(_run(loop, call), timeout)
+            except asyncio.TimeoutError:
+                # The worker cannot be interrupted; it finishes in the background
+                # and its result is discarded.
+                stats["timeouts"] += 1
+                logger.warning("Tool %s timed out after %.1fs", name, timeout)
+                return {
+                    "status": "error",
+                    "error_type": "timeout",
+                    "error_message": (
+                        f"Tool '{name}' did not finish within {timeout:g} seconds."
+                    ),
+                }
+
+        return wrapper
+
+    def stats(self) -> dict[str, dict[str, float]]:
+        """Returns per-tool call, timeout, in-flight and queue-wait counters."""
+        return {name: dict(values) for name, values in self._stats.items()}
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Shuts down the worker pools."""
+        with self._pool_lock:
+            for pool in (self._thread_pool, self._process_pool):
+                if pool is not None:
+                    pool.shutdown(wait=wait)
+            self._thread_pool = None
+            self._process_pool = None
+
+
+class EventLoopLagMonitor:
+    """Measures how late the event loop wakes up a periodic timer.
+
+    A healthy loop wakes the timer within a fraction of a millisecond; a tool
+    blocking the loop shows up directly as lag. Use as an async context manager
+    around the workload, then read `summary()`.
+
+    Args:
+        interval (float): Seconds between samples.
+    """
+
+    def __init__(self, interval: float = 0.005):
+        self.interval = interval
+        self.samples: list[float] = []
+        self._task: Optional[asyncio.Task] = None
+
+    async def _sample(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            started = loop.time()
+            await asyncio.sleep(self.interval)
+            self.samples.append(max(0.0, loop.time() - started - self.interval))
+
+    async def __aenter__(self) -> "EventLoopLagMonitor":
+        self.samples.clear()
+        self._task = asyncio.create_task(self._sample())
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+
+    def summary(self) -> dict[str, float]:
+        """Returns lag percentiles in milliseconds."""
+        if not self.samples:
+            return {"samples": 0, "mean_ms": 0.0, "p50_ms": 0.0, "p99_ms": 0.0}
+        ordered = sorted(self.samples)
+
+        def pct(q: float) -> float:
+            return round(
+                ordered[min(len(ordered) - 1, int(q * len(ordered)))] * 1000, 3
+            )
+
+        return {
+            "samples": len(ordered),
+            "mean_ms": round(sum(ordered) / len(ordered) * 1000, 3),
+            "p50_ms": pct(0.50),
+            "p99_ms": pct(0.99),
+            "max_ms": round(ordered[-1] * 1000, 3),
+        }
+
+
+# Shared executor for the agents in this directory.
+default_executor = ToolExecutor()
@@ -1,5 +1,16 @@
-from google.adk.agents import SequentialAgent
+import os
+from typing import Optional
 
+from adk_common.instrumentation import instrument_from_env
+from google.adk.agents import ParallelAgent, SequentialAgent
+from google.adk.models import BaseLlm
+
+from .sub_agents.claim_extractor import build_claim_extractor_agent
+from .sub_agents.claim_verifier import (
+    ClaimBatcher,
+    CriticMerger,
+    build_claim_verifier_agent,
+)
 from .sub_agents.critic import critic_agent
 from .sub_agents.reviser import reviser_agent
 
@@ -13,4 +24,54 @@ llm_auditor = SequentialAgent(
     sub_agents=[critic_agent, reviser_agent],
 )
 
-root_agent = llm_auditor
+
+def build_parallel_auditor(
+    model: Optional[BaseLlm] = None,
+    max_concurrency: int = 4,
+    tools: Optional[list] = None,
+) -> SequentialAgent:
+    """Builds the auditor that verifies claims concurrently.
+
+    The critic's single long generation is split into claim extraction, a
+    fan-out of `max_concurrency` verifiers that each check a share of the
+    claims, and a merge step that produces the critic's findings format for
+    the reviser.
+
+    Args:
+        model (BaseLlm, optional): Model for every LLM step. Defaults to each
+            sub-agent's own Claude model.
+        max_concurrency (int): Number of verifiers running at the same time.
+        tools (list, optional): Search tools for the verifiers. Defaults to the
+            backend selected by FACT_CHECKER_SEARCH.
+    """
+    reviser = reviser_agent.clone({"model": model} if model else None)
+    return SequentialAgent(
+        name="llm_auditor_parallel",
+        description=llm_auditor.description,
+        sub_agents=[
+            build_claim_extractor_agent(model),
+            ClaimBatcher(name="claim_batcher", slots=max_concurrency),
+            ParallelAgent(
+                name="claim_verification",
+                sub_agents=[
+                    build_claim_verifier_agent(index, model, tools)
+                    for index in range(max_concurrency)
+                ],
+            ),
+            CriticMerger(name="critic_merger", slots=max_concurrency),
+            reviser,
+        ],
+    )
+
+
+llm_auditor_parallel = build_parallel_auditor()
+
+# FACT_CHECKER_PIPELINE=parallel serves the fan-out pipeline instead.
+root_agent = (
+    llm_auditor_parallel
+    if os.getenv("FACT_CHECKER_PIPELINE") == "parallel"
+    else llm_auditor
+)
+# With ADK_METRICS_DIR set, every model and tool call of the pipeline is
+# measured and exported there.
+instrument_from_env(root_agent)
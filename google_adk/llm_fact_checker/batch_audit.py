@@ -0,0 +1,265 @@
+"""Runs the fact checker over a JSONL file of question/answer pairs.
+
+Each input line is a JSON object with "question" and "answer" and an optional
+"id" (the line number otherwise). Items run with bounded concurrency, each in
+its own session. A result line is appended to the output as soon as an item
+finishes, and the item's ID then goes to the checkpoint file, so an
+interrupted run resumes where it stopped. Failed items are written with their
+error but not checkpointed, so the next run retries them; on resume, the
+output is first compacted to one line per checkpointed ID, so retried items do
+not leave their earlier error lines behind.
+
+Usage (from the google_adk directory):
+    python -m llm_fact_checker.batch_audit qa.jsonl audited.jsonl --concurrency 8
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import math
+import re
+import time
+import uuid
+from collections import Counter
+from pathlib import Path
+from typing import Iterator, Optional
+
+from google.adk.agents import BaseAgent
+from google.adk.runners import InMemoryRunner
+from google.genai import types
+
+from .verdicts import STATE_KEY
+
+logger = logging.getLogger(__name__)
+
+APP_NAME = "llm_fact_checker_batch"
+USER_ID = "batch_audit"
+
+_OVERALL_RE = re.compile(r"Overall verdict:\s*\**\s*([A-Za-z ]+)")
+
+
+def read_items(path: Path, done: set[str]) -> Iterator[dict]:
+    """Yields the input items whose IDs are not in `done`."""
+    with path.open() as lines:
+        for number, line in enumerate(lines, start=1):
+            if not line.strip():
+                continue
+            item = json.loads(line)
+            item["id"] = str(item.get("id", number))
+            if item["id"] not in done:
+                yield item
+
+
+def read_checkpoint(path: Path) -> set[str]:
+    """The completed IDs of `path`. An ID without its newline was torn by a
+    crash; it is dropped from the file, so the item runs again."""
+    if not path.exists():
+        return set()
+    text = path.read_text()
+    lines = text.split("\n")
+    if lines[-1].strip():
+        logger.warning("Dropping torn checkpoint line %r", lines[-1])
+        path.write_text(text[: len(text) - len(lines[-1])])
+    return {line.strip() for line in lines[:-1] if line.strip()}
+
+
+def compact_output(path: Path, done: set[str]) -> None:
+    """Rewrites `path` with only the last result line of each ID in `done`.
+
+    Drops the error lines of items that are about to be retried, and results
+    written by a run that stopped before checkpointing them.
+    """
+    if not path.exists():
+        return
+    results: dict[str, str] = {}
+    with path.open() as lines:
+        for line in lines:
+            if not line.strip():
+                continue
+            try:
+                item_id = str(json.loads(line).get("id"))
+            except (json.JSONDecodeError, AttributeError):
+                # Most likely the last line, torn by a crash mid-write.
+                logger.warning("Dropping unreadable output line %r", line[:80])
+                continue
+            if item_id in done:
+                results.pop(item_id, None)
+                results[item_id] = line if line.endswith("\n") else line + "\n"
+    compacted = path.with_name(path.name + ".tmp")
+    compacted.write_text("".join(results.values()))
+    compacted.replace(path)
+
+
+def percentile(values: list[float], pct: float) -> Optional[float]:
+    """Nearest-rank percentile of `values`."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = max(0, min(len(ordered) - 1, math.ceil(pct / 100 * len(ordered)) - 1))
+    return ordered[rank]
+
+
+async def audit_item(runner: InMemoryRunner, item: dict) -> dict:
+    """Runs one item in a fresh session and returns its result line."""
+    session_id = f"{item['id']}-{uuid.uuid4().hex[:8]}"
+    await runner.session_service.create_session(
+        app_name=APP_NAME, user_id=USER_ID, session_id=session_id
+    )
+    message = types.Content(
+        role="user",
+        parts=[
+            types.Part(text=f"Question: {item['question']}\nAnswer: {item['answer']}")
+        ],
+    )
+    texts: dict[str, str] = {}
+    try:
+        async for event in runner.run_async(
+            user_id=USER_ID, session_id=session_id, new_message=message
+        ):
+            if event.is_final_response() and event.content and event.content.parts:
+                texts[event.author] = "".join(
+                    part.text for part in event.content.parts if part.text
+                )
+        session = await runner.session_service.get_session(
+            app_name=APP_NAME, user_id=USER_ID, session_id=session_id
+        )
+        state = session.state if session else {}
+    finally:
+        await runner.session_service.delete_session(
+            app_name=APP_NAME, user_id=USER_ID, session_id=session_id
+        )
+
+    verdicts = state.get(STATE_KEY) or {}
+    verdict = verdicts.get("overall_verdict")
+    if not verdict:
+        match = _OVERALL_RE.search("\n".join(texts.values()))
+        verdict = match.group(1).strip().title() if match else None
+    revised = list(texts.values())[-1] if texts else ""
+    return {
+        "id": item["id"],
+        "verdict": verdict,
+        "claims": verdicts.get("claims"),
+        "revised_answer": revised.strip(),
+    }
+
+
+async def run_batch(
+    agent: BaseAgent,
+    input_path: Path,
+    output_path: Path,
+    concurrency: int = 4,
+    checkpoint_path: Optional[Path] = None,
+    timeout: Optional[float] = None,
+) -> dict:
+    """Audits every pending item of `input_path` and returns the run report.
+
+    Args:
+        agent (BaseAgent): The auditor to run, usually `root_agent`.
+        input_path (Path): JSONL file of question/answer items.
+        output_path (Path): JSONL file the results are appended to.
+        concurrency (int): Number of items audited at the same time.
+        checkpoint_path (Path, optional): File of completed IDs. Defaults to
+            the output path with a ".checkpoint" suffix.
+        timeout (float, optional): Seconds after which an item is failed.
+
+    Returns:
+        dict: Counts, throughput, latency percentiles and verdict distribution.
+    """
+    checkpoint_path = checkpoint_path or output_path.with_suffix(".checkpoint")
+    done = read_checkpoint(checkpoint_path)
+    if done:
+        logger.info("Resuming: skipping %d completed items", len(done))
+    if checkpoint_path.exists():
+        # The output belongs to an earlier run of this checkpoint.
+        compact_output(output_path, done)
+
+    runner = InMemoryRunner(agent=agent, app_name=APP_NAME)
+    queue: asyncio.Queue = asyncio.Queue(maxsize=concurrency * 2)
+    latencies: list[float] = []
+    verdicts: Counter = Counter()
+    failed = 0
+
+    with output_path.open("a") as output, checkpoint_path.open("a") as checkpoint:
+
+        async def worker() -> None:
+            nonlocal failed
+            while (item := await queue.get()) is not None:
+                started = time.perf_counter()
+                try:
+                    result = await asyncio.wait_for(
+                        audit_item(runner, item), timeout=timeout
+                    )
+                except Exception as e:  # pylint: disable=broad-except
+                    logger.warning("Item %s failed: %r", item["id"], e)
+                    result = {"id": item["id"], "error": repr(e)}
+                result["latency_s"] = round(time.perf_counter() - started, 3)
+                output.write(json.dumps(result) + "\n")
+                output.flush()
+                if "error" in result:
+                    failed += 1
+                    continue
+                # Only checkpoint once the result is on disk.
+                checkpoint.write(item["id"] + "\n")
+                checkpoint.flush()
+                latencies.append(result["latency_s"])
+                verdicts[result["verdict"] or "Unknown"] += 1
+
+        started = time.perf_counter()
+        workers = [asyncio.create_task(worker()) for _ in range(concurrency)]
+        for item in read_items(input_path, done):
+            await queue.put(item)
+        for _ in workers:
+            await queue.put(None)
+        await asyncio.gather(*workers)
+        elapsed = time.perf_counter() - started
+
+    return {
+        "completed": len(latencies),
+        "failed": failed,
+        "skipped": len(done),
+        "seconds": round(elapsed, 3),
+        "items_per_second": round(len(latencies) / elapsed, 3) if elapsed else None,
+        "latency_s": {f"p{pct}": percentile(latencies, pct) for pct in (50, 90, 99)},
+        "verdicts": dict(verdicts.most_common()),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("input", type=Path, help="JSONL file of QA pairs")
+    parser.add_argument("output", type=Path, help="JSONL file for the results")
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--checkpoint", type=Path, default=None)
+    parser.add_argument("--timeout", type=float, default=None)
+    parser.add_argument(
+        "--pipeline",
+        choices=("root", "sequential", "parallel"),
+        default="root",
+        help="Auditor to run; 'root' follows FACT_CHECKER_PIPELINE",
+    )
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s %(message)s")
+
+    from . import agent
+
+    auditor = {
+        "root": agent.root_agent,
+        "sequential": agent.llm_auditor,
+        "parallel": agent.llm_auditor_parallel,
+    }[args.pipeline]
+    report = asyncio.run(
+        run_batch(
+            auditor,
+            args.input,
+            args.output,
+            concurrency=args.concurrency,
+            checkpoint_path=args.checkpoint,
+            timeout=args.timeout,
+        )
+    )
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
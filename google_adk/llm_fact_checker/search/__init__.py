@@ -0,0 +1,5 @@
+from .backends import BM25Backend, GoogleCustomSearchBackend, SearchBackend
+from .service import SearchService, search_service_from_env
+
+# Shared by the critic and the claim verifiers, so they share one cache.
+search_service = search_service_from_env()
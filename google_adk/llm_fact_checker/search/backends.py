@@ -0,0 +1,147 @@
+"""Search backends for the fact checker: Google Custom Search and local BM25."""
+
+import json
+import math
+import os
+import re
+import urllib.parse
+import urllib.request
+from collections import Counter, defaultdict
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Optional
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+_STOP_WORDS = frozenset(
+    "a an and are as at be by for from has have he her his in is it its of on or"
+    " she that the their they this to was were what when where which who why"
+    " will with".split()
+)
+
+
+@dataclass
+class SearchResult:
+    """One search hit, shaped like a grounding chunk's retrieved context."""
+
+    title: str
+    uri: str
+    text: str
+    score: float = 0.0
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+
+class SearchBackend:
+    """Interface of a search backend."""
+
+    name = "base"
+
+    def search(self, query: str, k: int = 5) -> list[SearchResult]:
+        """Returns up to `k` results for `query`, best first."""
+        raise NotImplementedError
+
+
+def tokenize(text: str) -> list[str]:
+    """Lowercases `text` and splits it into terms, dropping stop words."""
+    return [t for t in _TOKEN_RE.findall(text.lower()) if t not in _STOP_WORDS]
+
+
+class BM25Backend(SearchBackend):
+    """Offline BM25 search over a JSONL corpus of {title, uri, text} documents.
+
+    Args:
+        corpus_path (str | Path): JSONL file with one document per line.
+        k1 (float): Term-frequency saturation.
+        b (float): Document-length normalization.
+    """
+
+    name = "bm25"
+
+    def __init__(self, corpus_path, k1: float = 1.5, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self.documents: list[dict] = []
+        with open(corpus_path, encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    self.documents.append(json.loads(line))
+
+        # Inverted index: term -> [(document index, term frequency)].
+        self._postings: dict[str, list[tuple[int, int]]] = defaultdict(list)
+        self._lengths: list[int] = []
+        for doc_id, doc in enumerate(self.documents):
+            terms = tokenize(f"{doc.get('title', '')} {doc.get('text', '')}")
+            self._lengths.append(len(terms))
+            for term, freq in Counter(terms).items():
+                self._postings[term].append((doc_id, freq))
+        self._avg_length = sum(self._lengths) / max(1, len(self._lengths))
+
+    def search(self, query: str, k: int = 5) -> list[SearchResult]:
+        scores: dict[int, float] = defaultdict(float)
+        n_docs = len(self.documents)
+        for term in set(tokenize(query)):
+            postings = self._postings.get(term)
+            if not postings:
+                continue
+            idf = math.log(1 + (n_docs - len(postings) + 0.5) / (len(postings) + 0.5))
+            for doc_id, freq in postings:
+                norm = self.k1 * (
+                    1 - self.b + self.b * self._lengths[doc_id] / self._avg_length
+                )
+                scores[doc_id] += idf * freq * (self.k1 + 1) / (freq + norm)
+        best = sorted(scores.items(), key=lambda item: item[1], reverse=True)[:k]
+        return [
+            SearchResult(
+                title=self.documents[doc_id].get("title", ""),
+                uri=self.documents[doc_id].get("uri", ""),
+                text=self.documents[doc_id].get("text", ""),
+                score=round(score, 4),
+            )
+            for doc_id, score in best
+        ]
+
+
+class GoogleCustomSearchBackend(SearchBackend):
+    """Web search through the Google Custom Search JSON API.
+
+    Args:
+        api_key (str, optional): Defaults to the GOOGLE_API_KEY env variable.
+        engine_id (str, optional): Defaults to the GOOGLE_CSE_ID env variable.
+        timeout (float): HTTP timeout in seconds.
+    """
+
+    name = "google_cse"
+    _URL = "https://www.googleapis.com/customsearch/v1"
+
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        engine_id: Optional[str] = None,
+        timeout: float = 10.0,
+    ):
+        self.api_key = api_key or os.getenv("GOOGLE_API_KEY")
+        self.engine_id = engine_id or os.getenv("GOOGLE_CSE_ID")
+        self.timeout = timeout
+        if not self.api_key or not self.engine_id:
+            raise ValueError("GOOGLE_API_KEY and GOOGLE_CSE_ID must be set.")
+
+    def search(self, query: str, k: int = 5) -> list[SearchResult]:
+        params = urllib.parse.urlencode(
+            {"key": self.api_key, "cx": self.engine_id, "q": query, "num": min(k, 10)}
+        )
+        with urllib.request.urlopen(
+            f"{self._URL}?{params}", timeout=self.timeout
+        ) as response:
+            payload = json.load(response)
+        return [
+            SearchResult(
+                title=item.get("title", ""),
+                uri=item.get("link", ""),
+                text=item.get("snippet", ""),
+            )
+            for item in payload.get("items", [])[:k]
+        ]
+
+
+DEFAULT_CORPUS = Path(__file__).with_name("corpus.jsonl")
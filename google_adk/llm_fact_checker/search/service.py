@@ -0,0 +1,193 @@
+"""Cached, de-duplicated search exposed to the fact checker as an ADK tool."""
+
+import asyncio
+import logging
+import os
+import re
+import time
+from collections import OrderedDict
+from typing import Optional
+
+from google.adk.agents.callback_context import CallbackContext
+from google.adk.models import LlmResponse
+from google.adk.tools import ToolContext
+from google.genai import types
+
+from .backends import (
+    DEFAULT_CORPUS,
+    BM25Backend,
+    GoogleCustomSearchBackend,
+    SearchBackend,
+    SearchResult,
+)
+
+logger = logging.getLogger(__name__)
+
+_REFERENCES_KEY = "temp:search_references:"
+
+
+def normalize_query(query: str) -> str:
+    """Lowercases, strips punctuation and collapses whitespace."""
+    return " ".join(re.sub(r"[^\w\s]", " ", query.lower()).split())
+
+
+class SearchService:
+    """Search with a query cache shared across audits and per-audit de-duplication.
+
+    Identical (normalized) queries issued during one audit, including concurrent
+    ones from parallel verifiers, hit the backend once. Results are cached
+    across audits for `ttl` seconds.
+
+    Args:
+        backend (SearchBackend): Where queries are sent.
+        ttl (float): Seconds a cached result stays valid.
+        max_entries (int): Cache size; least recently used entries go first.
+        k (int): Results returned per query.
+    """
+
+    def __init__(
+        self,
+        backend: SearchBackend,
+        ttl: float = 6 * 3600,
+        max_entries: int = 2048,
+        k: int = 5,
+    ):
+        self.backend = backend
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.k = k
+        self._cache: OrderedDict[str, tuple[float, list[SearchResult]]] = OrderedDict()
+        # audit id -> normalized query -> future, for the most recent audits.
+        self._audits: OrderedDict[str, dict[str, asyncio.Future]] = OrderedDict()
+        self.stats = {"backend_calls": 0, "cache_hits": 0, "deduplicated": 0}
+
+    async def search(
+        self, query: str, audit_id: Optional[str] = None
+    ) -> list[SearchResult]:
+        """Returns results for `query`, reusing cached or in-flight lookups."""
+        key = normalize_query(query)
+        cached = self._cache.get(key)
+        if cached and time.monotonic() - cached[0] < self.ttl:
+            self._cache.move_to_end(key)
+            self.stats["cache_hits"] += 1
+            return cached[1]
+
+        audit = self._audit(audit_id)
+        if key in audit:
+            self.stats["deduplicated"] += 1
+            return await asyncio.shield(audit[key])
+
+        future = asyncio.get_running_loop().create_future()
+        audit[key] = future
+        try:
+            self.stats["backend_calls"] += 1
+            results = await asyncio.to_thread(self.backend.search, query, self.k)
+        except Exception as e:
+            audit.pop(key, None)
+            future.set_exception(e)
+            # Mark the exception as retrieved when nobody else was waiting.
+            future.exception()
+            raise
+        future.set_result(results)
+        self._cache[key] = (time.monotonic(), results)
+        if len(self._cache) > self.max_entries:
+            self._cache.popitem(last=False)
+        return results
+
+    def _audit(self, audit_id: Optional[str]) -> dict[str, asyncio.Future]:
+        if audit_id is None:
+            return {}
+        if audit_id not in self._audits:
+            self._audits[audit_id] = {}
+            if len(self._audits) > 64:
+                self._audits.popitem(last=False)
+        return self._audits[audit_id]
+
+    async def search_web(self, query: str, tool_context: ToolContext) -> dict:
+        """Searches for evidence that supports or contradicts a claim.
+
+        Args:
+            query (str): The search query, e.g. the claim rephrased as a question.
+
+        Returns:
+            dict: status and a numbered list of results with title, uri and text.
+        """
+        try:
+            results = await self.search(query, audit_id=tool_context.invocation_id)
+        except Exception as e:
+            logger.warning("Search for %r failed: %s", query, e)
+            return {"status": "error", "error_message": f"Search failed: {e}"}
+
+        # Collect this agent's references so the final reply can cite them.
+        key = _REFERENCES_KEY + tool_context.agent_name
+        references = tool_context.state.get(key) or {}
+        if references.get("invocation_id") != tool_context.invocation_id:
+            references = {"invocation_id": tool_context.invocation_id, "results": []}
+        known = {r["uri"] for r in references["results"]}
+        numbered = []
+        for result in results:
+            if result.uri not in known:
+                known.add(result.uri)
+                references["results"].append(result.to_dict())
+            index = next(
+                i
+                for i, r in enumerate(references["results"], start=1)
+                if r["uri"] == result.uri
+            )
+            numbered.append({"index": index, **result.to_dict()})
+        tool_context.state[key] = {
+            "invocation_id": references["invocation_id"],
+            "results": list(references["results"]),
+        }
+        return {"status": "success", "results": numbered}
+
+    def attach_references(
+        self, callback_context: CallbackContext, llm_response: LlmResponse
+    ) -> Optional[LlmResponse]:
+        """Maps the turn's search results into grounding metadata.
+
+        The critic's `_render_reference` callback renders grounding chunks as a
+        reference list, so results found through this service show up the same
+        way as built-in Google Search grounding.
+        """
+        content = llm_response.content
+        if not content or not content.parts or llm_response.grounding_metadata:
+            return None
+        if any(part.function_call for part in content.parts):
+            return None
+        key = _REFERENCES_KEY + callback_context.agent_name
+        references = callback_context.state.get(key) or {}
+        if references.get("invocation_id") != callback_context.invocation_id:
+            return None
+        llm_response.grounding_metadata = types.GroundingMetadata(
+            grounding_chunks=[
+                types.GroundingChunk(
+                    retrieved_context=types.GroundingChunkRetrievedContext(
+                        title=r["title"], uri=r["uri"], text=r["text"]
+                    )
+                )
+                for r in references["results"]
+            ]
+        )
+        callback_context.state[key] = {}
+        return None
+
+
+def search_service_from_env() -> Optional[SearchService]:
+    """Builds the service selected by FACT_CHECKER_SEARCH.
+
+    "bm25" searches the local corpus in FACT_CHECKER_CORPUS (defaults to the
+    bundled sample corpus), "google_cse" uses the Custom Search JSON API. Unset
+    or "google" returns None, meaning the built-in `google_search` grounding
+    tool, which runs inside the model and cannot be cached.
+    """
+    backend_name = os.getenv("FACT_CHECKER_SEARCH", "google")
+    ttl = float(os.getenv("FACT_CHECKER_SEARCH_TTL", 6 * 3600))
+    if backend_name == "bm25":
+        corpus = os.getenv("FACT_CHECKER_CORPUS", str(DEFAULT_CORPUS))
+        return SearchService(BM25Backend(corpus), ttl=ttl)
+    if backend_name == "google_cse":
+        return SearchService(GoogleCustomSearchBackend(), ttl=ttl)
+    if backend_name != "google":
+        raise ValueError(f"Unknown FACT_CHECKER_SEARCH backend: {backend_name}")
+    return None
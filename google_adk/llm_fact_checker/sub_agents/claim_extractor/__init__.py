@@ -0,0 +1 @@
+from .agent import build_claim_extractor_agent
@@ -0,0 +1,21 @@
+"""Claim extractor agent for splitting an answer into verifiable claims."""
+
+from typing import Optional
+
+from google.adk import Agent
+from google.adk.models import BaseLlm
+from google.adk.models.lite_llm import LiteLlm
+
+from . import prompt
+
+MODEL_CLAUDE_SONNET = "anthropic/claude-3-sonnet-20240229"
+
+
+def build_claim_extractor_agent(model: Optional[BaseLlm] = None) -> Agent:
+    """Creates the agent that lists the answer's claims as JSON in state."""
+    return Agent(
+        model=model or LiteLlm(model=MODEL_CLAUDE_SONNET),
+        name="claim_extractor_agent",
+        instruction=prompt.CLAIM_EXTRACTOR_PROMPT,
+        output_key="extracted_claims",
+    )
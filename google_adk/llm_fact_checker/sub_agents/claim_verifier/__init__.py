@@ -0,0 +1 @@
+from .agent import ClaimBatcher, CriticMerger, build_claim_verifier_agent
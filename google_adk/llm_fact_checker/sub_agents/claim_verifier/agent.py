@@ -0,0 +1,199 @@
+"""Fan-out verification of extracted claims and merging of the findings.
+
+`ClaimBatcher` spreads the extracted claims over a fixed number of verifier
+slots, the verifiers run side by side under a `ParallelAgent`, and
+`CriticMerger` stitches their findings back into the critic's output format so
+the reviser does not need to know which pipeline produced them.
+"""
+
+import json
+import re
+from typing import AsyncGenerator, Optional
+
+from google.adk import Agent
+from google.adk.agents import BaseAgent
+from google.adk.agents.callback_context import CallbackContext
+from google.adk.agents.invocation_context import InvocationContext
+from google.adk.events import Event, EventActions
+from google.adk.models import BaseLlm
+from google.adk.models.lite_llm import LiteLlm
+from google.adk.tools import google_search
+from google.genai import types
+
+from ...search import search_service
+from ...verdicts import FLAGGED_VERDICTS, STATE_KEY
+from . import prompt
+
+MODEL_CLAUDE_SONNET = "anthropic/claude-3-sonnet-20240229"
+
+_VERDICTS = ("Inaccurate", "Disputed", "Unsupported", "Accurate", "Not Applicable")
+_VERDICT_RE = re.compile(r"Verdict:\s*\**\s*(" + "|".join(_VERDICTS) + ")", re.I)
+_CLAIM_RE = re.compile(r"Claim\s+\d+:\s*\**\s*(.+)")
+_JUSTIFICATION_RE = re.compile(r"Justification:\s*\**\s*(.+)")
+
+
+def _batch_key(index: int) -> str:
+    return f"claim_batch_{index}"
+
+
+def _verdicts_key(index: int) -> str:
+    return f"claim_verdicts_{index}"
+
+
+def parse_claims(text: str) -> list[dict]:
+    """Parses the extractor's JSON array, tolerating Markdown code fences."""
+    match = re.search(r"\[.*\]", text or "", re.S)
+    if not match:
+        return []
+    try:
+        claims = json.loads(match.group(0))
+    except json.JSONDecodeError:
+        return []
+    return [
+        claim if isinstance(claim, dict) else {"claim": str(claim)}
+        for claim in claims
+        if claim
+    ]
+
+
+def _skip_empty_batch(callback_context: CallbackContext) -> Optional[types.Content]:
+    """Skips a verifier slot that received no claims."""
+    agent_name = callback_context.agent_name
+    index = int(agent_name.rsplit("_", 1)[1])
+    if callback_context.state.get(_batch_key(index)):
+        return None
+    return types.Content(role="model", parts=[])
+
+
+def _default_tools() -> list:
+    return [search_service.search_web] if search_service else [google_search]
+
+
+def build_claim_verifier_agent(
+    index: int, model: Optional[BaseLlm] = None, tools: Optional[list] = None
+) -> Agent:
+    """Creates the verifier for slot `index` of the fan-out."""
+    return Agent(
+        model=model or LiteLlm(model=MODEL_CLAUDE_SONNET),
+        name=f"claim_verifier_{index}",
+        instruction=(
+            prompt.CLAIM_VERIFIER_PROMPT
+            + "\n{qa_pair}\n\n# Claims to verify\n\n{"
+            + _batch_key(index)
+            + "}\n"
+        ),
+        tools=tools if tools is not None else _default_tools(),
+        # The question, answer and claims all come from state.
+        include_contents="none",
+        output_key=_verdicts_key(index),
+        before_agent_callback=_skip_empty_batch,
+    )
+
+
+class ClaimBatcher(BaseAgent):
+    """Spreads the extracted claims round-robin over the verifier slots."""
+
+    slots: int
+
+    async def _run_async_impl(
+        self, ctx: InvocationContext
+    ) -> AsyncGenerator[Event, None]:
+        claims = parse_claims(ctx.session.state.get("extracted_claims", ""))
+        batches = [[] for _ in range(self.slots)]
+        for number, claim in enumerate(claims, start=1):
+            line = f"  * Claim {number}: {claim.get('claim', '')}"
+            if claim.get("answer_part"):
+                line += f"\n      * Answer part: {claim['answer_part']}"
+            batches[(number - 1) % self.slots].append(line)
+
+        qa_pair = ""
+        if ctx.user_content and ctx.user_content.parts:
+            qa_pair = "\n".join(p.text for p in ctx.user_content.parts if p.text)
+
+        state_delta = {"qa_pair": qa_pair, "claim_count": len(claims)}
+        for index, batch in enumerate(batches):
+            state_delta[_batch_key(index)] = "\n".join(batch)
+            # Clear findings from an earlier turn of the same session.
+            state_delta[_verdicts_key(index)] = ""
+        yield Event(
+            invocation_id=ctx.invocation_id,
+            author=self.name,
+            branch=ctx.branch,
+            actions=EventActions(state_delta=state_delta),
+        )
+
+
+class CriticMerger(BaseAgent):
+    """Merges the verifiers' findings into the critic's output format."""
+
+    slots: int
+
+    async def _run_async_impl(
+        self, ctx: InvocationContext
+    ) -> AsyncGenerator[Event, None]:
+        entries = []
+        for index in range(self.slots):
+            findings = ctx.session.state.get(_verdicts_key(index)) or ""
+            # Each entry starts at a "* Claim N:" bullet and runs to the next one.
+            for entry in re.split(r"\n(?=\s*[*-]\s*Claim\s+\d+)", findings.strip()):
+                number = re.search(r"Claim\s+(\d+)", entry)
+                if number:
+                    entries.append((int(number.group(1)), entry.strip()))
+        entries.sort(key=lambda item: item[0])
+
+        claims = []
+        for _, entry in entries:
+            verdict = _VERDICT_RE.search(entry)
+            claim = _CLAIM_RE.search(entry)
+            justification = _JUSTIFICATION_RE.search(entry)
+            claims.append(
+                {
+                    "claim": claim.group(1).strip() if claim else "",
+                    "verdict": verdict.group(1).title() if verdict else "Unsupported",
+                    "justification": (
+                        justification.group(1).strip() if justification else ""
+                    ),
+                    "references": re.findall(r"https?://[^\s)\]]+", entry),
+                }
+            )
+        verdicts = [claim["verdict"] for claim in claims]
+        flagged = sum(v in FLAGGED_VERDICTS for v in verdicts)
+        lines = ["  " + entry for _, entry in entries]
+        if not entries:
+            # Nothing was checked (e.g. the extractor's output did not parse),
+            # which must not pass the answer as accurate.
+            overall = "Unsupported"
+            justification = (
+                "No claims could be extracted from the answer, so none of it"
+                " was verified."
+            )
+        elif flagged:
+            overall = next(v for v in FLAGGED_VERDICTS if v in verdicts)
+            justification = (
+                f"{flagged} of {len(entries)} claims were found inaccurate,"
+                " disputed or unsupported."
+            )
+        else:
+            overall = "Accurate"
+            justification = (
+                f"All {len(entries)} claims hold up against the consulted sources."
+            )
+        lines.append(f"  * Overall verdict: {overall}")
+        lines.append(f"  * Overall justification: {justification}")
+        findings = "\n".join(lines)
+        yield Event(
+            invocation_id=ctx.invocation_id,
+            author=self.name,
+            branch=ctx.branch,
+            content=types.Content(role="model", parts=[types.Part(text=findings)]),
+            actions=EventActions(
+                state_delta={
+                    "critic_findings": findings,
+                    STATE_KEY: {
+                        "claims": claims,
+                        "overall_verdict": overall,
+                        "invocation_id": ctx.invocation_id,
+                    },
+                }
+            ),
+        )
@@ -1,5 +1,6 @@
 """Critic agent for identifying and verifying statements using search tools."""
 
+from adk_common.token_budget import TokenBudget
 from google.adk import Agent
 from google.adk.agents.callback_context import CallbackContext
 from google.adk.models import LlmResponse
@@ -7,6 +8,8 @@ from google.adk.models.lite_llm import LiteLlm
 from google.adk.tools import google_search
 from google.genai import types
 
+from ...search import search_service
+from ...verdicts import extract_verdicts
 from . import prompt
 
 
@@ -47,10 +50,16 @@ def _render_reference(
     return llm_response
 
 
+# Grounding text is rendered into the critic's reply, which the reviser and every
+# later turn receive, so keep it bounded.
+_token_budget = TokenBudget(max_tool_output_tokens=3000, session_budget=30000)
+
 critic_agent = Agent(
     model=LiteLlm(model="anthropic/claude-3-sonnet-20240229"),
     name="critic_agent",
     instruction=prompt.CRITIC_PROMPT,
-    tools=[google_search],
-    after_model_callback=_render_reference,
+    tools=[search_service.search_web] if search_service else [google_search],
+    before_model_callback=_token_budget.before_model_callback,
+    after_model_callback=([search_service.attach_references] if search_service else [])
+    + [extract_verdicts, _token_budget.trim_grounding, _render_reference],
 )
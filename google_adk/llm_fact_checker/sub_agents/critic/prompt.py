@@ -47,5 +47,7 @@ There are various actions you can take to help you with the verification:
 
 The last block of your output should be a Markdown-formatted list, summarizing your verification result. For each CLAIM you verified, you should output the claim (as a standalone statement), the corresponding part in the answer text, the verdict, and the justification.
 
+After the list, repeat the result as a fenced code block tagged `json` holding a single JSON object with two keys: "claims", a list with one object per CLAIM with the string fields "claim", "verdict" (exactly one of the verdicts above) and "justification" and a "references" list of the URLs you relied on; and "overall_verdict", the OVERALL VERDICT as a string.
+
 Here is the question and answer you are going to double check:
 """
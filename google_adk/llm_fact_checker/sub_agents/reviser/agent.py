@@ -1,10 +1,12 @@
 """Reviser agent for correcting inaccuracies based on verified findings."""
 
+from adk_common.early_stop import EarlyStopLlm
 from google.adk import Agent
 from google.adk.agents.callback_context import CallbackContext
 from google.adk.models import LlmResponse
 from google.adk.models.lite_llm import LiteLlm
 
+from ...verdicts import focus_on_flagged_claims, skip_reviser_when_accurate
 from . import prompt
 
 _END_OF_EDIT_MARK = "---END-OF-EDIT---"
@@ -26,8 +28,16 @@ def _remove_end_of_edit_mark(
 
 MODEL_CLAUDE_SONNET = "anthropic/claude-3-sonnet-20240229"
 reviser_agent = Agent(
-    model=LiteLlm(model=MODEL_CLAUDE_SONNET),
+    # Stream the revision and stop generating as soon as the marker appears;
+    # _remove_end_of_edit_mark still strips it if the model ends on its own.
+    model=EarlyStopLlm(
+        inner=LiteLlm(model=MODEL_CLAUDE_SONNET), stop_marker=_END_OF_EDIT_MARK
+    ),
     name="reviser_agent",
     instruction=prompt.REVISER_PROMPT,
+    # Skip the call when the critic found nothing to fix, and otherwise pass
+    # only the flagged claims.
+    before_agent_callback=skip_reviser_when_accurate,
+    before_model_callback=focus_on_flagged_claims,
     after_model_callback=_remove_end_of_edit_mark,
 )
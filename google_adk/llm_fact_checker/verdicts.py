@@ -0,0 +1,132 @@
+"""Machine-readable critic verdicts and the reviser short-circuit built on them.
+
+The critic ends its reply with a JSON block listing each claim's verdict. The
+verdicts are kept in session state, so the reviser can be skipped when every
+claim holds up, and otherwise only sees the claims that need editing.
+"""
+
+import json
+import re
+from typing import Optional
+
+from google.adk.agents.callback_context import CallbackContext
+from google.adk.models import LlmRequest, LlmResponse
+from google.genai import types
+
+STATE_KEY = "critic_verdicts"
+FLAGGED_VERDICTS = ("Inaccurate", "Disputed", "Unsupported")
+
+_JSON_BLOCK_RE = re.compile(r"```json\s*(\{.*?\})\s*```", re.S)
+
+
+def parse_verdicts(text: str) -> Optional[dict]:
+    """Returns the last ```json block of `text` holding a "claims" list."""
+    for block in reversed(_JSON_BLOCK_RE.findall(text or "")):
+        try:
+            verdicts = json.loads(block)
+        except json.JSONDecodeError:
+            continue
+        if isinstance(verdicts, dict) and isinstance(verdicts.get("claims"), list):
+            return verdicts
+    return None
+
+
+def store_verdicts(state, invocation_id: str, verdicts: Optional[dict]) -> None:
+    """Saves the verdicts of this audit; None records that there are none."""
+    state[STATE_KEY] = (
+        {**verdicts, "invocation_id": invocation_id} if verdicts is not None else None
+    )
+
+
+def flagged_claims(verdicts: dict) -> list[dict]:
+    return [
+        claim
+        for claim in verdicts.get("claims", [])
+        if str(claim.get("verdict", "")).strip().title() in FLAGGED_VERDICTS
+    ]
+
+
+def render_findings(claims: list[dict]) -> str:
+    """Renders claims in the findings format the reviser prompt uses."""
+    lines = []
+    for number, claim in enumerate(claims, start=1):
+        lines.append(f"  * Claim {number}: {claim.get('claim', '')}")
+        lines.append(f"      * Verdict: {claim.get('verdict', '')}")
+        lines.append(f"      * Justification: {claim.get('justification', '')}")
+        if claim.get("references"):
+            lines.append(f"      * References: {', '.join(claim['references'])}")
+    return "\n".join(lines)
+
+
+def extract_verdicts(
+    callback_context: CallbackContext, llm_response: LlmResponse
+) -> Optional[LlmResponse]:
+    """Critic `after_model_callback`: keeps the verdict block in state."""
+    content = llm_response.content
+    if not content or not content.parts or llm_response.partial:
+        return None
+    if any(part.function_call for part in content.parts):
+        return None
+    text = "\n".join(part.text for part in content.parts if part.text)
+    store_verdicts(
+        callback_context.state, callback_context.invocation_id, parse_verdicts(text)
+    )
+    return None
+
+
+def _user_text(callback_context: CallbackContext) -> str:
+    content = callback_context.user_content
+    if not content or not content.parts:
+        return ""
+    return "\n".join(part.text for part in content.parts if part.text)
+
+
+def _current_verdicts(callback_context: CallbackContext) -> Optional[dict]:
+    verdicts = callback_context.state.get(STATE_KEY)
+    if not verdicts or verdicts.get("invocation_id") != callback_context.invocation_id:
+        return None
+    if not verdicts.get("claims"):
+        # An empty claim list says nothing about the answer; treat it like a
+        # critic reply without verdicts.
+        return None
+    return verdicts
+
+
+def skip_reviser_when_accurate(
+    callback_context: CallbackContext,
+) -> Optional[types.Content]:
+    """Reviser `before_agent_callback`: returns the answer unchanged, without a
+    model call, when the critic checked at least one claim and flagged none.
+
+    The reviser runs as usual when the answer cannot be told apart from the
+    question (no "Answer:" marker)."""
+    verdicts = _current_verdicts(callback_context)
+    if verdicts is None or flagged_claims(verdicts):
+        return None
+    parts = re.split(r"\bAnswer:\s*", _user_text(callback_context), maxsplit=1)
+    if len(parts) < 2:
+        return None
+    return types.Content(role="model", parts=[types.Part(text=parts[1].strip())])
+
+
+def focus_on_flagged_claims(
+    callback_context: CallbackContext, llm_request: LlmRequest
+) -> Optional[LlmResponse]:
+    """Reviser `before_model_callback`: sends only the question-answer pair and
+    the flagged findings instead of the critic's whole transcript."""
+    verdicts = _current_verdicts(callback_context)
+    if verdicts is None:
+        # No structured verdicts: fall back to the full conversation.
+        return None
+    findings = render_findings(flagged_claims(verdicts))
+    llm_request.contents = [
+        types.Content(
+            role="user",
+            parts=[
+                types.Part(
+                    text=f"{_user_text(callback_context)}\n\nFindings:\n\n{findings}"
+                )
+            ],
+        )
+    ]
+    return None
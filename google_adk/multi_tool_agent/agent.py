@@ -1,6 +1,7 @@
 import datetime
 from zoneinfo import ZoneInfo
 
+from adk_common.parallel_tools import concurrent_tools
 from google.adk.agents import LlmAgent
 from google.adk.models.lite_llm import LiteLlm
 
@@ -60,5 +61,6 @@ root_agent = LlmAgent(
     instruction=(
         "You are a helpful agent who can answer user questions about the time and weather in a city."
     ),
-    tools=[get_weather, get_current_time],
+    # "Weather and time in New York" yields both calls in one turn; run them together
+    tools=concurrent_tools(get_weather, get_current_time),
 )
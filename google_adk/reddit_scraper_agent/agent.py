@@ -1,4 +1,5 @@
 import asyncio
+import logging
 import os
 
 import nest_asyncio
@@ -8,6 +9,9 @@ load_dotenv(find_dotenv())
 
 import random
 
+from adk_common import default_executor
+from adk_common.instrumentation import instrument_from_env
+from adk_common.token_budget import TokenBudget
 from asyncpraw import Reddit
 from google.adk.agents import Agent
 from google.adk.models.lite_llm import LiteLlm
@@ -15,6 +19,8 @@ from google.adk.runners import Runner
 from google.adk.sessions import InMemorySessionService
 from google.genai import types
 
+logger = logging.getLogger(__name__)
+
 
 # Synchronous wrapper around asyncpraw to fetch Reddit posts
 def get_reddit_cs_news(subreddit: str, limit: int) -> dict[str, list[str]]:
@@ -23,13 +29,19 @@ def get_reddit_cs_news(subreddit: str, limit: int) -> dict[str, list[str]]:
     """
 
     async def _fetch():
-        print(f"--- Tool called: Fetching from r/{subreddit} via AsyncPRAW ---")
+        logger.info(
+            "Tool called: fetching via AsyncPRAW",
+            extra={"tool": "get_reddit_cs_news", "subreddit": subreddit},
+        )
         client_id = os.getenv("REDDIT_CLIENT_ID")
         client_secret = os.getenv("REDDIT_CLIENT_SECRET")
         user_agent = os.getenv("REDDIT_USER_AGENT")
 
         if not all([client_id, client_secret, user_agent]):
-            print("--- Tool error: Reddit API credentials missing in .env file. ---")
+            logger.error(
+                "Tool error: Reddit API credentials missing in .env file",
+                extra={"tool": "get_reddit_cs_news", "subreddit": subreddit},
+            )
             return {subreddit: ["Error: Reddit API credentials not configured."]}
 
         try:
@@ -49,17 +61,31 @@ def get_reddit_cs_news(subreddit: str, limit: int) -> dict[str, list[str]]:
             return {subreddit: titles}
 
         # except PrawcoreException as e:
-        #     print(f"--- Tool error: Reddit API error for r/{subreddit}: {e} ---")
+        #     logger.error("Tool error: Reddit API error", extra={"subreddit": subreddit})
         #     return {subreddit: [f"Error accessing r/{subreddit}. Details: {e}"]}
         except Exception as e:
-            print(f"--- Tool error: Unexpected error for r/{subreddit}: {e} ---")
+            logger.exception(
+                "Tool error: unexpected error",
+                extra={"tool": "get_reddit_cs_news", "subreddit": subreddit},
+            )
             return {subreddit: [f"An unexpected error occurred. Details: {e}"]}
 
-    # Allow nested event loop and run the coroutine
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        # Offloaded to a worker thread, which has no loop of its own
+        return asyncio.run(_fetch())
+
+    # Called on a running loop: allow nested event loop and run the coroutine
     nest_asyncio.apply(asyncio.get_event_loop())
     return asyncio.get_event_loop().run_until_complete(_fetch())
 
 
+# Keep a large `limit` from flooding the context: sample the titles down to fit
+token_budget = TokenBudget(
+    max_tool_output_tokens=1500, session_budget=20000, strategy="sample"
+)
+
 # Define the Agent
 MODEL_CLAUDE_SONNET = "anthropic/claude-3-sonnet-20240229"
 agent = Agent(
@@ -72,8 +98,13 @@ agent = Agent(
         "Always call the get_reddit_cs_news tool first and then format its output "
         "as a bulleted list under the subreddit name."
     ),
-    tools=[get_reddit_cs_news],
+    # Run the blocking fetch in the shared tool pool so it cannot stall the loop
+    tools=[default_executor.offload(get_reddit_cs_news, max_concurrency=4, timeout=30)],
+    before_model_callback=token_budget.before_model_callback,
+    after_tool_callback=token_budget.after_tool_callback,
 )
+# With ADK_METRICS_DIR set, model and tool metrics are exported there
+instrument_from_env(agent)
 
 # Set up the session and runner
 APP_NAME = "reddit_scout_app"
@@ -0,0 +1,614 @@
+"""Serves the ADK agents from several `adk api_server` workers.
+
+`adk web` and `adk api_server` run every agent on one event loop in one
+process, so a CPU-heavy callback or a blocking tool stalls every other user.
+This launcher starts `--workers` `adk api_server` processes on local ports
+and puts an asyncio HTTP dispatcher in front of them that speaks the same
+API, so clients only see one server.
+
+Requests are routed by session ID: a session's ID is hashed to a worker slot,
+so all turns of a session run on the same worker and its in-memory state
+stays valid. Sessions created without an ID get one from the dispatcher, so
+the worker that creates a session is the one that serves it. Listing a
+user's sessions asks every worker and merges the answers; requests without a
+session (`/list-apps`, `/health`, ...) go to the workers in turn.
+
+Sessions live where `--session_service_uri` says. By default each worker
+uses ADK's local per-agent SQLite store under the agents directory, which
+all workers share; `memory://` keeps sessions in each worker, which is
+fastest but loses a worker's sessions when it is replaced.
+
+Workers are replaced without dropping requests: a replacement is started on
+a new port first, new requests go to it once it is healthy, and the old
+worker is stopped after its requests in flight finish (`--drain-timeout`).
+Turns of a session still running on the old worker keep going there until
+they finish. A worker is replaced after `--max-requests` requests, when it
+exits unexpectedly, and for every worker in turn on SIGHUP. The dispatcher's
+own view of the workers is served at `/dispatcher/stats`. `/run_live`
+(websockets) is not proxied.
+
+Usage (from the repo root):
+    python google_adk/serve_multi.py --workers 4 --port 8000
+    python google_adk/serve_multi.py --workers 4 --session_service_uri sqlite:///sessions.db
+    kill -HUP <dispatcher PID>  # replace all workers, one at a time
+"""
+
+import argparse
+import asyncio
+import contextlib
+import itertools
+import json
+import logging
+import os
+import re
+import signal
+import socket
+import sys
+import time
+import uuid
+import zlib
+from collections import Counter
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Optional
+
+import httpx
+import uvicorn
+from starlette.applications import Starlette
+from starlette.background import BackgroundTask
+from starlette.requests import Request
+from starlette.responses import JSONResponse, Response, StreamingResponse
+from starlette.routing import Route
+
+logger = logging.getLogger(__name__)
+
+AGENTS_DIR = Path(__file__).resolve().parent
+
+SESSIONS = re.compile(r"/apps/[^/]+/users/[^/]+/sessions")
+SESSION = re.compile(r"/apps/[^/]+/users/[^/]+/sessions/([^/]+)(?:/.*)?")
+RUN_PATHS = ("/run", "/run_sse")
+# Headers that describe one connection rather than the message.
+HOP_BY_HOP = frozenset(
+    (
+        "connection",
+        "keep-alive",
+        "proxy-authenticate",
+        "proxy-authorization",
+        "te",
+        "trailer",
+        "transfer-encoding",
+        "upgrade",
+        "host",
+    )
+)
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def slot_of(session_id: str, workers: int) -> int:
+    """The worker slot of a session; stable across processes and restarts."""
+    return zlib.crc32(session_id.encode()) % workers
+
+
+def session_of(method: str, path: str, body: bytes) -> tuple[Optional[str], bytes]:
+    """The session a request belongs to, and the body to forward.
+
+    A session created without an ID gets one here, written into the body, so
+    that the dispatcher knows where it lives.
+    """
+    match = SESSION.fullmatch(path)
+    if match:
+        return match.group(1), body
+    if method == "POST" and (path in RUN_PATHS or SESSIONS.fullmatch(path)):
+        try:
+            payload = json.loads(body) if body else {}
+        except json.JSONDecodeError:
+            return None, body
+        if not isinstance(payload, dict):
+            return None, body
+        session_id = payload.get("session_id") or payload.get("sessionId")
+        if session_id is None and path not in RUN_PATHS:
+            session_id = str(uuid.uuid4())
+            payload["session_id"] = session_id
+            body = json.dumps(payload).encode()
+        return session_id, body
+    return None, body
+
+
+@dataclass
+class Worker:
+    """One `adk api_server` process and the requests it is serving."""
+
+    slot: int
+    port: int
+    process: asyncio.subprocess.Process
+    started: float = field(default_factory=time.time)
+    served: int = 0
+    # Requests in flight by session ID ("" for requests without one).
+    in_flight: Counter = field(default_factory=Counter)
+    idle: asyncio.Event = field(default_factory=asyncio.Event)
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.port}"
+
+    def stats(self) -> dict:
+        return {
+            "slot": self.slot,
+            "pid": self.process.pid,
+            "port": self.port,
+            "uptime_s": round(time.time() - self.started, 1),
+            "served": self.served,
+            "in_flight": sum(self.in_flight.values()),
+        }
+
+
+class WorkerPool:
+    """Starts, routes to and replaces the `adk api_server` workers.
+
+    Args:
+        workers (int): Number of worker processes.
+        agents_dir (Path): Directory of agents the workers serve.
+        session_service_uri (str, optional): Session store of the workers;
+            ADK's local per-agent SQLite store if unset.
+        max_requests (int): Requests after which a worker is replaced; 0
+            never replaces workers that are still running.
+        drain_timeout (float): Seconds a replaced worker gets to finish its
+            requests before it is stopped.
+        start_timeout (float): Seconds a worker gets to become healthy.
+        log_level (str): Log level of the workers.
+    """
+
+    def __init__(
+        self,
+        workers: int,
+        agents_dir: Path = AGENTS_DIR,
+        session_service_uri: Optional[str] = None,
+        max_requests: int = 0,
+        drain_timeout: float = 60.0,
+        start_timeout: float = 60.0,
+        log_level: str = "info",
+    ):
+        self.size = workers
+        self.agents_dir = Path(agents_dir)
+        self.session_service_uri = session_service_uri
+        self.max_requests = max_requests
+        self.drain_timeout = drain_timeout
+        self.start_timeout = start_timeout
+        self.log_level = log_level
+        self.stats = {"replaced": 0, "restarted": 0}
+        self._slots: list[Optional[Worker]] = [None] * workers
+        self._ready = [asyncio.Event() for _ in range(workers)]
+        self._replacing = [asyncio.Lock() for _ in range(workers)]
+        self._draining: list[Worker] = []
+        self._round_robin = itertools.count()
+        self._tasks: set[asyncio.Task] = set()
+        # Every worker process not yet known to have exited, including ones
+        # still starting, so that `stop()` can reach all of them.
+        self._processes: set[asyncio.subprocess.Process] = set()
+        self._stopping = False
+        self._health = httpx.AsyncClient(timeout=1.0)
+
+    @property
+    def keeps_sessions(self) -> bool:
+        """Whether sessions outlive the worker that served them."""
+        return not (self.session_service_uri or "").startswith("memory://")
+
+    def replace_all_later(self) -> None:
+        """Schedules `replace_all()`; safe to call from a signal handler."""
+        self._background(self.replace_all())
+
+    def _background(self, coroutine) -> None:
+        task = asyncio.create_task(coroutine)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _spawn(self, slot: int) -> Worker:
+        """Starts a worker for `slot` and waits until it is healthy."""
+        port = _free_port()
+        command = [
+            sys.executable,
+            "-m",
+            "google.adk.cli",
+            "api_server",
+            "--host",
+            "127.0.0.1",
+            "--port",
+            str(port),
+            "--log_level",
+            self.log_level,
+        ]
+        if self.session_service_uri:
+            command += ["--session_service_uri", self.session_service_uri]
+        env = dict(os.environ)
+        # The agents import `adk_common` from this directory.
+        env["PYTHONPATH"] = os.pathsep.join(
+            filter(None, (str(AGENTS_DIR), env.get("PYTHONPATH")))
+        )
+        if "ADK_METRICS_DIR" in env:
+            # Each worker exports its own metrics instead of overwriting
+            # the others'.
+            env["ADK_METRICS_DIR"] = str(
+                Path(env["ADK_METRICS_DIR"]) / f"worker-{slot}"
+            )
+        # In a session of their own, so that Ctrl-C or a signal sent to the
+        # dispatcher's process group does not reach the workers; the pool
+        # stops them.
+        process = await asyncio.create_subprocess_exec(
+            *command, str(self.agents_dir), env=env, start_new_session=True
+        )
+        self._processes.add(process)
+        worker = Worker(slot=slot, port=port, process=process)
+        worker.idle.set()
+
+        try:
+            deadline = time.monotonic() + self.start_timeout
+            while time.monotonic() < deadline:
+                if process.returncode is not None:
+                    raise RuntimeError(
+                        f"Worker {slot} exited with {process.returncode} while starting"
+                    )
+                try:
+                    response = await self._health.get(f"{worker.url}/health")
+                    if response.status_code == 200:
+                        logger.info(
+                            "Worker %d ready (pid %d, port %d)", slot, process.pid, port
+                        )
+                        return worker
+                except httpx.HTTPError:
+                    pass
+                await asyncio.sleep(0.1)
+            raise RuntimeError(f"Worker {slot} not healthy after {self.start_timeout}s")
+        except BaseException:
+            # Failed or cancelled (e.g. another worker failed to start, or
+            # the pool is stopping): the process must not outlive the pool.
+            await self._terminate(process)
+            raise
+
+    def _install(self, worker: Worker) -> None:
+        self._slots[worker.slot] = worker
+        self._ready[worker.slot].set()
+        self._background(self._watch(worker))
+
+    async def _terminate(self, process: asyncio.subprocess.Process) -> None:
+        try:
+            if process.returncode is None:
+                process.terminate()
+                try:
+                    await asyncio.wait_for(process.wait(), 10)
+                except asyncio.TimeoutError:
+                    process.kill()
+                    await process.wait()
+        finally:
+            self._processes.discard(process)
+
+    async def _watch(self, worker: Worker) -> None:
+        """Restarts `worker` if it exits while it still owns its slot."""
+        code = await worker.process.wait()
+        if self._stopping or self._slots[worker.slot] is not worker:
+            return
+        logger.error(
+            "Worker %d (pid %d) exited with %s; restarting",
+            worker.slot,
+            worker.process.pid,
+            code,
+        )
+        self._ready[worker.slot].clear()
+        while not self._stopping:
+            try:
+                replacement = await self._spawn(worker.slot)
+            except RuntimeError:
+                logger.exception("Restarting worker %d failed", worker.slot)
+                await asyncio.sleep(1.0)
+                continue
+            self._install(replacement)
+            self.stats["restarted"] += 1
+            return
+
+    async def start(self) -> None:
+        """Starts all workers; fails if any of them does not come up."""
+        try:
+            # The first worker that fails to start cancels the others.
+            async with asyncio.TaskGroup() as group:
+                spawns = [
+                    group.create_task(self._spawn(slot)) for slot in range(self.size)
+                ]
+        except BaseException:
+            await self.stop()
+            raise
+        for spawn in spawns:
+            self._install(spawn.result())
+        logger.info(
+            "%d workers serving %s, sessions in %s",
+            self.size,
+            self.agents_dir,
+            self.session_service_uri or "the local per-agent store",
+        )
+
+    async def stop(self) -> None:
+        """Stops all workers, without waiting for their requests."""
+        self._stopping = True
+        tasks = list(self._tasks)
+        for task in tasks:
+            task.cancel()
+        # Restarts and replacements may be starting a worker; let them clean
+        # up before the remaining processes are stopped.
+        await asyncio.gather(*tasks, return_exceptions=True)
+        await asyncio.gather(
+            *(self._terminate(process) for process in list(self._processes))
+        )
+        await self._health.aclose()
+
+    async def replace(self, slot: int, worker: Optional[Worker] = None) -> None:
+        """Replaces the worker of `slot` without dropping its requests.
+
+        Args:
+            slot (int): Slot whose worker to replace.
+            worker (Worker, optional): Only replace this worker; nothing is
+                done if it no longer owns the slot (it was already replaced).
+        """
+        async with self._replacing[slot]:
+            old = self._slots[slot]
+            if worker is not None and old is not worker:
+                return
+            try:
+                new = await self._spawn(slot)
+            except RuntimeError:
+                logger.exception("Replacement of worker %d failed; keeping it", slot)
+                return
+            self._draining.append(old)
+            self._install(new)
+            self.stats["replaced"] += 1
+            if not self.keeps_sessions:
+                logger.warning(
+                    "Replaced worker %d with in-memory sessions; its sessions are gone",
+                    slot,
+                )
+            try:
+                await asyncio.wait_for(old.idle.wait(), self.drain_timeout)
+            except asyncio.TimeoutError:
+                logger.warning(
+                    "Worker %d still had %d requests after %gs; stopping it",
+                    slot,
+                    sum(old.in_flight.values()),
+                    self.drain_timeout,
+                )
+            self._draining.remove(old)
+            await self._terminate(old.process)
+            logger.info("Worker %d (pid %d) replaced", slot, old.process.pid)
+
+    async def replace_all(self) -> None:
+        """Replaces every worker, one at a time."""
+        for slot in range(self.size):
+            await self.replace(slot)
+
+    async def acquire(self, session_id: Optional[str]) -> Worker:
+        """The worker to send a request of `session_id` to; hand it back with
+        `release()` once the response is sent."""
+        worker = None
+        if session_id:
+            # A turn of this session still running on a replaced worker; the
+            # next one must not overtake it on the new worker.
+            for draining in self._draining:
+                if draining.in_flight[session_id]:
+                    worker = draining
+                    break
+            slot = slot_of(session_id, self.size)
+        else:
+            slot = next(self._round_robin) % self.size
+        if worker is None:
+            await asyncio.wait_for(self._ready[slot].wait(), self.start_timeout)
+            worker = self._slots[slot]
+        worker.served += 1
+        worker.in_flight[session_id or ""] += 1
+        worker.idle.clear()
+        return worker
+
+    def release(self, worker: Worker, session_id: Optional[str]) -> None:
+        key = session_id or ""
+        worker.in_flight[key] -= 1
+        if worker.in_flight[key] <= 0:
+            del worker.in_flight[key]
+        if not worker.in_flight:
+            worker.idle.set()
+        if (
+            self.max_requests
+            and worker.served >= self.max_requests
+            and self._slots[worker.slot] is worker
+            and not self._replacing[worker.slot].locked()
+        ):
+            logger.info(
+                "Worker %d served %d requests; replacing it", worker.slot, worker.served
+            )
+            self._background(self.replace(worker.slot, worker))
+
+    def workers(self) -> list[Worker]:
+        """The workers currently owning a slot."""
+        return [
+            worker
+            for worker, ready in zip(self._slots, self._ready)
+            if worker and ready.is_set()
+        ]
+
+    def report(self) -> dict:
+        return {
+            **self.stats,
+            "workers": [worker.stats() for worker in self.workers()],
+            "draining": [worker.stats() for worker in self._draining],
+        }
+
+
+def _forward_headers(headers) -> dict:
+    return {
+        name: value for name, value in headers.items() if name.lower() not in HOP_BY_HOP
+    }
+
+
+def create_app(pool: WorkerPool) -> Starlette:
+    """The dispatcher: one ASGI app in front of the workers of `pool`."""
+    client = httpx.AsyncClient(
+        timeout=httpx.Timeout(None, connect=5.0),
+        limits=httpx.Limits(max_connections=None, max_keepalive_connections=100),
+    )
+
+    @contextlib.asynccontextmanager
+    async def lifespan(app):
+        await pool.start()
+        if hasattr(signal, "SIGHUP"):
+            asyncio.get_running_loop().add_signal_handler(
+                signal.SIGHUP, pool.replace_all_later
+            )
+        try:
+            yield
+        finally:
+            await client.aclose()
+            await pool.stop()
+
+    async def stats(request: Request) -> Response:
+        return JSONResponse(pool.report())
+
+    async def list_sessions(request: Request) -> Response:
+        """Merges the session lists of all workers."""
+        path = request.url.path
+        query = request.url.query
+        responses = await asyncio.gather(
+            *(
+                client.get(f"{worker.url}{path}", params=query)
+                for worker in pool.workers()
+            )
+        )
+        sessions, seen = [], set()
+        for response in responses:
+            if response.status_code != 200:
+                return Response(
+                    response.content,
+                    response.status_code,
+                    media_type=response.headers.get("content-type"),
+                )
+            for session in response.json():
+                if session["id"] not in seen:
+                    seen.add(session["id"])
+                    sessions.append(session)
+        return JSONResponse(sessions)
+
+    async def proxy(request: Request) -> Response:
+        path = request.url.path
+        if request.method == "GET" and SESSIONS.fullmatch(path):
+            return await list_sessions(request)
+        session_id, body = session_of(request.method, path, await request.body())
+        headers = _forward_headers(request.headers)
+        headers.pop("content-length", None)
+        try:
+            worker = await pool.acquire(session_id)
+        except asyncio.TimeoutError:
+            return JSONResponse({"error": "No worker available"}, status_code=503)
+
+        released = False
+
+        async def release() -> None:
+            nonlocal released
+            if not released:
+                released = True
+                pool.release(worker, session_id)
+
+        url = f"{worker.url}{path}"
+        if request.url.query:
+            url += f"?{request.url.query}"
+        try:
+            response = await client.send(
+                client.build_request(
+                    request.method, url, headers=headers, content=body
+                ),
+                stream=True,
+            )
+        except httpx.HTTPError as e:
+            await release()
+            logger.warning("Worker %d failed: %r", worker.slot, e)
+            return JSONResponse(
+                {"error": f"Worker {worker.slot} unavailable: {e!r}"}, status_code=502
+            )
+
+        async def relay():
+            # Streams `/run_sse` events as the worker sends them.
+            try:
+                async for chunk in response.aiter_raw():
+                    yield chunk
+            finally:
+                await response.aclose()
+                await release()
+
+        async def close() -> None:
+            await response.aclose()
+            await release()
+
+        return StreamingResponse(
+            relay(),
+            status_code=response.status_code,
+            headers=_forward_headers(response.headers),
+            background=BackgroundTask(close),
+        )
+
+    return Starlette(
+        routes=[
+            Route("/dispatcher/stats", stats),
+            Route(
+                "/{path:path}",
+                proxy,
+                methods=["GET", "POST", "PUT", "PATCH", "DELETE", "OPTIONS"],
+            ),
+        ],
+        lifespan=lifespan,
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("agents_dir", nargs="?", default=str(AGENTS_DIR))
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument(
+        "--session_service_uri",
+        "--session_db_url",
+        default=None,
+        help="Session store of all workers, e.g. sqlite:///sessions.db or"
+        " memory:// (default: ADK's local per-agent store)",
+    )
+    parser.add_argument(
+        "--max-requests",
+        type=int,
+        default=0,
+        help="Replace a worker after this many requests (0: never)",
+    )
+    parser.add_argument("--drain-timeout", type=float, default=60.0)
+    parser.add_argument("--start-timeout", type=float, default=60.0)
+    parser.add_argument("--log_level", default="info")
+    args = parser.parse_args()
+    if args.workers < 1:
+        parser.error("--workers must be at least 1")
+    logging.basicConfig(level=args.log_level.upper(), format="%(name)s: %(message)s")
+
+    pool = WorkerPool(
+        args.workers,
+        agents_dir=Path(args.agents_dir).resolve(),
+        session_service_uri=args.session_service_uri,
+        max_requests=args.max_requests,
+        drain_timeout=args.drain_timeout,
+        start_timeout=args.start_timeout,
+        log_level=args.log_level,
+    )
+    uvicorn.run(
+        create_app(pool),
+        host=args.host,
+        port=args.port,
+        log_level=args.log_level,
+        timeout_graceful_shutdown=args.drain_timeout,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,13 +1,17 @@
 import asyncio
+import logging
 import os
 import warnings
 
+from adk_common.instrumentation import default_instrumentation, start_logging
 from google.adk.agents import Agent, LlmAgent
 from google.adk.models.lite_llm import LiteLlm  # For multi-model support
 from google.adk.runners import Runner
 from google.adk.sessions import InMemorySessionService
 from google.genai import types  # For creating message Content/Parts
 
+logger = logging.getLogger(__name__)
+
 # @title Define Tools for Greeting and Farewell Agents
 
 
@@ -25,7 +29,7 @@ def get_weather(city: str) -> dict:
               If 'error', includes an 'error_message' key.
     """
     # Best Practice: Log tool execution for easier debugging
-    print(f"--- Tool: get_weather called for city: {city} ---")
+    logger.info("Tool: get_weather called", extra={"tool": "get_weather", "city": city})
     city_normalized = city.lower().replace(" ", "")  # Basic input normalization
 
     # Mock weather data for simplicity
@@ -63,7 +67,7 @@ def say_hello(name: str) -> str:
     Returns:
         str: A friendly greeting message.
     """
-    print(f"--- Tool: say_hello called with name: {name} ---")
+    logger.info("Tool: say_hello called", extra={"tool": "say_hello", "user": name})
     return f"Hello, {name}!"
 
 
@@ -73,7 +77,7 @@ def say_goodbye() -> str:
     Returns:
         str: A friendly goodbye message.
     """
-    print(f"--- Tool: say_goodbye called ---")
+    logger.info("Tool: say_goodbye called", extra={"tool": "say_goodbye"})
     return "Goodbye! Have a great day."
 
 
@@ -230,6 +234,9 @@ if root_agent_var_name in globals() and globals()[root_agent_var_name]:
 
     async def run_team_conversation():
         print("\n--- Testing Agent Team Delegation ---")
+        # Tool logs, and a span per model and tool call, as JSON lines on
+        # stderr; written by a background thread so the agents never wait.
+        start_logging(loggers=[__name__, "adk_common"])
         # InMemorySessionService is simple, non-persistent storage for this tutorial.
         session_service = InMemorySessionService()
 
@@ -249,6 +256,9 @@ if root_agent_var_name in globals() and globals()[root_agent_var_name]:
         # --- Get the actual root agent object ---
         # Use the determined variable name
         actual_root_agent = globals()[root_agent_var_name]
+        # Record latency, tokens and errors of every model and tool call,
+        # in the sub-agents too
+        default_instrumentation.instrument(actual_root_agent)
 
         # Create a runner specific to this agent team test
         runner_agent_team = Runner(
@@ -278,10 +288,12 @@ if root_agent_var_name in globals() and globals()[root_agent_var_name]:
             user_id=USER_ID,
             session_id=SESSION_ID,
         )
+        print(f"\n{default_instrumentation.report()}")
 
-    # Execute the conversation
+    # Execute the conversation when run as a script, not when imported
     # Note: This may require API keys for the models used by root and sub-agents!
-    asyncio.run(run_team_conversation())
+    if __name__ == "__main__":
+        asyncio.run(run_team_conversation())
 else:
     print(
         "\n⚠️ Skipping agent team conversation as the root agent was not successfully defined in the previous step."
@@ -2,6 +2,7 @@ import asyncio
 import os
 import warnings
 
+from adk_common.instrumentation import default_instrumentation, start_logging
 from google.adk.agents import Agent, LlmAgent
 from google.adk.models.lite_llm import LiteLlm  # For multi-model support
 from google.adk.runners import Runner
@@ -13,7 +14,7 @@ warnings.filterwarnings("ignore")
 
 import logging
 
-logging.basicConfig(level=logging.ERROR)
+logger = logging.getLogger(__name__)
 
 MODEL_CLAUDE_SONNET = "anthropic/claude-3-sonnet-20240229"
 
@@ -32,7 +33,7 @@ def get_weather(city: str) -> dict:
               If 'error', includes an 'error_message' key.
     """
     # Best Practice: Log tool execution for easier debugging
-    print(f"--- Tool: get_weather called for city: {city} ---")
+    logger.info("Tool: get_weather called", extra={"tool": "get_weather", "city": city})
     city_normalized = city.lower().replace(" ", "")  # Basic input normalization
 
     # Mock weather data for simplicity
@@ -153,5 +154,9 @@ async def run_conversation():
 # use multiple LLM providers for a higher availability state or for use case dominant scenarios
 # wrapped in a try/except block and setup separate runner and session for tracking that provider
 if __name__ == "__main__":
+    # Structured logs from a background thread, and metrics of every call
+    start_logging(loggers=[__name__, "adk_common"])
+    default_instrumentation.instrument(weather_agent)
     # Execute the conversation using await in an async context (like Colab/Jupyter)
     asyncio.run(run_conversation())
+    print(f"\n{default_instrumentation.report()}")
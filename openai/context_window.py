@@ -0,0 +1,199 @@
+"""Token-bounded conversation history for the customer service loop.
+
+Resending `result.to_input_list()` every turn makes each request carry the
+whole transcript, including every tool call and handoff. `ContextWindow`
+keeps the most recent turns verbatim and folds older ones into a rolling
+summary: user and agent messages become short lines, tool calls become one
+line with a clipped result, and handoffs become "handed off to X". The
+summary, together with the facts in the run context (name, confirmation
+number, seat, flight), is sent as one system message ahead of the recent
+turns.
+"""
+
+import json
+import logging
+from typing import Any, Optional
+
+from agents import RunResult, TResponseInputItem
+from pydantic import BaseModel
+
+logger = logging.getLogger(__name__)
+
+_HANDOFF_PREFIX = "transfer_to_"
+
+
+def estimate_tokens(item: Any) -> int:
+    """Rough token count of an input item (about 4 characters per token)."""
+    text = item if isinstance(item, str) else json.dumps(item, default=str)
+    return len(text) // 4 + 1
+
+
+def _clip(text: str, limit: int) -> str:
+    text = " ".join(str(text).split())
+    return text if len(text) <= limit else text[: limit - 3] + "..."
+
+
+def _is_user_message(item: TResponseInputItem) -> bool:
+    return item.get("role") == "user" and item.get("type", "message") == "message"
+
+
+def _message_text(item: TResponseInputItem) -> str:
+    content = item.get("content")
+    if isinstance(content, str):
+        return content
+    return " ".join(
+        part.get("text", "") for part in content or [] if isinstance(part, dict)
+    )
+
+
+class ContextWindow:
+    """Keeps the input of each run within a token budget.
+
+    Args:
+        max_tokens (int): Estimated token budget for the input of a run.
+        keep_turns (int): Most recent turns kept verbatim when they fit. A
+            turn starts at a user message; the new user message is a turn.
+        summary_tokens (int): Budget for the rolling summary. The oldest
+            summary lines are dropped beyond it.
+        line_chars (int): Length at which summarized messages are clipped.
+    """
+
+    def __init__(
+        self,
+        max_tokens: int = 2000,
+        keep_turns: int = 3,
+        summary_tokens: int = 400,
+        line_chars: int = 160,
+    ):
+        self.max_tokens = max_tokens
+        self.keep_turns = keep_turns
+        self.summary_tokens = summary_tokens
+        self.line_chars = line_chars
+        self._turns: list[list[TResponseInputItem]] = []
+        self._summary: list[str] = []
+        self._omitted = 0
+        self._turn_count = 0
+        self._last_estimate = 0
+
+    def to_dict(self) -> dict:
+        """JSON-serializable state, for conversation stores."""
+        return {
+            "max_tokens": self.max_tokens,
+            "keep_turns": self.keep_turns,
+            "summary_tokens": self.summary_tokens,
+            "line_chars": self.line_chars,
+            "turns": self._turns,
+            "summary": self._summary,
+            "omitted": self._omitted,
+            "turn_count": self._turn_count,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "ContextWindow":
+        window = cls(
+            max_tokens=data["max_tokens"],
+            keep_turns=data["keep_turns"],
+            summary_tokens=data["summary_tokens"],
+            line_chars=data["line_chars"],
+        )
+        window._turns = data["turns"]
+        window._summary = data["summary"]
+        window._omitted = data["omitted"]
+        window._turn_count = data["turn_count"]
+        return window
+
+    def add_user_message(self, text: str) -> None:
+        self._turns.append([{"content": text, "role": "user"}])
+
+    def discard_user_message(self) -> None:
+        """Drops the latest user message, e.g. after its run failed."""
+        if self._turns and len(self._turns[-1]) == 1:
+            self._turns.pop()
+
+    def add_result(self, result: RunResult) -> None:
+        """Records a run's new items and logs the tokens the turn used."""
+        items = [item.to_input_item() for item in result.new_items]
+        if self._turns:
+            self._turns[-1].extend(items)
+        else:
+            self._turns.append(items)
+        self._turn_count += 1
+        usage = result.context_wrapper.usage
+        logger.info(
+            "turn %d: ~%d input tokens in the first request,"
+            " %d input tokens over %d requests",
+            self._turn_count,
+            self._last_estimate,
+            usage.input_tokens,
+            usage.requests,
+        )
+
+    def input_items(
+        self, context: Optional[BaseModel] = None
+    ) -> list[TResponseInputItem]:
+        """Returns the items to run with, folding old turns into the summary."""
+        while len(self._turns) > self.keep_turns:
+            self._fold(self._turns.pop(0))
+        while len(self._turns) > 1 and self._estimate(context) > self.max_tokens:
+            self._fold(self._turns.pop(0))
+
+        header = self._header(context)
+        items = [header] if header else []
+        items.extend(item for turn in self._turns for item in turn)
+        self._last_estimate = sum(estimate_tokens(item) for item in items)
+        return items
+
+    def _estimate(self, context: Optional[BaseModel]) -> int:
+        header = self._header(context)
+        return (estimate_tokens(header) if header else 0) + sum(
+            estimate_tokens(item) for turn in self._turns for item in turn
+        )
+
+    def _header(self, context: Optional[BaseModel]) -> Optional[TResponseInputItem]:
+        sections = []
+        facts = context.model_dump(exclude_none=True) if context else {}
+        if facts:
+            sections.append(
+                "Known customer details (always current):\n"
+                + "\n".join(f"- {key}: {value}" for key, value in facts.items())
+            )
+        if self._summary:
+            lines = list(self._summary)
+            if self._omitted:
+                lines.insert(0, f"({self._omitted} earlier lines omitted)")
+            sections.append("Summary of the earlier conversation:\n" + "\n".join(lines))
+        if not sections:
+            return None
+        return {"role": "system", "content": "\n\n".join(sections)}
+
+    def _fold(self, turn: list[TResponseInputItem]) -> None:
+        """Condenses a turn into summary lines."""
+        calls = {}
+        for item in turn:
+            kind = item.get("type", "message")
+            if kind == "function_call":
+                calls[item.get("call_id")] = item
+                if item.get("name", "").startswith(_HANDOFF_PREFIX):
+                    target = item["name"][len(_HANDOFF_PREFIX) :].replace("_", " ")
+                    self._summary.append(f"(handed off to {target})")
+            elif kind == "function_call_output":
+                call = calls.get(item.get("call_id"), {})
+                name = call.get("name", "tool")
+                if name.startswith(_HANDOFF_PREFIX):
+                    continue
+                self._summary.append(
+                    f"Tool {name}({_clip(call.get('arguments', ''), 60)}) returned:"
+                    f" {_clip(item.get('output', ''), self.line_chars)}"
+                )
+            elif kind == "message":
+                speaker = "Customer" if _is_user_message(item) else "Agent"
+                self._summary.append(
+                    f"{speaker}: {_clip(_message_text(item), self.line_chars)}"
+                )
+        while (
+            len(self._summary) > 1
+            and sum(estimate_tokens(line) for line in self._summary)
+            > self.summary_tokens
+        ):
+            self._summary.pop(0)
+            self._omitted += 1
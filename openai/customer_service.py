@@ -1,6 +1,8 @@
 from __future__ import annotations as _annotations
 
 import asyncio
+import logging
+import os
 import random
 import uuid
 
@@ -16,10 +18,14 @@ from agents import (
     TResponseInputItem,
     function_tool,
     handoff,
-    trace,
 )
 from agents.extensions.handoff_prompt import RECOMMENDED_PROMPT_PREFIX
+from context_window import ContextWindow
+from faq_engine import FaqIndex
+from intent_router import IntentRouter
 from pydantic import BaseModel
+from seat_inventory import SeatError, SeatInventory, SeatUnavailableError
+from trace_export import install_from_env, sampled_trace
 
 ### CONTEXT
 
@@ -34,26 +40,28 @@ class AirlineAgentContext(BaseModel):
 ### TOOLS
 
 
+faq_index = FaqIndex.load_or_build()
+FAQ_MIN_CONFIDENCE = 0.3
+# SEAT_INVENTORY_DB persists reservations to SQLite; in memory otherwise.
+seat_inventory = SeatInventory(db_path=os.getenv("SEAT_INVENTORY_DB"))
+
+
 @function_tool(
     name_override="faq_lookup_tool",
     description_override="Lookup frequently asked questions.",
 )
 async def faq_lookup_tool(question: str) -> str:
-    if "bag" in question or "baggage" in question:
-        return (
-            "You are allowed to bring one bag on the plane. "
-            "It must be under 50 pounds and 22 inches x 14 inches x 9 inches."
-        )
-    elif "seats" in question or "plane" in question:
-        return (
-            "There are 120 seats on the plane. "
-            "There are 22 business class seats and 98 economy seats. "
-            "Exit rows are rows 4 and 16. "
-            "Rows 5-8 are Economy Plus, with extra legroom. "
-        )
-    elif "wifi" in question:
-        return "We have free wifi on the plane, join Airline-Wifi"
-    return "I'm sorry, I don't know the answer to that question."
+    hits = [
+        hit
+        for hit in faq_index.search(question, k=3)
+        if hit.confidence >= FAQ_MIN_CONFIDENCE
+    ]
+    if not hits:
+        return "I'm sorry, I don't know the answer to that question."
+    # Best match first; the confidence lets the agent judge the weaker ones.
+    return "\n".join(
+        f"[confidence {hit.confidence:.2f}] {hit.entry.answer}" for hit in hits
+    )
 
 
 @function_tool
@@ -69,12 +77,25 @@ async def update_seat(
         confirmation_number: The confirmation number for the flight.
         new_seat: The new seat to update to.
     """
-    # Update the context based on the customer's input
-    context.context.confirmation_number = confirmation_number
-    context.context.seat_number = new_seat
     # Ensure that the flight number has been set by the incoming handoff
     assert context.context.flight_number is not None, "Flight number is required"
-    return f"Updated seat to {new_seat} for confirmation number {confirmation_number}"
+    flight_number = context.context.flight_number
+    try:
+        seat = await seat_inventory.reserve(
+            flight_number, new_seat, confirmation_number
+        )
+    except SeatUnavailableError as e:
+        free = await seat_inventory.available(flight_number)
+        return f"{e} Some free seats: {', '.join(s.describe() for s in free[:5])}"
+    except SeatError as e:
+        return str(e)
+    # Update the context based on the reservation
+    context.context.confirmation_number = confirmation_number
+    context.context.seat_number = seat.label
+    return (
+        f"Updated seat to {seat.describe()} for confirmation number"
+        f" {confirmation_number}"
+    )
 
 
 ### HOOKS
@@ -83,8 +104,9 @@ async def update_seat(
 async def on_seat_booking_handoff(
     context: RunContextWrapper[AirlineAgentContext],
 ) -> None:
-    flight_number = f"FLT-{random.randint(100, 999)}"
-    context.context.flight_number = flight_number
+    # Keep the flight of an earlier handoff so its reservation stays valid.
+    if context.context.flight_number is None:
+        context.context.flight_number = f"FLT-{random.randint(100, 999)}"
 
 
 ### AGENTS
@@ -133,13 +155,39 @@ faq_agent.handoffs.append(triage_agent)
 seat_booking_agent.handoffs.append(triage_agent)
 
 
+### ROUTING
+
+intent_router = IntentRouter.from_jsonl()
+ROUTED_AGENTS = {"faq": faq_agent, "seat_booking": seat_booking_agent}
+
+
+async def pre_route(
+    agent: Agent[AirlineAgentContext], message: str, context: AirlineAgentContext
+) -> Agent[AirlineAgentContext]:
+    """Starts obvious requests on their agent instead of spending a model call
+    in triage. Messages to other agents, and unclear ones, are unchanged."""
+    if agent is not triage_agent:
+        return agent
+    route = intent_router.classify(message)
+    if route.intent is None:
+        return agent
+    if route.intent == "seat_booking":
+        await on_seat_booking_handoff(RunContextWrapper(context=context))
+    return ROUTED_AGENTS[route.intent]
+
+
 ### RUN
 
 
 async def main():
     current_agent: Agent[AirlineAgentContext] = triage_agent
-    input_items: list[TResponseInputItem] = []
     context = AirlineAgentContext()
+    # Keeps the resent history bounded instead of growing with every turn.
+    window = ContextWindow(max_tokens=2000, keep_turns=3)
+    logging.basicConfig(format="%(name)s: %(message)s")
+    logging.getLogger("context_window").setLevel(logging.INFO)
+    # TRACE_EXPORT_PATH writes sampled traces to a local file instead.
+    install_from_env()
 
     # Normally, each input from the user would be an API request to your app, and you can wrap the request in a trace()
     # Here, we'll just use a random UUID for the conversation ID
@@ -147,8 +195,13 @@ async def main():
 
     while True:
         user_input = input("Enter your message: ")
-        with trace("Customer service", group_id=conversation_id):
-            input_items.append({"content": user_input, "role": "user"})
+        with sampled_trace("Customer service", group_id=conversation_id):
+            window.add_user_message(user_input)
+            routed_agent = await pre_route(current_agent, user_input, context)
+            if routed_agent is not current_agent:
+                print(f"Routed from {current_agent.name} to {routed_agent.name}")
+                current_agent = routed_agent
+            input_items: list[TResponseInputItem] = window.input_items(context)
             result = await Runner.run(current_agent, input_items, context=context)
 
             for new_item in result.new_items:
@@ -165,7 +218,7 @@ async def main():
                     print(f"{agent_name}: Tool call output: {new_item.output}")
                 else:
                     print(f"{agent_name}: Skipping item: {new_item.__class__.__name__}")
-            input_items = result.to_input_list()
+            window.add_result(result)
             current_agent = result.last_agent
 
 
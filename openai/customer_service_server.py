@@ -0,0 +1,418 @@
+"""Serves many customer service conversations at once on one event loop.
+
+Each conversation keeps its own `AirlineAgentContext`, current agent and
+bounded history (`ContextWindow`) in a `ConversationStore`, and turns of the
+same conversation run one at a time while different conversations run
+concurrently. Conversations idle for longer than `idle_timeout` are evicted.
+
+The server speaks JSON lines over TCP. A request is
+{"conversation_id": "...", "message": "..."}, where a missing ID starts a new
+conversation. The response carries the conversation ID, the agent now in
+charge, the agent's replies and the run's events, or an "error".
+
+Usage (from the openai directory):
+    python customer_service_server.py --port 8765 --fake-model
+
+Set TRACE_EXPORT_PATH (and optionally TRACE_SAMPLE_RATE, TRACE_EXPORT_FORMAT)
+to write sampled traces to a local file instead of the hosted backend.
+"""
+
+from __future__ import annotations as _annotations
+
+import argparse
+import asyncio
+import contextlib
+import json
+import logging
+import sqlite3
+import threading
+import time
+import uuid
+from dataclasses import dataclass, field
+from typing import Optional
+
+from agents import (
+    HandoffOutputItem,
+    ItemHelpers,
+    MessageOutputItem,
+    RunConfig,
+    Runner,
+    ToolCallItem,
+    ToolCallOutputItem,
+    set_tracing_disabled,
+)
+from agents.models.interface import Model
+from context_window import ContextWindow
+from customer_service import (
+    AirlineAgentContext,
+    faq_agent,
+    pre_route,
+    seat_booking_agent,
+    triage_agent,
+)
+from trace_export import install_from_env, sampled_trace
+
+logger = logging.getLogger(__name__)
+
+AGENTS = {agent.name: agent for agent in (triage_agent, faq_agent, seat_booking_agent)}
+
+
+@dataclass
+class Conversation:
+    """Everything one conversation needs between turns."""
+
+    id: str
+    context: AirlineAgentContext = field(default_factory=AirlineAgentContext)
+    agent_name: str = triage_agent.name
+    window: ContextWindow = field(default_factory=ContextWindow)
+    last_active: float = field(default_factory=time.time)
+
+    def to_dict(self) -> dict:
+        return {
+            "id": self.id,
+            "context": self.context.model_dump(),
+            "agent_name": self.agent_name,
+            "window": self.window.to_dict(),
+            "last_active": self.last_active,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "Conversation":
+        return cls(
+            id=data["id"],
+            context=AirlineAgentContext(**data["context"]),
+            agent_name=data["agent_name"],
+            window=ContextWindow.from_dict(data["window"]),
+            last_active=data["last_active"],
+        )
+
+
+class ConversationStore:
+    """Interface of a conversation store."""
+
+    async def get(self, conversation_id: str) -> Optional[Conversation]:
+        raise NotImplementedError
+
+    async def put(self, conversation: Conversation) -> None:
+        raise NotImplementedError
+
+    async def delete(self, conversation_id: str) -> None:
+        raise NotImplementedError
+
+    async def idle_ids(self, before: float) -> list[str]:
+        """IDs of the conversations last active before `before`."""
+        raise NotImplementedError
+
+    async def count(self) -> int:
+        raise NotImplementedError
+
+
+class InMemoryConversationStore(ConversationStore):
+    """Keeps conversations in a dict of this process."""
+
+    def __init__(self):
+        self._conversations: dict[str, Conversation] = {}
+
+    async def get(self, conversation_id: str) -> Optional[Conversation]:
+        return self._conversations.get(conversation_id)
+
+    async def put(self, conversation: Conversation) -> None:
+        self._conversations[conversation.id] = conversation
+
+    async def delete(self, conversation_id: str) -> None:
+        self._conversations.pop(conversation_id, None)
+
+    async def idle_ids(self, before: float) -> list[str]:
+        return [
+            conversation.id
+            for conversation in self._conversations.values()
+            if conversation.last_active < before
+        ]
+
+    async def count(self) -> int:
+        return len(self._conversations)
+
+
+class SQLiteConversationStore(ConversationStore):
+    """Keeps conversations as JSON rows in SQLite, off the event loop.
+
+    Args:
+        path (str): Database file; ":memory:" keeps it in this process.
+    """
+
+    def __init__(self, path: str = "conversations.db"):
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._db:
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS conversations"
+                " (id TEXT PRIMARY KEY, last_active REAL, data TEXT)"
+            )
+            self._db.execute(
+                "CREATE INDEX IF NOT EXISTS conversations_last_active"
+                " ON conversations (last_active)"
+            )
+
+    def _execute(self, sql: str, params: tuple = ()) -> list:
+        with self._lock, self._db:
+            return self._db.execute(sql, params).fetchall()
+
+    async def get(self, conversation_id: str) -> Optional[Conversation]:
+        rows = await asyncio.to_thread(
+            self._execute,
+            "SELECT data FROM conversations WHERE id = ?",
+            (conversation_id,),
+        )
+        return Conversation.from_dict(json.loads(rows[0][0])) if rows else None
+
+    async def put(self, conversation: Conversation) -> None:
+        await asyncio.to_thread(
+            self._execute,
+            "INSERT OR REPLACE INTO conversations VALUES (?, ?, ?)",
+            (
+                conversation.id,
+                conversation.last_active,
+                json.dumps(conversation.to_dict(), default=str),
+            ),
+        )
+
+    async def delete(self, conversation_id: str) -> None:
+        await asyncio.to_thread(
+            self._execute, "DELETE FROM conversations WHERE id = ?", (conversation_id,)
+        )
+
+    async def idle_ids(self, before: float) -> list[str]:
+        rows = await asyncio.to_thread(
+            self._execute,
+            "SELECT id FROM conversations WHERE last_active < ?",
+            (before,),
+        )
+        return [row[0] for row in rows]
+
+    async def count(self) -> int:
+        rows = await asyncio.to_thread(
+            self._execute, "SELECT COUNT(*) FROM conversations"
+        )
+        return rows[0][0]
+
+
+def _events(result) -> tuple[list[str], list[dict]]:
+    """The agent's replies and a JSON view of the run's new items."""
+    messages, events = [], []
+    for item in result.new_items:
+        if isinstance(item, MessageOutputItem):
+            text = ItemHelpers.text_message_output(item)
+            messages.append(text)
+            events.append({"type": "message", "agent": item.agent.name, "text": text})
+        elif isinstance(item, HandoffOutputItem):
+            events.append(
+                {
+                    "type": "handoff",
+                    "from": item.source_agent.name,
+                    "to": item.target_agent.name,
+                }
+            )
+        elif isinstance(item, ToolCallItem):
+            events.append({"type": "tool_call", "agent": item.agent.name})
+        elif isinstance(item, ToolCallOutputItem):
+            events.append(
+                {"type": "tool_output", "agent": item.agent.name, "output": item.output}
+            )
+    return messages, events
+
+
+class CustomerServiceServer:
+    """Runs customer service turns for many conversations concurrently.
+
+    Args:
+        store (ConversationStore, optional): Where conversations live between
+            turns. Defaults to an in-memory store.
+        model (Model, optional): Model for every agent, e.g. a `FakeModel`.
+            Defaults to each agent's own model.
+        idle_timeout (float): Seconds without a message after which a
+            conversation is evicted.
+        window_tokens (int): Token budget of each conversation's history.
+        pre_route (bool): Classify messages to triage locally and start
+            obvious ones on their agent directly.
+    """
+
+    def __init__(
+        self,
+        store: Optional[ConversationStore] = None,
+        model: Optional[Model] = None,
+        idle_timeout: float = 900.0,
+        window_tokens: int = 2000,
+        pre_route: bool = True,
+    ):
+        self.store = store or InMemoryConversationStore()
+        self.run_config = RunConfig(model=model) if model else None
+        self.idle_timeout = idle_timeout
+        self.window_tokens = window_tokens
+        self.pre_route = pre_route
+        self._locks: dict[str, asyncio.Lock] = {}
+        self._evictor: Optional[asyncio.Task] = None
+        self.stats = {"conversations": 0, "turns": 0, "errors": 0, "evicted": 0}
+
+    @contextlib.asynccontextmanager
+    async def _locked(self, conversation_id: str):
+        """Holds the conversation's lock. Eviction drops a conversation's lock
+        while holding it, so whoever was waiting on it retries with the
+        conversation's current lock."""
+        while True:
+            lock = self._locks.setdefault(conversation_id, asyncio.Lock())
+            async with lock:
+                if self._locks.get(conversation_id) is lock:
+                    yield
+                    return
+
+    async def handle_message(self, conversation_id: Optional[str], text: str) -> dict:
+        """Runs one turn of a conversation and returns the reply."""
+        conversation_id = conversation_id or uuid.uuid4().hex[:16]
+        async with self._locked(conversation_id):
+            conversation = await self.store.get(conversation_id)
+            is_new = conversation is None
+            if is_new:
+                conversation = Conversation(
+                    id=conversation_id,
+                    window=ContextWindow(max_tokens=self.window_tokens),
+                )
+                self.stats["conversations"] += 1
+
+            conversation.window.add_user_message(text)
+            try:
+                agent = AGENTS[conversation.agent_name]
+                if self.pre_route:
+                    agent = await pre_route(agent, text, conversation.context)
+                with sampled_trace("Customer service", group_id=conversation_id):
+                    result = await Runner.run(
+                        agent,
+                        conversation.window.input_items(conversation.context),
+                        context=conversation.context,
+                        run_config=self.run_config,
+                    )
+            except Exception as e:  # pylint: disable=broad-except
+                conversation.window.discard_user_message()
+                self.stats["errors"] += 1
+                logger.exception("Turn of conversation %s failed", conversation_id)
+                if is_new:
+                    # Never stored, so eviction would never drop its lock.
+                    del self._locks[conversation_id]
+                return {"conversation_id": conversation_id, "error": repr(e)}
+
+            conversation.window.add_result(result)
+            conversation.agent_name = result.last_agent.name
+            conversation.last_active = time.time()
+            await self.store.put(conversation)
+            self.stats["turns"] += 1
+
+        messages, events = _events(result)
+        return {
+            "conversation_id": conversation_id,
+            "agent": conversation.agent_name,
+            "messages": messages,
+            "events": events,
+        }
+
+    async def evict_idle(self) -> int:
+        """Drops the conversations idle for longer than `idle_timeout`."""
+        cutoff = time.time() - self.idle_timeout
+        evicted = 0
+        for conversation_id in await self.store.idle_ids(cutoff):
+            lock = self._locks.get(conversation_id)
+            if lock is not None and lock.locked():
+                # A turn is running; the conversation is not idle after all.
+                continue
+            async with self._locked(conversation_id):
+                # A turn may have run while the lock was being acquired.
+                conversation = await self.store.get(conversation_id)
+                if conversation is None or conversation.last_active >= cutoff:
+                    continue
+                await self.store.delete(conversation_id)
+                del self._locks[conversation_id]
+            evicted += 1
+        self.stats["evicted"] += evicted
+        if evicted:
+            logger.info("Evicted %d idle conversations", evicted)
+        return evicted
+
+    async def _evict_forever(self) -> None:
+        while True:
+            await asyncio.sleep(max(1.0, self.idle_timeout / 4))
+            await self.evict_idle()
+
+    async def _handle_client(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        try:
+            while line := await reader.readline():
+                try:
+                    request = json.loads(line)
+                    if not isinstance(request, dict):
+                        raise TypeError(
+                            f"expected a JSON object, got {type(request).__name__}"
+                        )
+                    response = await self.handle_message(
+                        request.get("conversation_id"), request["message"]
+                    )
+                except (json.JSONDecodeError, KeyError, TypeError) as e:
+                    response = {"error": f"Bad request: {e!r}"}
+                writer.write(json.dumps(response).encode() + b"\n")
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def start(self, host: str = "127.0.0.1", port: int = 8765) -> asyncio.Server:
+        """Starts listening and evicting idle conversations."""
+        self._evictor = asyncio.create_task(self._evict_forever())
+        return await asyncio.start_server(self._handle_client, host, port)
+
+    async def stop(self, server: asyncio.Server) -> None:
+        server.close()
+        await server.wait_closed()
+        if self._evictor:
+            self._evictor.cancel()
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--idle-timeout", type=float, default=900.0)
+    parser.add_argument(
+        "--store",
+        default=None,
+        help="SQLite file for conversations (in memory if unset)",
+    )
+    parser.add_argument(
+        "--fake-model",
+        action="store_true",
+        help="Answer with the local scripted model instead of OpenAI",
+    )
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(name)s: %(message)s")
+
+    model = None
+    if args.fake_model:
+        from fake_model import FakeModel
+
+        model = FakeModel()
+    # TRACE_EXPORT_PATH writes sampled traces to a local file instead.
+    if not install_from_env() and args.fake_model:
+        set_tracing_disabled(True)
+    service = CustomerServiceServer(
+        store=SQLiteConversationStore(args.store) if args.store else None,
+        model=model,
+        idle_timeout=args.idle_timeout,
+    )
+    server = await service.start(args.host, args.port)
+    logger.info("Serving customer service on %s:%d", args.host, args.port)
+    try:
+        await server.serve_forever()
+    finally:
+        await service.stop(server)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,150 @@
+"""A local stand-in for an OpenAI model that plays the airline agents.
+
+`FakeModel` implements the openai-agents `Model` interface without any
+network calls, so the customer service agents can be driven by load tests and
+benchmarks. It follows the agents' routines with keyword rules: the triage
+agent hands seat requests to the seat booking agent and everything else to
+the FAQ agent, the FAQ agent looks the question up, and the seat booking agent
+updates the seat once the message has a confirmation number and a seat.
+"""
+
+from __future__ import annotations as _annotations
+
+import asyncio
+import json
+import re
+import uuid
+from typing import Any, AsyncIterator
+
+from agents import Usage
+from agents.items import ModelResponse
+from agents.models.interface import Model
+
+from openai.types.responses import (
+    ResponseFunctionToolCall,
+    ResponseOutputMessage,
+    ResponseOutputText,
+)
+
+_CONFIRMATION_RE = re.compile(r"\b[A-Z0-9]{6}\b")
+_SEAT_RE = re.compile(r"\b([1-9]|1[0-9]|2[0-1])[A-F]\b")
+
+
+def _estimate_tokens(value: Any) -> int:
+    return len(json.dumps(value, default=str)) // 4 + 1
+
+
+def _last_user_text(items: list) -> str:
+    for item in reversed(items):
+        if item.get("role") == "user":
+            content = item.get("content")
+            if isinstance(content, str):
+                return content
+            return " ".join(part.get("text", "") for part in content or [])
+    return ""
+
+
+def _tool_call(name: str, arguments: dict) -> ResponseFunctionToolCall:
+    return ResponseFunctionToolCall(
+        type="function_call",
+        id=f"fc_{uuid.uuid4().hex}",
+        call_id=f"call_{uuid.uuid4().hex}",
+        name=name,
+        arguments=json.dumps(arguments),
+    )
+
+
+def _message(text: str) -> ResponseOutputMessage:
+    return ResponseOutputMessage(
+        type="message",
+        id=f"msg_{uuid.uuid4().hex}",
+        role="assistant",
+        status="completed",
+        content=[ResponseOutputText(type="output_text", text=text, annotations=[])],
+    )
+
+
+class FakeModel(Model):
+    """Scripted airline agent model.
+
+    Args:
+        latency (float): Seconds each model call waits before answering.
+        seconds_per_output_token (float): Extra wait per generated token.
+    """
+
+    def __init__(self, latency: float = 0.0, seconds_per_output_token: float = 0.0):
+        self.latency = latency
+        self.seconds_per_output_token = seconds_per_output_token
+        self.calls = 0
+
+    def _respond(self, items: list, tools: list, handoffs: list) -> list:
+        last = items[-1] if items else {}
+        tool_names = {tool.name for tool in tools}
+        if last.get("type") == "function_call_output":
+            output = str(last.get("output", ""))
+            # A handoff's output names the new agent, which starts afresh.
+            if not output.startswith('{"assistant"'):
+                return [_message(output)]
+
+        text = _last_user_text(items)
+        if "faq_lookup_tool" in tool_names:
+            return [_tool_call("faq_lookup_tool", {"question": text})]
+        if "update_seat" in tool_names:
+            confirmation = _CONFIRMATION_RE.search(text.upper())
+            seat = _SEAT_RE.search(text.upper())
+            if confirmation and seat:
+                return [
+                    _tool_call(
+                        "update_seat",
+                        {
+                            "confirmation_number": confirmation.group(0),
+                            "new_seat": seat.group(0),
+                        },
+                    )
+                ]
+            return [_message("What is your confirmation number and desired seat?")]
+        if handoffs:
+            wanted = "seat" if "seat" in text.lower() else "faq"
+            target = next((h for h in handoffs if wanted in h.tool_name), handoffs[0])
+            return [_tool_call(target.tool_name, {})]
+        return [_message("How can I help you?")]
+
+    async def get_response(
+        self,
+        system_instructions,
+        input,
+        model_settings,
+        tools,
+        output_schema,
+        handoffs,
+        tracing,
+        *,
+        previous_response_id=None,
+        conversation_id=None,
+        prompt=None,
+    ) -> ModelResponse:
+        self.calls += 1
+        items = (
+            [{"role": "user", "content": input}] if isinstance(input, str) else input
+        )
+        output = self._respond(items, tools, handoffs)
+        input_tokens = _estimate_tokens(items) + _estimate_tokens(
+            system_instructions or ""
+        )
+        output_tokens = sum(_estimate_tokens(item.model_dump()) for item in output)
+        await asyncio.sleep(
+            self.latency + output_tokens * self.seconds_per_output_token
+        )
+        return ModelResponse(
+            output=output,
+            usage=Usage(
+                requests=1,
+                input_tokens=input_tokens,
+                output_tokens=output_tokens,
+                total_tokens=input_tokens + output_tokens,
+            ),
+            response_id=None,
+        )
+
+    def stream_response(self, *args, **kwargs) -> AsyncIterator:
+        raise NotImplementedError("FakeModel does not stream.")
@@ -0,0 +1,260 @@
+"""Indexed FAQ retrieval for the customer service agents.
+
+FAQ entries are loaded from a JSONL file of {"question", "answer", "keywords"}
+objects and indexed with BM25. Every posting stores its precomputed BM25
+weight, so a lookup only sums weights over the postings of the query terms.
+The index is pickled next to the data file together with a fingerprint of the
+data, and rebuilt when the data changes.
+"""
+
+import hashlib
+import heapq
+import json
+import logging
+import math
+import os
+import pickle
+import re
+from array import array
+from bisect import bisect_left
+from collections import Counter, defaultdict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable, Optional
+
+logger = logging.getLogger(__name__)
+
+DATA_PATH = Path(__file__).parent / "data" / "airline_faq.jsonl"
+INDEX_VERSION = 1
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+_STOP_WORDS = frozenset(
+    "a about all am an and any are as at be been but by can could do does for"
+    " from get had has have how i if in into is it its me my no not of on or our"
+    " please should so than that the their them then there these they this to"
+    " too us was we were what when where which who why will with would you your".split()
+)
+
+
+def stem(word: str) -> str:
+    """Strips common English suffixes so inflected forms share a term."""
+    if len(word) <= 3:
+        return word
+    if word.endswith("ies") and len(word) > 4:
+        return word[:-3] + "y"
+    if word.endswith("sses"):
+        return word[:-2]
+    for suffix in ("ing", "ed"):
+        if word.endswith(suffix) and len(word) - len(suffix) >= 3:
+            word = word[: -len(suffix)]
+            # "checking" -> "check", "planned" -> "plan"
+            if len(word) > 3 and word[-1] == word[-2] and word[-1] not in "lsz":
+                word = word[:-1]
+            return word
+    if word.endswith("ly") and len(word) > 5:
+        return word[:-2]
+    if word.endswith("s") and not word.endswith("ss"):
+        word = word[:-1]
+    if word.endswith("e") and len(word) > 4:
+        word = word[:-1]
+    return word
+
+
+def tokenize(text: str) -> list[str]:
+    """Lowercases, drops stop words and stems `text`."""
+    return [
+        stem(token)
+        for token in _TOKEN_RE.findall(text.lower())
+        if token not in _STOP_WORDS
+    ]
+
+
+@dataclass
+class FaqEntry:
+    question: str
+    answer: str
+    keywords: str = ""
+
+
+@dataclass
+class FaqHit:
+    """A matching entry, its BM25 score and a confidence between 0 and 1."""
+
+    entry: FaqEntry
+    score: float
+    confidence: float
+
+
+class FaqIndex:
+    """BM25 inverted index over FAQ entries.
+
+    Args:
+        entries (list[FaqEntry]): The entries to index.
+        k1 (float): Term-frequency saturation.
+        b (float): Document-length normalization.
+        fingerprint (str): Identifies the data the index was built from.
+    """
+
+    def __init__(
+        self,
+        entries: list[FaqEntry],
+        k1: float = 1.2,
+        b: float = 0.75,
+        fingerprint: str = "",
+    ):
+        self.entries = entries
+        self.k1 = k1
+        self.b = b
+        self.fingerprint = fingerprint
+
+        term_freqs = []
+        for entry in entries:
+            # The question and keywords count twice as much as the answer.
+            terms = tokenize(f"{entry.question} {entry.keywords}") * 2 + tokenize(
+                entry.answer
+            )
+            term_freqs.append(Counter(terms))
+        lengths = [sum(freqs.values()) for freqs in term_freqs]
+        avg_length = sum(lengths) / max(1, len(lengths))
+
+        doc_ids: dict[str, list[int]] = defaultdict(list)
+        for doc_id, freqs in enumerate(term_freqs):
+            for term in freqs:
+                doc_ids[term].append(doc_id)
+
+        n_docs = len(entries)
+        norms = [k1 * (1 - b + b * length / avg_length) for length in lengths]
+        self.idf: dict[str, float] = {}
+        self.max_weight: dict[str, float] = {}
+        # term -> (ascending document ids, precomputed BM25 weights)
+        self.postings: dict[str, tuple[array, array]] = {}
+        for term, ids in doc_ids.items():
+            idf = math.log(1 + (n_docs - len(ids) + 0.5) / (len(ids) + 0.5))
+            weights = array(
+                "f",
+                (
+                    idf
+                    * term_freqs[d][term]
+                    * (k1 + 1)
+                    / (term_freqs[d][term] + norms[d])
+                    for d in ids
+                ),
+            )
+            self.idf[term] = idf
+            self.max_weight[term] = max(weights)
+            self.postings[term] = (array("i", ids), weights)
+        # Weight of a term no entry contains, used when scoring confidence.
+        self._max_idf = math.log(1 + (n_docs + 0.5) / 0.5)
+        # A question term appears twice in an average-length entry.
+        self._full_match = 2 * (k1 + 1) / (2 + k1)
+
+    def search(self, query: str, k: int = 3) -> list[FaqHit]:
+        """Returns the `k` best entries for `query`, best first.
+
+        Confidence compares the score with that of an average-length entry
+        whose question contains every query term, so 1.0 means a full match.
+        """
+        terms = set(tokenize(query))
+        if not terms:
+            return []
+        # MaxScore: visit terms by decreasing maximum weight. Once the terms
+        # left cannot lift an unseen entry above the current k-th score, they
+        # only add to the entries already scored, which skips most of the long
+        # postings of common terms without changing the result.
+        known = sorted(
+            (term for term in terms if term in self.postings),
+            key=self.max_weight.__getitem__,
+            reverse=True,
+        )
+        remaining = sum(self.max_weight[term] for term in known)
+        scores: dict[int, float] = {}
+        for term in known:
+            ids, weights = self.postings[term]
+            if len(scores) >= k and remaining <= heapq.nlargest(k, scores.values())[-1]:
+                _add_to_scored(scores, ids, weights)
+            else:
+                for doc_id, weight in zip(ids, weights):
+                    scores[doc_id] = scores.get(doc_id, 0.0) + weight
+            remaining -= self.max_weight[term]
+        ideal = self._full_match * sum(
+            self.idf.get(term, self._max_idf) for term in terms
+        )
+        best = heapq.nlargest(k, scores.items(), key=lambda item: item[1])
+        return [
+            FaqHit(
+                entry=self.entries[doc_id],
+                score=round(score, 4),
+                confidence=round(min(1.0, score / ideal), 3),
+            )
+            for doc_id, score in best
+        ]
+
+    def save(self, path: Path) -> None:
+        """Pickles the index, replacing `path` atomically."""
+        tmp_path = path.with_suffix(path.suffix + ".tmp")
+        with open(tmp_path, "wb") as f:
+            pickle.dump(self, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load_or_build(
+        cls, data_path: Path = DATA_PATH, index_path: Optional[Path] = None
+    ) -> "FaqIndex":
+        """Loads the pickled index of `data_path`, rebuilding it when stale.
+
+        Args:
+            data_path (Path): JSONL file of FAQ entries.
+            index_path (Path, optional): Where the index is cached. Defaults to
+                the data path with an ".index.pkl" suffix.
+
+        Returns:
+            FaqIndex: The index of the current contents of `data_path`.
+        """
+        index_path = index_path or data_path.with_suffix(".index.pkl")
+        data = data_path.read_bytes()
+        fingerprint = hashlib.sha256(data + f"v{INDEX_VERSION}".encode()).hexdigest()
+        try:
+            with open(index_path, "rb") as f:
+                index = pickle.load(f)
+            if isinstance(index, cls) and index.fingerprint == fingerprint:
+                return index
+        except FileNotFoundError:
+            pass
+        except Exception as e:  # pylint: disable=broad-except
+            logger.warning("Ignoring unreadable FAQ index %s: %r", index_path, e)
+
+        index = cls(
+            list(load_entries(data.decode("utf-8").splitlines())),
+            fingerprint=fingerprint,
+        )
+        try:
+            index.save(index_path)
+        except OSError as e:
+            logger.warning("Could not cache the FAQ index at %s: %r", index_path, e)
+        return index
+
+
+def _add_to_scored(scores: dict[int, float], ids: array, weights: array) -> None:
+    """Adds a term's weights to the entries in `scores` only."""
+    if len(scores) * 16 < len(ids):
+        # Few candidates: binary-search each of them in the postings.
+        for doc_id in scores:
+            position = bisect_left(ids, doc_id)
+            if position < len(ids) and ids[position] == doc_id:
+                scores[doc_id] += weights[position]
+    else:
+        for doc_id, weight in zip(ids, weights):
+            if doc_id in scores:
+                scores[doc_id] += weight
+
+
+def load_entries(lines: Iterable[str]) -> Iterable[FaqEntry]:
+    """Parses JSONL lines into FAQ entries, skipping blank lines."""
+    for line in lines:
+        if line.strip():
+            item = json.loads(line)
+            yield FaqEntry(
+                question=item["question"],
+                answer=item["answer"],
+                keywords=" ".join(item.get("keywords", [])),
+            )
@@ -0,0 +1,148 @@
+"""Local intent classification to route obvious requests past triage.
+
+`IntentRouter` is a nearest-example classifier over TF-IDF features: stemmed
+words (the FAQ engine's tokenizer) plus character trigrams of each word, which
+keep misspellings like "bagage" or "wi-fi" close to their intent. It is
+trained from labelled example messages, and an intent scores the cosine
+similarity of its closest example. A message is routed only when the best
+intent is similar enough and clearly ahead of the runner-up; everything else
+goes to the triage agent as before.
+"""
+
+import json
+import math
+import time
+from collections import Counter, defaultdict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable, Optional
+
+from faq_engine import tokenize
+
+EXAMPLES_PATH = Path(__file__).parent / "data" / "intent_examples.jsonl"
+
+# Intent of examples that should not be routed anywhere.
+NO_ROUTE = "other"
+
+
+def features(text: str, trigram_weight: float = 0.25) -> Counter:
+    """Word and character-trigram counts of `text`."""
+    feats: Counter = Counter()
+    for word in tokenize(text):
+        feats[f"w:{word}"] += 1.0
+        padded = f"#{word}#"
+        for i in range(len(padded) - 2):
+            feats[f"c:{padded[i:i + 3]}"] += trigram_weight
+    return feats
+
+
+def _normalize(vector: dict) -> dict:
+    norm = math.sqrt(sum(value * value for value in vector.values()))
+    return {key: value / norm for key, value in vector.items()} if norm else {}
+
+
+@dataclass
+class Route:
+    """The classifier's decision; `intent` is None for a fallback to triage."""
+
+    intent: Optional[str]
+    confidence: float
+    best: str
+    seconds: float
+
+
+class IntentRouter:
+    """Nearest-example intent classifier.
+
+    Args:
+        examples (Iterable[tuple[str, str]]): (text, intent) pairs.
+        threshold (float): Minimum cosine similarity to route.
+        margin (float): Minimum lead over the second-best intent.
+    """
+
+    def __init__(
+        self,
+        examples: Iterable[tuple[str, str]],
+        threshold: float = 0.4,
+        margin: float = 0.15,
+    ):
+        self.threshold = threshold
+        self.margin = margin
+        examples = [(features(text), intent) for text, intent in examples]
+
+        document_freq: Counter = Counter()
+        for feats, _ in examples:
+            document_freq.update(feats.keys())
+        self.idf = {
+            feat: math.log((1 + len(examples)) / (1 + freq)) + 1
+            for feat, freq in document_freq.items()
+        }
+
+        self.intents = [intent for _, intent in examples]
+        # feature -> [(example index, weight)]
+        self.postings: dict[str, list[tuple[int, float]]] = defaultdict(list)
+        for index, (feats, _) in enumerate(examples):
+            for feat, value in self._vector(feats).items():
+                self.postings[feat].append((index, value))
+        self.stats = {"messages": 0, "routed": 0, "by_intent": Counter()}
+
+    @classmethod
+    def from_jsonl(cls, path: Path = EXAMPLES_PATH, **kwargs) -> "IntentRouter":
+        """Trains on a JSONL file of {"text", "intent"} examples."""
+        with open(path, encoding="utf-8") as f:
+            items = [json.loads(line) for line in f if line.strip()]
+        return cls(((item["text"], item["intent"]) for item in items), **kwargs)
+
+    def _vector(self, feats: Counter) -> dict:
+        # Features never seen in training carry no evidence.
+        return _normalize(
+            {
+                feat: value * self.idf[feat]
+                for feat, value in feats.items()
+                if feat in self.idf
+            }
+        )
+
+    def scores(self, text: str) -> dict[str, float]:
+        """Similarity of `text` to each intent's closest example, best first."""
+        similarity: dict[int, float] = defaultdict(float)
+        for feat, value in self._vector(features(text)).items():
+            for index, weight in self.postings.get(feat, ()):
+                similarity[index] += value * weight
+        scores = dict.fromkeys(self.intents, 0.0)
+        for index, score in similarity.items():
+            intent = self.intents[index]
+            scores[intent] = max(scores[intent], score)
+        return dict(sorted(scores.items(), key=lambda item: item[1], reverse=True))
+
+    def classify(self, text: str) -> Route:
+        """Returns the intent to route `text` to, or None to use triage."""
+        started = time.perf_counter()
+        ranked = list(self.scores(text).items())
+        best, top = ranked[0] if ranked else (NO_ROUTE, 0.0)
+        runner_up = ranked[1][1] if len(ranked) > 1 else 0.0
+        confident = top >= self.threshold and top - runner_up >= self.margin
+        intent = best if confident and best != NO_ROUTE else None
+
+        self.stats["messages"] += 1
+        if intent:
+            self.stats["routed"] += 1
+            self.stats["by_intent"][intent] += 1
+        return Route(
+            intent=intent,
+            confidence=round(top, 3),
+            best=best,
+            seconds=time.perf_counter() - started,
+        )
+
+    def report(self) -> dict:
+        """Share of messages that skipped triage, per intent."""
+        messages = self.stats["messages"]
+        return {
+            "messages": messages,
+            "fast_path": self.stats["routed"],
+            "fast_path_rate": (
+                round(self.stats["routed"] / messages, 3) if messages else 0.0
+            ),
+            "by_intent": dict(self.stats["by_intent"]),
+        }
@@ -0,0 +1,246 @@
+"""Seat inventory for the airline agents.
+
+Every flight uses the 120-seat layout the FAQ describes: 22 business seats
+(rows 1-3 with seats A-F, exit row 4 with A, C, D and F) and 98 economy seats
+(rows 5-20 with seats A-F, row 21 with A and F), with exit rows 4 and 16 and
+Economy Plus in rows 5-8. A flight's occupancy is one integer used as a
+120-bit bitmap, plus a map from confirmation number to seat.
+
+Reservations are check-and-reserve operations under a per-flight lock, so
+concurrent callers can never hold the same seat. With a SQLite path the
+reservations are also persisted, and the lock covers the write, so memory
+and disk cannot disagree.
+"""
+
+import asyncio
+import sqlite3
+import threading
+from dataclasses import dataclass
+from typing import Optional
+
+EXIT_ROWS = (4, 16)
+ECONOMY_PLUS_ROWS = range(5, 9)
+
+
+@dataclass(frozen=True)
+class Seat:
+    index: int
+    row: int
+    letter: str
+    cabin: str
+    exit_row: bool = False
+    economy_plus: bool = False
+
+    @property
+    def label(self) -> str:
+        return f"{self.row}{self.letter}"
+
+    def describe(self) -> str:
+        features = [self.cabin]
+        if self.economy_plus:
+            features.append("Economy Plus")
+        if self.exit_row:
+            features.append("exit row")
+        return f"{self.label} ({', '.join(features)})"
+
+
+def _build_layout() -> list[Seat]:
+    rows = [(row, "ABCDEF", "business") for row in range(1, 4)]
+    rows.append((4, "ACDF", "business"))
+    rows += [(row, "ABCDEF", "economy") for row in range(5, 21)]
+    rows.append((21, "AF", "economy"))
+    seats = []
+    for row, letters, cabin in rows:
+        for letter in letters:
+            seats.append(
+                Seat(
+                    index=len(seats),
+                    row=row,
+                    letter=letter,
+                    cabin=cabin,
+                    exit_row=row in EXIT_ROWS,
+                    economy_plus=row in ECONOMY_PLUS_ROWS,
+                )
+            )
+    return seats
+
+
+SEATS = _build_layout()
+SEATS_BY_LABEL = {seat.label: seat for seat in SEATS}
+ALL_SEATS_MASK = (1 << len(SEATS)) - 1
+
+
+class SeatError(ValueError):
+    """A seat request that cannot be fulfilled."""
+
+
+class UnknownSeatError(SeatError):
+    pass
+
+
+class SeatUnavailableError(SeatError):
+    pass
+
+
+def seat_by_label(label: str) -> Seat:
+    seat = SEATS_BY_LABEL.get(label.strip().upper())
+    if seat is None:
+        raise UnknownSeatError(
+            f"There is no seat {label}. Seats are rows 1-21, letters A-F."
+        )
+    return seat
+
+
+class _Flight:
+    __slots__ = ("occupied", "holders")
+
+    def __init__(self):
+        self.occupied = 0
+        # confirmation number -> seat index
+        self.holders: dict[str, int] = {}
+
+
+class SeatInventory:
+    """Seat reservations for any number of flights.
+
+    Args:
+        db_path (str, optional): SQLite file that persists reservations.
+            Flights are loaded from it on first use. In memory only if unset.
+        lock_stripes (int): Number of locks shared by all flights. A flight
+            always maps to the same lock, so memory does not grow with the
+            number of flights.
+    """
+
+    def __init__(self, db_path: Optional[str] = None, lock_stripes: int = 1024):
+        self._flights: dict[str, _Flight] = {}
+        self._locks = [asyncio.Lock() for _ in range(lock_stripes)]
+        self._db = None
+        self._db_lock = threading.Lock()
+        if db_path:
+            self._db = sqlite3.connect(db_path, check_same_thread=False)
+            # WAL avoids an fsync of the whole database per reservation.
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute("PRAGMA synchronous=NORMAL")
+            with self._db:
+                self._db.execute(
+                    "CREATE TABLE IF NOT EXISTS seat_reservations (flight TEXT,"
+                    " seat INTEGER, confirmation TEXT, PRIMARY KEY (flight, seat),"
+                    " UNIQUE (flight, confirmation))"
+                )
+
+    def _lock_for(self, flight_number: str) -> asyncio.Lock:
+        return self._locks[hash(flight_number) % len(self._locks)]
+
+    async def _flight(self, flight_number: str) -> _Flight:
+        """Returns the flight, loading it from SQLite on first use."""
+        flight = self._flights.get(flight_number)
+        if flight is None:
+            flight = _Flight()
+            if self._db:
+                rows = await asyncio.to_thread(self._db_load, flight_number)
+                for seat, confirmation in rows:
+                    flight.occupied |= 1 << seat
+                    flight.holders[confirmation] = seat
+            # A reservation may have loaded the flight while this one waited.
+            flight = self._flights.setdefault(flight_number, flight)
+        return flight
+
+    def _db_load(self, flight_number: str) -> list:
+        with self._db_lock:
+            return self._db.execute(
+                "SELECT seat, confirmation FROM seat_reservations WHERE flight = ?",
+                (flight_number,),
+            ).fetchall()
+
+    def _db_reserve(self, flight_number: str, seat: int, confirmation: str) -> None:
+        with self._db_lock, self._db:
+            self._db.execute(
+                "DELETE FROM seat_reservations WHERE flight = ? AND confirmation = ?",
+                (flight_number, confirmation),
+            )
+            self._db.execute(
+                "INSERT INTO seat_reservations VALUES (?, ?, ?)",
+                (flight_number, seat, confirmation),
+            )
+
+    def _db_release(self, flight_number: str, confirmation: str) -> None:
+        with self._db_lock, self._db:
+            self._db.execute(
+                "DELETE FROM seat_reservations WHERE flight = ? AND confirmation = ?",
+                (flight_number, confirmation),
+            )
+
+    async def reserve(
+        self, flight_number: str, seat_label: str, confirmation_number: str
+    ) -> Seat:
+        """Reserves a seat, moving the booking off any seat it already holds.
+
+        Raises:
+            UnknownSeatError: The seat is not in the layout.
+            SeatUnavailableError: Another booking holds the seat.
+        """
+        seat = seat_by_label(seat_label)
+        bit = 1 << seat.index
+        async with self._lock_for(flight_number):
+            flight = await self._flight(flight_number)
+            previous = flight.holders.get(confirmation_number)
+            if previous == seat.index:
+                return seat
+            if flight.occupied & bit:
+                raise SeatUnavailableError(
+                    f"Seat {seat.label} on {flight_number} is already taken."
+                )
+            if self._db:
+                await asyncio.to_thread(
+                    self._db_reserve, flight_number, seat.index, confirmation_number
+                )
+            if previous is not None:
+                flight.occupied &= ~(1 << previous)
+            flight.occupied |= bit
+            flight.holders[confirmation_number] = seat.index
+        return seat
+
+    async def release(self, flight_number: str, confirmation_number: str) -> None:
+        """Frees the seat a booking holds on a flight, if any."""
+        async with self._lock_for(flight_number):
+            flight = await self._flight(flight_number)
+            previous = flight.holders.get(confirmation_number)
+            if previous is None:
+                return
+            if self._db:
+                await asyncio.to_thread(
+                    self._db_release, flight_number, confirmation_number
+                )
+            flight.occupied &= ~(1 << previous)
+            del flight.holders[confirmation_number]
+
+    async def available(
+        self, flight_number: str, cabin: Optional[str] = None
+    ) -> list[Seat]:
+        """Free seats of a flight, optionally only those of one cabin."""
+        flight = await self._flight(flight_number)
+        free = ~flight.occupied & ALL_SEATS_MASK
+        return [
+            seat
+            for seat in SEATS
+            if free >> seat.index & 1 and (cabin is None or seat.cabin == cabin)
+        ]
+
+    async def seat_of(
+        self, flight_number: str, confirmation_number: str
+    ) -> Optional[Seat]:
+        flight = await self._flight(flight_number)
+        index = flight.holders.get(confirmation_number)
+        return SEATS[index] if index is not None else None
+
+    def assignments(self, flight_number: str) -> dict[str, str]:
+        """Seat label per confirmation number on a loaded flight."""
+        flight = self._flights.get(flight_number)
+        if flight is None:
+            return {}
+        return {c: SEATS[index].label for c, index in flight.holders.items()}
+
+    def occupancy(self, flight_number: str) -> int:
+        """Number of reserved seats on a loaded flight."""
+        flight = self._flights.get(flight_number)
+        return flight.occupied.bit_count() if flight else 0
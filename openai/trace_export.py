@@ -0,0 +1,363 @@
+"""Sampled, batched trace export to local files.
+
+`SampledTraceProcessor` is an openai-agents tracing processor for running the
+agents under load without the hosted tracing backend:
+
+- Head-based sampling: whether a trace is kept is decided when it starts, from
+  a hash of its group ID (the conversation) or, without one, its trace ID, so
+  a conversation is kept or dropped as a whole. Traces opened with
+  `sampled_trace()` are decided before they are created: an unsampled one is
+  a no-op trace, and the SDK skips creating its spans altogether.
+- Sampled traces and finished spans go into a fixed-size in-memory ring
+  buffer. When the buffer is full, new items are dropped and counted; the
+  agents never wait on export.
+- A background thread drains the buffer in batches, when a batch is ready or
+  every `schedule_delay` seconds, and hands them to an exporter:
+  `JsonlFileExporter` writes one exported trace or span per line and
+  `OtlpFileExporter` writes one OTLP/JSON `ExportTraceServiceRequest` per
+  batch, as the OpenTelemetry collector's file exporter does.
+
+`install_from_env()` replaces the default processors with a local one when
+TRACE_EXPORT_PATH is set, and `sampled_trace()` then samples with it.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import threading
+import zlib
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Optional
+
+from agents import gen_trace_id, set_trace_processors, trace
+from agents.tracing import Span, Trace, TracingProcessor
+from agents.tracing.processor_interface import TracingExporter
+
+logger = logging.getLogger(__name__)
+
+
+class RingBuffer:
+    """Fixed-capacity FIFO buffer that rejects items when full.
+
+    Args:
+        capacity (int): Maximum number of buffered items.
+    """
+
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self._slots: list[Any] = [None] * capacity
+        self._head = 0
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return self._size
+
+    def put(self, item: Any) -> bool:
+        """Appends an item; returns False, without blocking, when full."""
+        with self._lock:
+            if self._size == self.capacity:
+                return False
+            self._slots[(self._head + self._size) % self.capacity] = item
+            self._size += 1
+            return True
+
+    def take(self, limit: int) -> list:
+        """Removes and returns up to `limit` of the oldest items."""
+        with self._lock:
+            count = min(limit, self._size)
+            items = []
+            for _ in range(count):
+                items.append(self._slots[self._head])
+                self._slots[self._head] = None
+                self._head = (self._head + 1) % self.capacity
+            self._size -= count
+            return items
+
+
+class JsonlFileExporter(TracingExporter):
+    """Appends each trace and span, as the agents SDK exports them, to a
+    JSON-lines file."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file = open(path, "a", encoding="utf-8")
+
+    def export(self, items: list) -> None:
+        lines = []
+        for item in items:
+            payload = item.export()
+            if payload:
+                lines.append(json.dumps(payload, default=str) + "\n")
+        self._file.writelines(lines)
+        self._file.flush()
+
+    def close(self) -> None:
+        self._file.close()
+
+
+def _hex_id(value: str, length: int) -> str:
+    """The hex part of an SDK ID (`trace_<hex>`, `span_<hex>`) at the width
+    OTLP expects, or a hash of the ID when it has none."""
+    digits = value.rpartition("_")[2]
+    try:
+        int(digits, 16)
+    except ValueError:
+        digits = ""
+    if len(digits) < length:
+        digits = hashlib.sha256(value.encode()).hexdigest()
+    return digits[:length]
+
+
+def _unix_nanos(timestamp: Optional[str]) -> str:
+    if not timestamp:
+        return "0"
+    return str(int(datetime.fromisoformat(timestamp).timestamp() * 1e9))
+
+
+def _attribute(key: str, value: Any) -> dict:
+    if isinstance(value, bool):
+        wrapped = {"boolValue": value}
+    elif isinstance(value, int):
+        wrapped = {"intValue": str(value)}
+    elif isinstance(value, float):
+        wrapped = {"doubleValue": value}
+    elif isinstance(value, str):
+        wrapped = {"stringValue": value}
+    else:
+        wrapped = {"stringValue": json.dumps(value, default=str)}
+    return {"key": key, "value": wrapped}
+
+
+class OtlpFileExporter(TracingExporter):
+    """Writes each batch as one line of OTLP/JSON.
+
+    SDK traces carry no timing, so they are not spans of their own; their
+    workflow name and group ID become attributes of their spans.
+
+    Args:
+        path (str): File to append to.
+        service_name (str): `service.name` of the exported resource.
+    """
+
+    def __init__(self, path: str, service_name: str = "customer-service"):
+        self.path = path
+        self.service_name = service_name
+        self._file = open(path, "a", encoding="utf-8")
+        # trace ID -> attributes, for the most recent traces.
+        self._traces: OrderedDict[str, list] = OrderedDict()
+
+    def _span(self, span: Span) -> dict:
+        data = span.span_data.export()
+        name = data.pop("type", span.span_data.type)
+        if data.get("name"):
+            name = f"{name}: {data['name']}"
+        attributes = [
+            _attribute(f"agents.{key}", value)
+            for key, value in data.items()
+            if value is not None
+        ]
+        attributes += self._traces.get(span.trace_id, [])
+        otlp = {
+            "traceId": _hex_id(span.trace_id, 32),
+            "spanId": _hex_id(span.span_id, 16),
+            "name": name,
+            "kind": 1,
+            "startTimeUnixNano": _unix_nanos(span.started_at),
+            "endTimeUnixNano": _unix_nanos(span.ended_at),
+            "attributes": attributes,
+            "status": {},
+        }
+        if span.parent_id:
+            otlp["parentSpanId"] = _hex_id(span.parent_id, 16)
+        if span.error:
+            otlp["status"] = {"code": 2, "message": span.error.get("message", "")}
+        return otlp
+
+    def export(self, items: list) -> None:
+        spans = []
+        for item in items:
+            if isinstance(item, Trace):
+                group_id = getattr(item, "group_id", None)
+                self._traces[item.trace_id] = [
+                    _attribute("agents.workflow_name", item.name)
+                ] + ([_attribute("agents.group_id", group_id)] if group_id else [])
+                if len(self._traces) > 4096:
+                    self._traces.popitem(last=False)
+            else:
+                spans.append(self._span(item))
+        if not spans:
+            return
+        request = {
+            "resourceSpans": [
+                {
+                    "resource": {
+                        "attributes": [_attribute("service.name", self.service_name)]
+                    },
+                    "scopeSpans": [
+                        {"scope": {"name": "openai-agents"}, "spans": spans}
+                    ],
+                }
+            ]
+        }
+        self._file.write(json.dumps(request) + "\n")
+        self._file.flush()
+
+    def close(self) -> None:
+        self._file.close()
+
+
+class SampledTraceProcessor(TracingProcessor):
+    """Head-sampled tracing processor with a non-blocking export queue.
+
+    Args:
+        exporter (TracingExporter): Receives the batches.
+        sample_rate (float): Share of traces to keep, from 0 to 1.
+        max_queue_size (int): Capacity of the ring buffer.
+        max_batch_size (int): Items per export call.
+        schedule_delay (float): Longest time, in seconds, an item waits for
+            a batch to fill before it is exported.
+    """
+
+    def __init__(
+        self,
+        exporter: TracingExporter,
+        sample_rate: float = 1.0,
+        max_queue_size: int = 8192,
+        max_batch_size: int = 256,
+        schedule_delay: float = 1.0,
+    ):
+        self.exporter = exporter
+        self.sample_rate = sample_rate
+        self.max_batch_size = max_batch_size
+        self.schedule_delay = schedule_delay
+        self._buffer = RingBuffer(max_queue_size)
+        self._threshold = int(sample_rate * 0xFFFFFFFF)
+        self._sampled: set[str] = set()
+        self._wakeup = threading.Event()
+        self._stopped = threading.Event()
+        self._export_lock = threading.Lock()
+        self._worker = threading.Thread(
+            target=self._run, name="trace-export", daemon=True
+        )
+        self._worker.start()
+        self.stats = {
+            "traces": 0,
+            "sampled": 0,
+            "queued": 0,
+            "dropped": 0,
+            "exported": 0,
+            "batches": 0,
+            "export_errors": 0,
+        }
+
+    def should_sample(self, key: str) -> bool:
+        """Whether traces of a group ID (or a trace ID) are kept."""
+        return self.sample_rate > 0 and zlib.crc32(key.encode()) <= self._threshold
+
+    def trace(
+        self, workflow_name: str, group_id: Optional[str] = None, **kwargs
+    ) -> Trace:
+        """`agents.trace()`, disabled up front when it is not sampled."""
+        trace_id = kwargs.pop("trace_id", None) or gen_trace_id()
+        return trace(
+            workflow_name,
+            trace_id=trace_id,
+            group_id=group_id,
+            disabled=not self.should_sample(group_id or trace_id),
+            **kwargs,
+        )
+
+    def _enqueue(self, item: Any) -> None:
+        if self._buffer.put(item):
+            self.stats["queued"] += 1
+            if len(self._buffer) >= self.max_batch_size:
+                self._wakeup.set()
+        else:
+            self.stats["dropped"] += 1
+
+    def on_trace_start(self, trace: Trace) -> None:
+        self.stats["traces"] += 1
+        if not self.should_sample(getattr(trace, "group_id", None) or trace.trace_id):
+            return
+        self.stats["sampled"] += 1
+        self._sampled.add(trace.trace_id)
+        self._enqueue(trace)
+
+    def on_trace_end(self, trace: Trace) -> None:
+        self._sampled.discard(trace.trace_id)
+
+    def on_span_start(self, span: Span[Any]) -> None:
+        pass
+
+    def on_span_end(self, span: Span[Any]) -> None:
+        if span.trace_id in self._sampled:
+            self._enqueue(span)
+
+    def _export_pending(self) -> None:
+        with self._export_lock:
+            while True:
+                batch = self._buffer.take(self.max_batch_size)
+                if not batch:
+                    return
+                try:
+                    self.exporter.export(batch)
+                    self.stats["exported"] += len(batch)
+                    self.stats["batches"] += 1
+                except Exception:
+                    self.stats["export_errors"] += 1
+                    logger.exception("Dropped a batch of %d trace items", len(batch))
+
+    def _run(self) -> None:
+        while not self._stopped.is_set():
+            self._wakeup.wait(self.schedule_delay)
+            self._wakeup.clear()
+            self._export_pending()
+
+    def force_flush(self) -> None:
+        self._export_pending()
+
+    def shutdown(self, timeout: Optional[float] = None) -> None:
+        self._stopped.set()
+        self._wakeup.set()
+        self._worker.join(timeout)
+        self._export_pending()
+        close = getattr(self.exporter, "close", None)
+        if close:
+            close()
+
+
+EXPORTERS = {"jsonl": JsonlFileExporter, "otlp": OtlpFileExporter}
+_installed: Optional[SampledTraceProcessor] = None
+
+
+def install_from_env() -> Optional[SampledTraceProcessor]:
+    """Exports traces locally instead of to OpenAI when TRACE_EXPORT_PATH is
+    set. TRACE_SAMPLE_RATE (default 1.0) and TRACE_EXPORT_FORMAT (`jsonl` or
+    `otlp`, default `jsonl`) configure the export.
+
+    Returns:
+        SampledTraceProcessor: The installed processor, or None.
+    """
+    global _installed
+    path = os.getenv("TRACE_EXPORT_PATH")
+    if not path:
+        return None
+    exporter = EXPORTERS[os.getenv("TRACE_EXPORT_FORMAT", "jsonl")](path)
+    _installed = SampledTraceProcessor(
+        exporter, sample_rate=float(os.getenv("TRACE_SAMPLE_RATE", "1.0"))
+    )
+    set_trace_processors([_installed])
+    return _installed
+
+
+def sampled_trace(
+    workflow_name: str, group_id: Optional[str] = None, **kwargs
+) -> Trace:
+    """`agents.trace()`, sampled by the processor `install_from_env()`
+    installed, if any."""
+    if _installed is None:
+        return trace(workflow_name, group_id=group_id, **kwargs)
+    return _installed.trace(workflow_name, group_id=group_id, **kwargs)